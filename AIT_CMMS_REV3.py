@@ -30,6 +30,9 @@ import calendar
 import random
 import math
 import re
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple, NamedTuple
 from abc import ABC, abstractmethod
@@ -45,6 +48,18 @@ try:
 except ImportError:
     REPORTLAB_AVAILABLE = False
     print("ReportLab not installed. PDF generation will not work.")
+try:
+    from tkcalendar import Calendar
+    TKCALENDAR_AVAILABLE = True
+except ImportError:
+    TKCALENDAR_AVAILABLE = False
+    print("tkcalendar not installed. The CM date picker will not work.")
+
+# Patterns used in per-row loops, compiled once at import
+_ISO_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+# Verbose DEBUG: output from per-row and per-keystroke paths (off in production)
+DEBUG = False
 
 class PMType(Enum):
     MONTHLY = "Monthly"
@@ -843,7 +858,6 @@ class PMSchedulingService:
             # Clear caches even on error
             self.completion_repo.clear_cache()
             self.eligibility_checker.clear_cache()
-            import traceback
             traceback.print_exc()
             return {'success': False, 'error': str(e)}
     
@@ -982,7 +996,7 @@ class DateStandardizer:
         date_str = str(date_str).strip()
         
         # Already in correct format
-        if re.match(r'^\d{4}-\d{2}-\d{2}$', date_str):
+        if _ISO_DATE_RE.match(date_str):
             try:
                 # Validate it's a real date
                 datetime.strptime(date_str, '%Y-%m-%d')
@@ -1110,6 +1124,51 @@ class DateStandardizer:
 
 
 
+def truncate_text(text, width):
+    """Return text (None as '') cut to width characters plus '...' if it is longer"""
+    text = text or ''
+    return text if len(text) <= width else text[:width] + '...'
+
+
+def copy_changed_blocks(src_path, dst_path, block_size=4096):
+    """
+    Update dst_path to match src_path, rewriting only the blocks that differ
+
+    SQLite files change a few pages at a time, so for a synced backup this
+    writes a small fraction of the file instead of the whole thing.
+
+    Args:
+        src_path: File to copy from
+        dst_path: File to update in place (copied whole if it doesn't exist)
+        block_size: Comparison block size in bytes (SQLite default page size)
+
+    Returns:
+        int: Number of bytes written to dst_path
+    """
+    if not os.path.exists(dst_path):
+        shutil.copy2(src_path, dst_path)
+        return os.path.getsize(dst_path)
+
+    bytes_written = 0
+    with open(src_path, 'rb') as src, open(dst_path, 'r+b') as dst:
+        offset = 0
+        while True:
+            src_block = src.read(block_size)
+            if not src_block:
+                break
+            dst_block = dst.read(len(src_block))
+            if src_block != dst_block:
+                dst.seek(offset)
+                dst.write(src_block)
+                bytes_written += len(src_block)
+            offset += len(src_block)
+            dst.seek(offset)
+        dst.truncate(offset)
+
+    shutil.copystat(src_path, dst_path)
+    return bytes_written
+
+
 def generate_monthly_summary_report(conn, month=None, year=None):
     """
     Generate a comprehensive monthly PM summary report with separate tracking
@@ -1152,8 +1211,8 @@ def generate_monthly_summary_report(conn, month=None, year=None):
     cursor.execute('''
         SELECT
             COUNT(*) as total_completions,
-            SUM(labor_hours + labor_minutes/60.0) as total_hours,
-            AVG(labor_hours + labor_minutes/60.0) as avg_hours
+            SUM(total_hours) as total_hours,
+            AVG(total_hours) as avg_hours
         FROM pm_completions
         WHERE EXTRACT(YEAR FROM completion_date::date) = %s
         AND EXTRACT(MONTH FROM completion_date::date) = %s
@@ -1356,8 +1415,8 @@ def generate_monthly_summary_report(conn, month=None, year=None):
         SELECT
             pm_type,
             COUNT(*) as count,
-            SUM(labor_hours + labor_minutes/60.0) as total_hours,
-            AVG(labor_hours + labor_minutes/60.0) as avg_hours
+            SUM(total_hours) as total_hours,
+            AVG(total_hours) as avg_hours
         FROM pm_completions
         WHERE EXTRACT(YEAR FROM completion_date::date) = %s
         AND EXTRACT(MONTH FROM completion_date::date) = %s
@@ -1382,7 +1441,7 @@ def generate_monthly_summary_report(conn, month=None, year=None):
         SELECT
             completion_date,
             COUNT(*) as daily_count,
-            SUM(labor_hours + labor_minutes/60.0) as daily_hours
+            SUM(total_hours) as daily_hours
         FROM pm_completions
         WHERE EXTRACT(YEAR FROM completion_date::date) = %s
         AND EXTRACT(MONTH FROM completion_date::date) = %s
@@ -1409,8 +1468,8 @@ def generate_monthly_summary_report(conn, month=None, year=None):
         SELECT
             technician_name,
             COUNT(*) as completions,
-            SUM(labor_hours + labor_minutes/60.0) as total_hours,
-            AVG(labor_hours + labor_minutes/60.0) as avg_hours
+            SUM(total_hours) as total_hours,
+            AVG(total_hours) as avg_hours
         FROM pm_completions
         WHERE EXTRACT(YEAR FROM completion_date::date) = %s
         AND EXTRACT(MONTH FROM completion_date::date) = %s
@@ -1526,7 +1585,7 @@ def generate_monthly_summary_report(conn, month=None, year=None):
         SELECT
             e.location,
             COUNT(*) as completions,
-            SUM(pc.labor_hours + pc.labor_minutes/60.0) as total_hours
+            SUM(pc.total_hours) as total_hours
         FROM pm_completions pc
         JOIN equipment e ON pc.bfm_equipment_no = e.bfm_equipment_no
         WHERE EXTRACT(YEAR FROM pc.completion_date::date) = %s
@@ -1675,8 +1734,8 @@ def export_professional_monthly_report_pdf(conn, month=None, year=None):
         cursor.execute('''
             SELECT
                 COUNT(*) as total_completions,
-                SUM(labor_hours + labor_minutes/60.0) as total_hours,
-                AVG(labor_hours + labor_minutes/60.0) as avg_hours
+                SUM(total_hours) as total_hours,
+                AVG(total_hours) as avg_hours
             FROM pm_completions
             WHERE EXTRACT(YEAR FROM completion_date::date) = %s
             AND EXTRACT(MONTH FROM completion_date::date) = %s
@@ -2020,8 +2079,8 @@ def export_professional_monthly_report_pdf(conn, month=None, year=None):
     
         cursor.execute('''
             SELECT pm_type, COUNT(*) as count,
-                SUM(labor_hours + labor_minutes/60.0) as total_hours,
-                AVG(labor_hours + labor_minutes/60.0) as avg_hours
+                SUM(total_hours) as total_hours,
+                AVG(total_hours) as avg_hours
             FROM pm_completions
             WHERE EXTRACT(YEAR FROM completion_date::date) = %s AND EXTRACT(MONTH FROM completion_date::date) = %s
             GROUP BY pm_type
@@ -2069,7 +2128,7 @@ def export_professional_monthly_report_pdf(conn, month=None, year=None):
     
         cursor.execute('''
             SELECT completion_date, COUNT(*) as daily_count,
-                SUM(labor_hours + labor_minutes/60.0) as daily_hours
+                SUM(total_hours) as daily_hours
             FROM pm_completions
             WHERE EXTRACT(YEAR FROM completion_date::date) = %s AND EXTRACT(MONTH FROM completion_date::date) = %s
             GROUP BY completion_date
@@ -2120,8 +2179,243 @@ def export_professional_monthly_report_pdf(conn, month=None, year=None):
 
 
 
+class VirtualTreeview:
+    """Show a large list of rows in a ttk.Treeview by only inserting the rows in view
+
+    The Python list is the source of truth; item iids are the row indexes. The
+    vertical scrollbar is driven by the list length instead of the tree's yview.
+    Rows that scroll out of view are deleted from the tree, so the selection is
+    kept here as row indexes - read it with selection() and values(), not from
+    the tree.
+    """
+
+    BUFFER_ROWS = 10
+    NEAR_END_FRACTION = 0.8
+
+    def __init__(self, tree, v_scrollbar, on_near_end=None, on_select=None):
+        self.tree = tree
+        self.v_scrollbar = v_scrollbar
+        self.on_near_end = on_near_end  # Called when scrolled past NEAR_END_FRACTION, e.g. to fetch the next page
+        self.on_select = on_select  # Called with the event when the user changes the selection
+        self.rows = []
+        self.top = 0
+        self.selected = set()  # Row indexes, rendered or not
+        self.focus_index = None
+        self._in_near_end = False
+
+        style = tree.cget('style') or 'Treeview'
+        self.row_height = int(ttk.Style().lookup(style, 'rowheight') or 20)
+
+        v_scrollbar.configure(command=self.yview)
+        tree.configure(yscrollcommand=self._on_tree_scrolled)
+        tree.bind('<Configure>', lambda e: self.render(), add='+')
+        tree.bind('<MouseWheel>', self._on_mousewheel, add='+')
+        tree.bind('<Button-4>', lambda e: self._scroll_by(-3), add='+')
+        tree.bind('<Button-5>', lambda e: self._scroll_by(3), add='+')
+        tree.bind('<<TreeviewSelect>>', self._on_select, add='+')
+        for key in ('Up', 'Down', 'Prior', 'Next', 'Home', 'End'):
+            tree.bind(f'<{key}>', self._on_key, add='+')
+
+    def set_rows(self, rows):
+        """Replace all rows and scroll back to the top"""
+        self.rows = list(rows)
+        self.top = 0
+        self.selected = set()
+        self.focus_index = None
+        self._clear()
+        self.render()
+
+    def append_rows(self, rows):
+        """Add rows to the end of the list, keeping the scroll position"""
+        if rows:
+            self.rows.extend(rows)
+            self.render()
+
+    def insert_row(self, index, values, max_rows=None):
+        """Insert one row at index, dropping rows past max_rows from the end"""
+        self.rows.insert(index, values)
+        if max_rows is not None:
+            del self.rows[max_rows:]
+        self._shift_indexes(lambda i: i + 1 if i >= index else i)
+        self._clear()  # iids after the inserted row have shifted
+        self.render()
+
+    def delete_row(self, iid):
+        """Remove the row behind a tree item"""
+        index = int(iid)
+        del self.rows[index]
+        self.selected.discard(index)
+        if self.focus_index == index:
+            self.focus_index = None
+        self._shift_indexes(lambda i: i - 1 if i > index else i)
+        self._clear()  # iids after the deleted row have shifted
+        self.render()
+
+    def update_row(self, iid, values):
+        """Replace the values of the row behind a tree item"""
+        self.rows[int(iid)] = values
+        if self.tree.exists(iid):
+            self.tree.item(iid, values=values)
+
+    def selection(self):
+        """iids of all selected rows, including ones scrolled out of view"""
+        return [str(index) for index in sorted(self.selected)]
+
+    def values(self, iid):
+        """Row values behind an iid from selection()"""
+        return self.rows[int(iid)]
+
+    def see(self, index):
+        """Scroll so the row at index is in the viewport"""
+        visible = self.visible_rows()
+        if index < self.top:
+            self.top = index
+        elif index >= self.top + visible:
+            self.top = index - visible + 1
+        self.render()
+
+    def visible_rows(self):
+        height = self.tree.winfo_height()
+        if height <= 1:  # Not mapped yet - use the requested height in rows
+            return int(self.tree.cget('height'))
+        return max(1, height // self.row_height - 1)  # Less the heading row
+
+    def render(self):
+        """Insert the rows in the viewport and delete the ones that scrolled out"""
+        visible = self.visible_rows()
+        self.top = max(0, min(self.top, len(self.rows) - visible))
+        start = self.top
+        end = min(len(self.rows), start + visible + self.BUFFER_ROWS)
+
+        present = set()
+        stale = []
+        for iid in self.tree.get_children():
+            if start <= int(iid) < end:
+                present.add(int(iid))
+            else:
+                stale.append(iid)
+        if stale:
+            self.tree.delete(*stale)
+
+        for index in range(start, end):
+            if index not in present:
+                self.tree.insert('', index - start, iid=str(index), values=self.rows[index])
+
+        # Re-apply the selection and focus of rows that came back into view
+        wanted = {str(index) for index in self.selected if start <= index < end}
+        if wanted != set(self.tree.selection()):
+            self.tree.selection_set(list(wanted))
+        if self.focus_index is not None and start <= self.focus_index < end:
+            self.tree.focus(str(self.focus_index))
+
+        if self.rows:
+            self.v_scrollbar.set(start / len(self.rows), min(1.0, (start + visible) / len(self.rows)))
+        else:
+            self.v_scrollbar.set(0.0, 1.0)
+
+        if (self.on_near_end and self.rows and not self._in_near_end
+                and start + visible >= self.NEAR_END_FRACTION * len(self.rows)):
+            self._in_near_end = True
+            try:
+                self.on_near_end()
+            finally:
+                self._in_near_end = False
+
+    def yview(self, *args):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, 'units'|'pages')"""
+        if args[0] == 'moveto':
+            self.top = int(float(args[1]) * len(self.rows))
+            self.render()
+        elif args[0] == 'scroll':
+            step = self.visible_rows() if args[2] == 'pages' else 1
+            self._scroll_by(int(args[1]) * step)
+
+    def _scroll_by(self, count):
+        self.top += count
+        self.render()
+        return 'break'
+
+    def _on_tree_scrolled(self, first, last):
+        # The tree scrolled its own yview (e.g. a click on the partly visible last
+        # row): fold that offset into top so the first rendered row stays on top
+        shift = round(float(first) * len(self.tree.get_children()))
+        if shift:
+            self.tree.yview_moveto(0)
+            self._scroll_by(shift)
+
+    def _on_key(self, event):
+        """Move the focus row with Up/Down/PageUp/PageDown/Home/End across the whole list"""
+        if not self.rows:
+            return 'break'
+        current = self.focus_index if self.focus_index is not None else self.top
+        page = self.visible_rows()
+        target = {'Up': current - 1, 'Down': current + 1, 'Prior': current - page,
+                  'Next': current + page, 'Home': 0, 'End': len(self.rows) - 1}[event.keysym]
+        target = max(0, min(target, len(self.rows) - 1))
+        self.focus_index = target
+        self.selected = {target}
+        self.see(target)
+        self.tree.selection_set(str(target))
+        if self.on_select:
+            self.on_select(event)
+        return 'break'
+
+    def _on_select(self, event):
+        rendered = {int(iid) for iid in self.tree.get_children()}
+        current = {int(iid) for iid in self.tree.selection()}
+        if current == self.selected & rendered:
+            # Nothing changed for the user - render() re-applied the selection or
+            # deleted selected rows that scrolled out
+            return
+        if str(self.tree.cget('selectmode')) == 'extended':
+            self.selected = (self.selected - rendered) | current
+        else:
+            self.selected = current
+        focus = self.tree.focus()
+        if focus:
+            self.focus_index = int(focus)
+        if self.on_select:
+            self.on_select(event)
+
+    def _shift_indexes(self, move):
+        self.selected = {move(index) for index in self.selected}
+        self.selected = {index for index in self.selected if index < len(self.rows)}
+        if self.focus_index is not None:
+            self.focus_index = move(self.focus_index)
+            if self.focus_index >= len(self.rows):
+                self.focus_index = None
+
+    def _on_mousewheel(self, event):
+        # Windows reports multiples of 120, macOS small deltas
+        steps = -int(event.delta / 120) if abs(event.delta) >= 120 else -event.delta
+        return self._scroll_by(3 * steps)
+
+    def _clear(self):
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
+
+
+
+
 class AITCMMSSystem:
     """Complete AIT CMMS - Computerized Maintenance Management System"""
+
+    RECENT_COMPLETIONS_LIMIT = 500  # Rows shown in the Recent PM Completions list
+    EQUIPMENT_CACHE_TTL = 60  # Seconds the CM dialogs reuse the equipment number list
+    ANALYTICS_CACHE_TTL = 30  # Seconds a built analytics page is reused (writes here clear it sooner)
+
+    # CM list columns, ready for display: the description is truncated and the
+    # source worked out from the notes on the server, so the notes text and
+    # long descriptions never cross the network for the list
+    CM_LIST_COLUMNS = '''
+        cm_number, bfm_equipment_no,
+        CASE WHEN length(description) > 50 THEN left(description, 47) || '...'
+             ELSE COALESCE(description, '') END,
+        priority, assigned_technician, status, created_date,
+        CASE WHEN strpos(notes, 'Imported from SharePoint') > 0 THEN 'SharePoint'
+             ELSE 'Manual' END
+    '''
     
     def show_closing_sync_dialog(self):
         """Show dialog asking user to confirm database sync on close"""
@@ -2518,6 +2812,7 @@ class AITCMMSSystem:
                                 ('Cannot Find', bfm_no))
         
                 self.conn.commit()
+                self._equipment_cache = None
         
                 messagebox.showinfo("Success", f"Cannot Find asset {bfm_no} added successfully")
         
@@ -2579,10 +2874,9 @@ class AITCMMSSystem:
     
         row = 0
     
-        # CM Number (auto-generated)
+        # CM Number (reserved when the CM is saved)
         ttk.Label(form_frame, text="CM Number:").grid(row=row, column=0, sticky='w', pady=5)
-        cm_number = self.generate_cm_number()
-        cm_number_var = tk.StringVar(value=cm_number)
+        cm_number_var = tk.StringVar(value="Assigned on save")
         ttk.Entry(form_frame, textvariable=cm_number_var, width=20, state='readonly').grid(
             row=row, column=1, sticky='w', padx=5, pady=5)
         row += 1
@@ -2667,13 +2961,14 @@ class AITCMMSSystem:
             # Save to database
             try:
                 cursor = self.conn.cursor()
+                cm_number = self.generate_cm_number(cursor)
                 cursor.execute('''
                     INSERT INTO corrective_maintenance 
                     (cm_number, bfm_equipment_no, description, priority, 
                      assigned_technician, status, created_date, notes)
                     VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
                 ''', (
-                    cm_number_var.get(),
+                    cm_number,
                     bfm_var.get(),
                     description_text.get('1.0', 'end-1c').strip(),
                     priority_var.get(),
@@ -2683,6 +2978,7 @@ class AITCMMSSystem:
                     notes_text.get('1.0', 'end-1c').strip()
                 ))
                 self.conn.commit()
+                cm_number_var.set(cm_number)
             
                 messagebox.showinfo("Success", 
                                 f"CHECK: CM Created Successfully!\n\n"
@@ -2713,6 +3009,7 @@ class AITCMMSSystem:
                     pass
         
             except Exception as e:
+                self.conn.rollback()
                 messagebox.showerror("Error", f"Failed to create CM: {str(e)}")
     
         # Buttons
@@ -2729,24 +3026,86 @@ class AITCMMSSystem:
         ttk.Label(dialog, text=help_text, foreground='gray', font=('Arial', 9)).pack(pady=5)
 
 
-    def generate_cm_number(self):
-        """Generate next CM number in format CM-YYYYMMDD-XXXX"""
+    def _fetch_cm_for_completion(self, cm_number):
+        """CM row shown by the close and complete CM dialogs, or None if not found
+
+        Both dialogs share this query so the statement prepared as
+        'cm_complete_fetch' (once per connection - see
+        DatabaseConnectionPool.execute_prepared) always has one SQL text.
+        """
         cursor = self.conn.cursor()
-        today = datetime.now().strftime('%Y%m%d')
-        cursor.execute(
-            "SELECT MAX(CAST(SPLIT_PART(cm_number, '-', 3) AS INTEGER)) "
-            "FROM corrective_maintenance "
-            "WHERE cm_number LIKE %s",
-            (f'CM-{today}-%',)
-        )
+        db_pool.execute_prepared(cursor, 'cm_complete_fetch', '''
+            SELECT cm_number, bfm_equipment_no, description, assigned_technician, 
+                status, labor_hours, notes, root_cause, corrective_action
+            FROM corrective_maintenance 
+            WHERE cm_number = %(cm_number)s
+        ''', {'cm_number': str(cm_number)}, {'cm_number': 'text'})
+        return cursor.fetchone()
+
+    def _get_equipment_numbers(self, active_only=False):
+        """BFM numbers for the CM dialog combos, re-read at most every EQUIPMENT_CACHE_TTL seconds
+
+        Equipment edits in this session clear the cache straight away; the TTL
+        picks up changes made by other users.
+        """
+        if (self._equipment_cache is None
+                or time.monotonic() - self._equipment_cache_ts >= self.EQUIPMENT_CACHE_TTL):
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT bfm_equipment_no, status FROM equipment ORDER BY bfm_equipment_no')
+            self._equipment_cache = cursor.fetchall()
+            self._equipment_cache_ts = time.monotonic()
+
+        if active_only:
+            return [bfm_no for bfm_no, status in self._equipment_cache if status == 'Active']
+        return [bfm_no for bfm_no, _ in self._equipment_cache]
+
+    def _cached_analytics(self, key):
+        """Analytics text built for key in the last ANALYTICS_CACHE_TTL seconds, or None
+
+        PM, CM and equipment writes in this session clear the cache; the TTL
+        picks up changes made by other users.
+        """
+        built, text = self._analytics_cache.get(key, (0, None))
+        if text and time.monotonic() - built < self.ANALYTICS_CACHE_TTL:
+            return text
+        return None
+
+    def generate_cm_number(self, cursor):
+        """Reserve the next CM number in format CM-YYYYMMDD-XXXX
+
+        Call this on the cursor that INSERTs the CM, just before the INSERT: the
+        number is taken from cm_daily_counter in the caller's transaction, so it
+        is only used up when that transaction commits and two users saving at the
+        same time never get the same number. The day comes from this machine's
+        clock to match the date in the CM number.
+        """
+        now = datetime.now()
+        today = now.strftime('%Y%m%d')
+
+        # Primary-key update - no scan of today's CMs
+        db_pool.execute_prepared(cursor, 'cm_counter_next', '''
+            UPDATE cm_daily_counter SET next_seq = next_seq + 1
+            WHERE day = %(day)s
+            RETURNING next_seq - 1
+        ''', {'day': now.date()}, {'day': 'date'})
         result = cursor.fetchone()
 
-        if result[0]:
-            next_num = result[0] + 1
-        else:
-            next_num = 1
+        if result is None:
+            # First CM number of the day - start after any CMs already numbered
+            # today (created before this table existed)
+            cursor.execute('''
+                INSERT INTO cm_daily_counter (day, next_seq)
+                VALUES (%s, COALESCE((
+                    SELECT MAX(CAST(SPLIT_PART(cm_number, '-', 3) AS INTEGER))
+                    FROM corrective_maintenance
+                    WHERE cm_number LIKE %s
+                ), 0) + 2)
+                ON CONFLICT (day) DO UPDATE SET next_seq = cm_daily_counter.next_seq + 1
+                RETURNING next_seq - 1
+            ''', (now.date(), f'CM-{today}-%'))
+            result = cursor.fetchone()
 
-        return f"CM-{today}-{next_num:04d}"
+        return f"CM-{today}-{result[0]:04d}"
 
 
     def prompt_parts_required(self, cm_number, bfm_no, technician_name):
@@ -2827,15 +3186,19 @@ class AITCMMSSystem:
                 # Persist requests
                 cursor = self.conn.cursor()
                 today = datetime.now().strftime('%Y-%m-%d')
+                notes = notes_text.get('1.0', 'end-1c').strip()
+                rows = []
                 for vals in items:
                     part_no = vals[0] if len(vals) > 0 else ''
                     model_no = vals[1] if len(vals) > 1 else ''
                     website = vals[2] if len(vals) > 2 else ''
-                    cursor.execute('''
-                        INSERT INTO cm_parts_requests
-                        (cm_number, bfm_equipment_no, part_number, model_number, website, requested_by, requested_date, notes)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                    ''', (cm_number, bfm_no, part_no, model_no, website, technician_name, today, notes_text.get('1.0', 'end-1c').strip()))
+                    rows.append((cm_number, bfm_no, part_no, model_no, website, technician_name, today, notes))
+                # All requested parts in one INSERT
+                extras.execute_values(cursor, '''
+                    INSERT INTO cm_parts_requests
+                    (cm_number, bfm_equipment_no, part_number, model_number, website, requested_by, requested_date, notes)
+                    VALUES %s
+                ''', rows)
                 self.conn.commit()
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to save parts request: {e}")
@@ -3308,8 +3671,9 @@ class AITCMMSSystem:
                 return
         
             # Clear existing items
-            for item in self.backup_files_tree.get_children():
-                self.backup_files_tree.delete(item)
+            children = self.backup_files_tree.get_children()
+            if children:
+                self.backup_files_tree.delete(*children)
         
             # Get all backup files
             backup_files = []
@@ -3334,7 +3698,8 @@ class AITCMMSSystem:
                                 'modified': modified_time,
                                 'age_days': age_days
                             })
-                            print(f"DEBUG: Added backup file: {filename}")
+                            if DEBUG:
+                                print(f"DEBUG: Added backup file: {filename}")
                         except Exception as e:
                             print(f"Error reading backup file {filename}: {e}")
                             continue
@@ -3353,7 +3718,7 @@ class AITCMMSSystem:
             backup_files = backup_files[:15]
         
             # Add to tree
-            for idx, backup in enumerate(backup_files):
+            for backup in backup_files:
                 # Format file size
                 size_mb = backup['size'] / (1024 * 1024)
                 size_str = f"{size_mb:.1f} MB" if size_mb >= 1 else f"{backup['size']} bytes"
@@ -3365,11 +3730,8 @@ class AITCMMSSystem:
                     f"{backup['age_days']} days"
                 ))
 
-                print(f"DEBUG: Inserted item: {backup['filename']}")
-
-                # Yield to event loop periodically to keep UI responsive
-                if idx % 5 == 0:
-                    self.root.update_idletasks()
+                if DEBUG:
+                    print(f"DEBUG: Inserted item: {backup['filename']}")
         
             # Update info label
             if hasattr(self, 'backup_info_label'):
@@ -3781,6 +4143,10 @@ class AITCMMSSystem:
             )
 
             if result:
+                # Don't wait for background tasks; their connections go back to the pool
+                if hasattr(self, '_executor'):
+                    self._executor.shutdown(wait=False)
+
                 try:
                     # End user session
                     if hasattr(self, 'session_id') and self.session_id:
@@ -4953,75 +5319,24 @@ class AITCMMSSystem:
         try:
             cursor = self.conn.cursor()
         
-            # Get all PM completions with the same annual date (like 2026-08-18)
+            # Spread PM completions with the same annual date (like 2026-08-18) by the
+            # equipment's annual_offset_days - the offset new annual PMs are given
             cursor.execute('''
-                SELECT id, bfm_equipment_no, next_annual_pm_date 
-                FROM pm_completions 
-                WHERE next_annual_pm_date = '2026-08-18'
+                UPDATE pm_completions pc
+                SET next_annual_pm_date = to_char(pc.next_annual_pm_date::date + e.annual_offset_days, 'YYYY-MM-DD')
+                FROM equipment e
+                WHERE e.bfm_equipment_no = pc.bfm_equipment_no
+                  AND pc.next_annual_pm_date = '2026-08-18'
             ''')
-        
-            records = cursor.fetchall()
-            updated_count = 0
-        
-            for record_id, bfm_no, current_date in records:
-                try:
-                    # Apply same offset logic as the new code
-                    numeric_part = re.findall(r'\d+', bfm_no)
-                    if numeric_part:
-                        last_digits = int(numeric_part[-1]) % 61  # 0-60
-                        offset_days = last_digits - 30  # -30 to +30 days
-                    else:
-                        offset_days = (hash(bfm_no) % 61) - 30  # -30 to +30 days
-                
-                    # Calculate new date
-                    base_date = datetime.strptime(current_date, '%Y-%m-%d')
-                    new_date = (base_date + timedelta(days=offset_days)).strftime('%Y-%m-%d')
-                
-                    # Update the record
-                    cursor.execute('''
-                        UPDATE pm_completions 
-                        SET next_annual_pm_date = %s
-                        WHERE id = %s
-                    ''', (new_date, record_id))
-                
-                    updated_count += 1
-                
-                except Exception as e:
-                    print(f"Error updating record {record_id}: {e}")
-                    continue
+            updated_count = cursor.rowcount
         
             # Also update the equipment table next_annual_pm dates
             cursor.execute('''
-                SELECT bfm_equipment_no, next_annual_pm 
-                FROM equipment 
+                UPDATE equipment 
+                SET next_annual_pm = to_char(next_annual_pm::date + annual_offset_days, 'YYYY-MM-DD')
                 WHERE next_annual_pm = '2026-08-18'
             ''')
-        
-            equipment_records = cursor.fetchall()
-        
-            for bfm_no, current_date in equipment_records:
-                try:
-                    numeric_part = re.findall(r'\d+', bfm_no)
-                    if numeric_part:
-                        last_digits = int(numeric_part[-1]) % 61
-                        offset_days = last_digits - 30
-                    else:
-                        offset_days = (hash(bfm_no) % 61) - 30
-                
-                    base_date = datetime.strptime(current_date, '%Y-%m-%d')
-                    new_date = (base_date + timedelta(days=offset_days)).strftime('%Y-%m-%d')
-                
-                    cursor.execute('''
-                        UPDATE equipment 
-                        SET next_annual_pm = %s 
-                        WHERE bfm_equipment_no = %s
-                    ''', (new_date, bfm_no))
-                
-                    updated_count += 1
-                
-                except Exception as e:
-                    print(f"Error updating equipment {bfm_no}: {e}")
-                    continue
+            updated_count += cursor.rowcount
         
             self.conn.commit()
             messagebox.showinfo("Success", f"Updated {updated_count} records with spread dates!")
@@ -5219,6 +5534,50 @@ class AITCMMSSystem:
         # Initialize data storage
         self.equipment_data = []
         self.current_week_start = self.get_week_start(datetime.now())
+        self._last_backup_dir_mtime = 0  # SharePoint backup folder mtime seen by auto_pull_from_sharepoint
+        self._last_pulled_backup = None  # (path, mtime) of the newest backup auto_pull_from_sharepoint handled
+
+        # Background worker for database work that would otherwise block the Tk main loop
+        # (each task takes its own connection from db_pool)
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='CMMSWorker')
+        self._pm_submit_in_progress = False
+        self._db_dirty = False  # Set by PM write paths; auto_save_and_sync skips the SharePoint push when clean
+        self.cf_page_size = 200  # Cannot Find / Run to Failure rows fetched per page
+        self.cf_last_key = None
+        self.rtf_page_size = 200
+        self.rtf_last_key = None
+        self.cm_page_size = 500  # CMs fetched per page of the Corrective Maintenance list
+        self.cm_last_key = None
+        self.cm_has_more = False
+
+        self._tree_fill_tokens = {}  # Treeview -> token of its current insert_rows_in_chunks fill
+        self._equipment_cache = None  # (bfm_no, status) rows for the CM dialog equipment combos
+        self._equipment_cache_ts = 0
+        self._report_cache = {}  # week_start -> (signature, report text, tree rows, rate) for the weekly report
+        self._analytics_cache = {}  # page key -> (time.monotonic() built, analytics text)
+        self._pm_history_dialog = None  # Reused by show_recent_completions_for_equipment
+        self._pm_history_text_widget = None
+        self._cal_dialog = None  # Date picker window, hidden between uses (see _show_date_picker)
+        self._cal_widget = None
+        self._cal_target = None
+        self._cal_parent = None
+
+        # ReportLab styles shared by the Cannot Find / Run to Failure PDF exports
+        self._pdf_styles = getSampleStyleSheet()
+        self._pdf_title_red = ParagraphStyle('TitleStyle', parent=self._pdf_styles['Title'],
+                                             fontSize=18, textColor=colors.darkred, alignment=1)
+        self._pdf_title_blue = ParagraphStyle('TitleStyle', parent=self._pdf_styles['Title'],
+                                              fontSize=18, textColor=colors.darkblue, alignment=1)
+        self._pdf_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ])
     
         # Create GUI based on user role
         self.create_gui()
@@ -5268,7 +5627,6 @@ class AITCMMSSystem:
 
         except Exception as e:
             print(f"Error in deferred startup tasks: {e}")
-            import traceback
             traceback.print_exc()
 
     def close_cm_dialog(self):
@@ -5283,15 +5641,7 @@ class AITCMMSSystem:
         cm_number = item['values'][0]
     
         # Fetch CM details
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            SELECT cm_number, bfm_equipment_no, description, assigned_technician, 
-                status, labor_hours, notes, root_cause, corrective_action
-            FROM corrective_maintenance 
-            WHERE cm_number = %s
-        ''', (cm_number,))
-    
-        cm_data = cursor.fetchone()
+        cm_data = self._fetch_cm_for_completion(cm_number)
         if not cm_data:
             messagebox.showerror("Error", "CM not found")
             return
@@ -5485,6 +5835,7 @@ class AITCMMSSystem:
 
                 parts_dialog_state['open'] = False
                 dialog.destroy()
+                self._analytics_cache.clear()
                 self.load_corrective_maintenance()
 
             except Exception as e:
@@ -5615,6 +5966,7 @@ class AITCMMSSystem:
                         f"Status: Closed")
                 
                     dialog.destroy()
+                    self._analytics_cache.clear()
                     self.load_corrective_maintenance()
                 
                 except Exception as e:
@@ -6038,7 +6390,6 @@ class AITCMMSSystem:
             print("KPI system initialized successfully")
         except Exception as e:
             print(f"Error initializing KPI system: {e}")
-            import traceback
             traceback.print_exc()
 
     def create_kpi_tab(self):
@@ -6085,7 +6436,6 @@ class AITCMMSSystem:
                     # Process events
                     app.exec_()
                 except Exception as e:
-                    import traceback
                     messagebox.showerror("Error", f"Failed to open Enhanced KPI Dashboard:\n{str(e)}\n\n{traceback.format_exc()}")
 
             # Add button to launch standard KPI dashboard
@@ -6100,7 +6450,6 @@ class AITCMMSSystem:
                     # Process events
                     app.exec_()
                 except Exception as e:
-                    import traceback
                     messagebox.showerror("Error", f"Failed to open KPI Dashboard:\n{str(e)}\n\n{traceback.format_exc()}")
 
             # Enhanced dashboard button (primary)
@@ -6158,7 +6507,6 @@ class AITCMMSSystem:
             error_label.pack(pady=50)
 
         except Exception as e:
-            import traceback
             messagebox.showerror("Error", f"Failed to create KPI tab:\n{str(e)}\n\n{traceback.format_exc()}")
 
     def create_custom_pm_template_dialog(self):
@@ -6397,8 +6745,9 @@ class AITCMMSSystem:
             ''')
         
             # Clear existing items
-            for item in self.templates_tree.get_children():
-                self.templates_tree.delete(item)
+            children = self.templates_tree.get_children()
+            if children:
+                self.templates_tree.delete(*children)
         
             # Add templates
             for template in cursor.fetchall():
@@ -6442,8 +6791,9 @@ class AITCMMSSystem:
                 ''')
         
             # Clear and repopulate
-            for item in self.templates_tree.get_children():
-                self.templates_tree.delete(item)
+            children = self.templates_tree.get_children()
+            if children:
+                self.templates_tree.delete(*children)
         
             for template in cursor.fetchall():
                 bfm_no, name, pm_type, checklist_json, est_hours, updated = template
@@ -6472,8 +6822,9 @@ class AITCMMSSystem:
             ''')
 
             # Clear existing items
-            for item in self.equipment_pm_tree.get_children():
-                self.equipment_pm_tree.delete(item)
+            children = self.equipment_pm_tree.get_children()
+            if children:
+                self.equipment_pm_tree.delete(*children)
 
             # Add equipment
             for equipment in cursor.fetchall():
@@ -6511,8 +6862,9 @@ class AITCMMSSystem:
                 ''')
 
             # Clear and repopulate
-            for item in self.equipment_pm_tree.get_children():
-                self.equipment_pm_tree.delete(item)
+            children = self.equipment_pm_tree.get_children()
+            if children:
+                self.equipment_pm_tree.delete(*children)
 
             for equipment in cursor.fetchall():
                 bfm_no, sap_no, description, location = equipment
@@ -6551,8 +6903,9 @@ class AITCMMSSystem:
             ''', (bfm_no,))
 
             # Clear templates tree
-            for item in self.templates_tree.get_children():
-                self.templates_tree.delete(item)
+            children = self.templates_tree.get_children()
+            if children:
+                self.templates_tree.delete(*children)
 
             # Add templates for selected equipment
             templates = cursor.fetchall()
@@ -7621,6 +7974,14 @@ class AITCMMSSystem:
                     FOREIGN KEY (bfm_equipment_no) REFERENCES equipment (bfm_equipment_no)
                 )
             ''')
+
+            # Next CM-YYYYMMDD-XXXX sequence number per day (see generate_cm_number)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS cm_daily_counter (
+                    day DATE PRIMARY KEY,
+                    next_seq INTEGER NOT NULL
+                )
+            ''')
         
             # CM Parts Requests table (for requesting parts during CM creation)
             cursor.execute('''
@@ -7656,6 +8017,23 @@ class AITCMMSSystem:
                 ''')
             except Exception as e:
                 print(f"Note: Unable to update cm_parts_requests FK to ON DELETE CASCADE: {e}")
+
+            # PM completion writes touch pm_completions, equipment and weekly_pm_schedules
+            # in one transaction - check their equipment FKs once at COMMIT
+            for fk_table in ('pm_completions', 'weekly_pm_schedules'):
+                cursor.execute(f'''
+                    DO $$
+                    BEGIN
+                        IF EXISTS (
+                            SELECT 1 FROM pg_constraint
+                            WHERE conname = '{fk_table}_bfm_equipment_no_fkey' AND NOT condeferrable
+                        ) THEN
+                            ALTER TABLE {fk_table}
+                            ALTER CONSTRAINT {fk_table}_bfm_equipment_no_fkey
+                            DEFERRABLE INITIALLY DEFERRED;
+                        END IF;
+                    END $$
+                ''')
         
             # Work Orders table
             cursor.execute('''
@@ -7769,6 +8147,49 @@ class AITCMMSSystem:
                 )
             ''')
 
+            # Weekly Reports table - one saved report per week (generate_current_week_report)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS weekly_reports (
+                    id SERIAL PRIMARY KEY,
+                    week_start_date TEXT,
+                    total_scheduled INTEGER,
+                    total_completed INTEGER,
+                    completion_rate REAL,
+                    technician_performance JSONB,
+                    report_data TEXT,
+                    created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+
+            # Older tables stored technician_performance as JSON text
+            cursor.execute('''
+                DO $$
+                BEGIN
+                    IF EXISTS (
+                        SELECT 1 FROM information_schema.columns
+                        WHERE table_name = 'weekly_reports' AND column_name = 'technician_performance'
+                        AND data_type = 'text'
+                    ) THEN
+                        ALTER TABLE weekly_reports
+                        ALTER COLUMN technician_performance TYPE JSONB
+                        USING NULLIF(technician_performance, '')::jsonb;
+                    END IF;
+                END $$
+            ''')
+
+            # The report upsert needs week_start_date unique; tables carried over from
+            # SQLite may hold several reports per week, so keep only the newest first
+            cursor.execute('''
+                DELETE FROM weekly_reports older
+                USING weekly_reports newer
+                WHERE older.week_start_date = newer.week_start_date
+                AND older.id < newer.id
+            ''')
+            cursor.execute('''
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_weekly_reports_week
+                ON weekly_reports(week_start_date)
+            ''')
+
             # ===== MULTI-USER SUPPORT TABLES =====
             # Users table for authentication
             cursor.execute('''
@@ -7818,6 +8239,180 @@ class AITCMMSSystem:
                 )
             ''')
 
+            # Stable per-equipment offset used to spread annual PMs (-30 to +30 days):
+            # last number in the BFM number mod 61, or an md5 byte when there is none
+            cursor.execute('''
+                ALTER TABLE equipment
+                ADD COLUMN IF NOT EXISTS annual_offset_days SMALLINT
+                GENERATED ALWAYS AS (
+                    COALESCE(
+                        (substring(bfm_equipment_no from '([0-9]+)[^0-9]*$')::numeric % 61)::smallint,
+                        (get_byte(decode(md5(COALESCE(bfm_equipment_no, '')), 'hex'), 0) % 61)::smallint
+                    ) - 30
+                ) STORED
+            ''')
+
+            # Labor time in hours, stored so the analytics aggregate one column
+            # instead of evaluating labor_hours + labor_minutes/60.0 on every row
+            cursor.execute('''
+                ALTER TABLE pm_completions
+                ADD COLUMN IF NOT EXISTS total_hours DOUBLE PRECISION
+                GENERATED ALWAYS AS (labor_hours + labor_minutes / 60.0) STORED
+            ''')
+
+            # Latest PM per (equipment, PM type) - maintained by trigger so the
+            # duplicate check is a primary key lookup instead of ORDER BY ... LIMIT 1
+            # NOTE: last_date is TEXT to match pm_completions.completion_date
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS pm_latest (
+                    bfm_equipment_no TEXT NOT NULL,
+                    pm_type TEXT NOT NULL,
+                    last_date TEXT,
+                    last_tech TEXT,
+                    completion_id INTEGER,
+                    PRIMARY KEY (bfm_equipment_no, pm_type)
+                )
+            ''')
+
+            cursor.execute('''
+                CREATE OR REPLACE FUNCTION pm_latest_refresh() RETURNS trigger AS $$
+                BEGIN
+                    IF TG_OP = 'INSERT' THEN
+                        IF NEW.bfm_equipment_no IS NULL OR NEW.pm_type IS NULL THEN
+                            RETURN NEW;
+                        END IF;
+                        INSERT INTO pm_latest (bfm_equipment_no, pm_type, last_date, last_tech, completion_id)
+                        VALUES (NEW.bfm_equipment_no, NEW.pm_type, NEW.completion_date, NEW.technician_name, NEW.id)
+                        ON CONFLICT (bfm_equipment_no, pm_type) DO UPDATE SET
+                            last_date = EXCLUDED.last_date,
+                            last_tech = EXCLUDED.last_tech,
+                            completion_id = EXCLUDED.completion_id
+                        WHERE pm_latest.last_date IS NULL OR pm_latest.last_date <= EXCLUDED.last_date;
+                        RETURN NEW;
+                    END IF;
+
+                    -- UPDATE/DELETE: recompute the affected key from pm_completions
+                    DELETE FROM pm_latest
+                    WHERE bfm_equipment_no = OLD.bfm_equipment_no AND pm_type = OLD.pm_type;
+                    INSERT INTO pm_latest (bfm_equipment_no, pm_type, last_date, last_tech, completion_id)
+                    SELECT bfm_equipment_no, pm_type, completion_date, technician_name, id
+                    FROM pm_completions
+                    WHERE bfm_equipment_no = OLD.bfm_equipment_no AND pm_type = OLD.pm_type
+                    ORDER BY completion_date DESC LIMIT 1;
+                    IF TG_OP = 'UPDATE' THEN
+                        INSERT INTO pm_latest (bfm_equipment_no, pm_type, last_date, last_tech, completion_id)
+                        SELECT bfm_equipment_no, pm_type, completion_date, technician_name, id
+                        FROM pm_completions
+                        WHERE bfm_equipment_no = NEW.bfm_equipment_no AND pm_type = NEW.pm_type
+                        ORDER BY completion_date DESC LIMIT 1
+                        ON CONFLICT (bfm_equipment_no, pm_type) DO UPDATE SET
+                            last_date = EXCLUDED.last_date,
+                            last_tech = EXCLUDED.last_tech,
+                            completion_id = EXCLUDED.completion_id;
+                    END IF;
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql
+            ''')
+
+            cursor.execute('DROP TRIGGER IF EXISTS trg_pm_latest ON pm_completions')
+            cursor.execute('''
+                CREATE TRIGGER trg_pm_latest
+                AFTER INSERT OR UPDATE OF bfm_equipment_no, pm_type, completion_date, technician_name OR DELETE
+                ON pm_completions
+                FOR EACH ROW EXECUTE FUNCTION pm_latest_refresh()
+            ''')
+
+            # One-time backfill for databases created before pm_latest existed
+            cursor.execute('''
+                INSERT INTO pm_latest (bfm_equipment_no, pm_type, last_date, last_tech, completion_id)
+                SELECT DISTINCT ON (bfm_equipment_no, pm_type)
+                    bfm_equipment_no, pm_type, completion_date, technician_name, id
+                FROM pm_completions
+                WHERE bfm_equipment_no IS NOT NULL AND pm_type IS NOT NULL
+                AND NOT EXISTS (SELECT 1 FROM pm_latest)
+                ORDER BY bfm_equipment_no, pm_type, completion_date DESC
+                ON CONFLICT (bfm_equipment_no, pm_type) DO NOTHING
+            ''')
+
+            # Completions and labor per (month, technician, PM type) - maintained by
+            # trigger so the monthly analytics read a few hundred rollup rows instead
+            # of grouping all of pm_completions. NULL technician/PM type are stored as
+            # '' (key columns); labor_hours_count counts rows with labor recorded so
+            # labor_hours_sum / labor_hours_count matches AVG() over pm_completions
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS pm_completions_monthly (
+                    month TEXT NOT NULL,
+                    technician_name TEXT NOT NULL,
+                    pm_type TEXT NOT NULL,
+                    completions INTEGER NOT NULL,
+                    labor_hours_sum DOUBLE PRECISION NOT NULL,
+                    labor_hours_count INTEGER NOT NULL,
+                    PRIMARY KEY (month, technician_name, pm_type)
+                )
+            ''')
+
+            cursor.execute('''
+                CREATE OR REPLACE FUNCTION pm_monthly_refresh() RETURNS trigger AS $$
+                DECLARE
+                    hours DOUBLE PRECISION;
+                BEGIN
+                    -- completion_date is 'YYYY-MM-DD' text; rows without a usable date are not counted
+                    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.completion_date::text ~ '^[0-9]{4}-[0-9]{2}' THEN
+                        hours := OLD.total_hours;
+                        UPDATE pm_completions_monthly SET
+                            completions = completions - 1,
+                            labor_hours_sum = labor_hours_sum - COALESCE(hours, 0),
+                            labor_hours_count = labor_hours_count - (hours IS NOT NULL)::int
+                        WHERE month = left(OLD.completion_date::text, 7)
+                        AND technician_name = COALESCE(OLD.technician_name, '')
+                        AND pm_type = COALESCE(OLD.pm_type, '');
+                        DELETE FROM pm_completions_monthly
+                        WHERE month = left(OLD.completion_date::text, 7)
+                        AND technician_name = COALESCE(OLD.technician_name, '')
+                        AND pm_type = COALESCE(OLD.pm_type, '')
+                        AND completions <= 0;
+                    END IF;
+
+                    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.completion_date::text ~ '^[0-9]{4}-[0-9]{2}' THEN
+                        hours := NEW.total_hours;
+                        INSERT INTO pm_completions_monthly
+                            (month, technician_name, pm_type, completions, labor_hours_sum, labor_hours_count)
+                        VALUES (left(NEW.completion_date::text, 7), COALESCE(NEW.technician_name, ''),
+                                COALESCE(NEW.pm_type, ''), 1, COALESCE(hours, 0), (hours IS NOT NULL)::int)
+                        ON CONFLICT (month, technician_name, pm_type) DO UPDATE SET
+                            completions = pm_completions_monthly.completions + 1,
+                            labor_hours_sum = pm_completions_monthly.labor_hours_sum + EXCLUDED.labor_hours_sum,
+                            labor_hours_count = pm_completions_monthly.labor_hours_count + EXCLUDED.labor_hours_count;
+                    END IF;
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql
+            ''')
+
+            cursor.execute('DROP TRIGGER IF EXISTS trg_pm_monthly ON pm_completions')
+            cursor.execute('''
+                CREATE TRIGGER trg_pm_monthly
+                AFTER INSERT OR UPDATE OF completion_date, technician_name, pm_type, labor_hours, labor_minutes OR DELETE
+                ON pm_completions
+                FOR EACH ROW EXECUTE FUNCTION pm_monthly_refresh()
+            ''')
+
+            # One-time backfill for databases created before pm_completions_monthly existed
+            cursor.execute('''
+                INSERT INTO pm_completions_monthly
+                    (month, technician_name, pm_type, completions, labor_hours_sum, labor_hours_count)
+                SELECT left(completion_date::text, 7), COALESCE(technician_name, ''), COALESCE(pm_type, ''),
+                    COUNT(*),
+                    COALESCE(SUM(total_hours), 0),
+                    COUNT(total_hours)
+                FROM pm_completions
+                WHERE completion_date::text ~ '^[0-9]{4}-[0-9]{2}'
+                AND NOT EXISTS (SELECT 1 FROM pm_completions_monthly)
+                GROUP BY 1, 2, 3
+                ON CONFLICT (month, technician_name, pm_type) DO NOTHING
+            ''')
+
             # PERFORMANCE OPTIMIZATION: Create comprehensive indexes for all tables
             # These indexes dramatically improve query performance across the system
             print("CHECK: Creating comprehensive performance indexes...")
@@ -7829,9 +8424,23 @@ class AITCMMSSystem:
                 WHERE status = 'Scheduled'
             ''')
 
+            # Covering index for the weekly report aggregates (index-only scans);
+            # it replaces the plain (week_start_date, status) index
             cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_weekly_pm_schedules_week_status
+                CREATE INDEX IF NOT EXISTS idx_wpm_week_status
                 ON weekly_pm_schedules(week_start_date, status)
+                INCLUDE (assigned_technician, pm_type, labor_hours)
+            ''')
+
+            cursor.execute('DROP INDEX IF EXISTS idx_weekly_pm_schedules_week_status')
+
+            # Week + technician in GROUP BY order: per-technician report rows stream out
+            # of the index already sorted, and the technician schedule view (which filters
+            # on both columns) gets an index-only scan
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_wpm_week_tech
+                ON weekly_pm_schedules(week_start_date, assigned_technician)
+                INCLUDE (status, labor_hours, pm_type)
             ''')
 
             cursor.execute('''
@@ -7850,6 +8459,11 @@ class AITCMMSSystem:
                 ON equipment(status)
             ''')
 
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_equipment_status_bfm
+                ON equipment(status, bfm_equipment_no)
+            ''')
+
             cursor.execute('''
                 CREATE INDEX IF NOT EXISTS idx_equipment_master_lin
                 ON equipment(master_lin)
@@ -7882,6 +8496,17 @@ class AITCMMSSystem:
                 ON corrective_maintenance(reported_date)
             ''')
 
+            # Matches the keyset pagination in _fetch_cm_page, unfiltered and by status
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_cm_created_keyset
+                ON corrective_maintenance((COALESCE(created_date, '-infinity'::timestamp)) DESC, cm_number DESC)
+            ''')
+
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_cm_status_created_keyset
+                ON corrective_maintenance(status, (COALESCE(created_date, '-infinity'::timestamp)) DESC, cm_number DESC)
+            ''')
+
             cursor.execute('''
                 CREATE INDEX IF NOT EXISTS idx_cm_open_by_technician
                 ON corrective_maintenance(assigned_technician, status, priority)
@@ -7889,21 +8514,36 @@ class AITCMMSSystem:
             ''')
 
             # === PM Completions Indexes ===
+            # Per-equipment history newest first (PM history, equipment trends,
+            # duplicate check); also serves plain bfm_equipment_no lookups, so it
+            # replaces the single-column index
             cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_pm_completions_equipment
-                ON pm_completions(bfm_equipment_no)
+                CREATE INDEX IF NOT EXISTS idx_pm_completions_equipment_date
+                ON pm_completions(bfm_equipment_no, completion_date DESC)
             ''')
+            cursor.execute('DROP INDEX IF EXISTS idx_pm_completions_equipment')
 
+            # Date-range aggregates (last 30/90/365 days) read hours, PM type and
+            # technician from the index alone; this replaces the plain date index
             cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_pm_completions_date
-                ON pm_completions(completion_date)
+                CREATE INDEX IF NOT EXISTS idx_pm_completions_date_covering
+                ON pm_completions(completion_date) INCLUDE (total_hours, pm_type, technician_name)
             ''')
+            cursor.execute('DROP INDEX IF EXISTS idx_pm_completions_date')
 
             cursor.execute('''
                 CREATE INDEX IF NOT EXISTS idx_pm_completions_technician
                 ON pm_completions(technician_name)
             ''')
 
+            # === Cannot Find Indexes ===
+            # Matches the keyset pagination in _fetch_cannot_find_page
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_cannot_find_missing_keyset
+                ON cannot_find_assets((COALESCE(reported_date, '')) DESC, (COALESCE(bfm_equipment_no, '')) DESC)
+                WHERE status = 'Missing'
+            ''')
+
             # === Audit Log Indexes ===
             cursor.execute('''
                 CREATE INDEX IF NOT EXISTS idx_audit_log_timestamp
@@ -8646,9 +9286,12 @@ class AITCMMSSystem:
             self.recent_completions_tree.heading(col, text=col)
             self.recent_completions_tree.column(col, width=120)
         
+        recent_v_scrollbar = ttk.Scrollbar(recent_frame, orient='vertical')
+        recent_v_scrollbar.pack(side='right', fill='y')
         self.recent_completions_tree.pack(fill='both', expand=True)
+        self.recent_completions_view = VirtualTreeview(self.recent_completions_tree, recent_v_scrollbar,
+                                                       on_select=self.on_completion_select)
         self.recent_completions_tree.bind('<Double-1>', self.on_completion_double_click)
-        self.recent_completions_tree.bind('<<TreeviewSelect>>', self.on_completion_select)
         
         # Load recent completions
         self.load_recent_completions()
@@ -8904,7 +9547,7 @@ class AITCMMSSystem:
         
             cursor.execute('''
                 SELECT pm_type, technician_name, completion_date, 
-                    (labor_hours + labor_minutes/60.0) as total_hours,
+                    total_hours,
                     SUBSTR(notes, 1, 50) as notes_preview
                 FROM pm_completions 
                 WHERE bfm_equipment_no = %s
@@ -9073,7 +9716,7 @@ class AITCMMSSystem:
                         pc.technician_name,
                         pc.labor_hours,
                         pc.labor_minutes,
-                        (pc.labor_hours + pc.labor_minutes/60.0) as total_hours,
+                        pc.total_hours,
                         pc.special_equipment,
                         pc.notes,
                         pc.pm_due_date,
@@ -9122,13 +9765,12 @@ class AITCMMSSystem:
     
     def on_completion_double_click(self, event):
         """Handle double-click on recent PM completions to generate PDF"""
-        selection = self.recent_completions_tree.selection()
+        selection = self.recent_completions_view.selection()
         if not selection:
             return
     
-        # Get the selected item's values
-        item = self.recent_completions_tree.item(selection[0])
-        values = item['values']
+        # Get the selected row's values
+        values = self.recent_completions_view.values(selection[0])
     
         if len(values) >= 5:
             completion_date = values[0]
@@ -9141,13 +9783,12 @@ class AITCMMSSystem:
 
     def on_completion_select(self, event):
         """Handle single-click on recent PM completions to populate form fields"""
-        selection = self.recent_completions_tree.selection()
+        selection = self.recent_completions_view.selection()
         if not selection:
             return
 
-        # Get the selected item's values
-        item = self.recent_completions_tree.item(selection[0])
-        values = item['values']
+        # Get the selected row's values
+        values = self.recent_completions_view.values(selection[0])
 
         if len(values) >= 5:
             completion_date = values[0]
@@ -9220,9 +9861,10 @@ class AITCMMSSystem:
             next_annual_pm_date = completion_data[10] # '2026-09-10'
             # Skip column 11 and 12 (appears to be form type and status)
             updated_date = completion_data[13]        # '2025-09-22 11:31:50'
-            sap_material_no = completion_data[14]     # '96007107'
-            description = completion_data[15]         # 'DRILL TEMPLATE FOR STRINGER SPLICE FR30'
-            location = completion_data[16]            # 'LCS001 TOP'
+            # Equipment columns follow pc.*, so they are taken from the end of the row
+            sap_material_no = completion_data[-3]     # '96007107'
+            description = completion_data[-2]         # 'DRILL TEMPLATE FOR STRINGER SPLICE FR30'
+            location = completion_data[-1]            # 'LCS001 TOP'
         
             # Create PDF document
             doc = SimpleDocTemplate(filename, pagesize=letter)
@@ -9398,6 +10040,10 @@ class AITCMMSSystem:
         cf_v_scrollbar.grid(row=0, column=1, sticky='ns')
         cf_h_scrollbar.grid(row=1, column=0, sticky='ew')
 
+        # Only the rows in view are inserted; the vertical scrollbar follows the full list
+        self.cannot_find_view = VirtualTreeview(self.cannot_find_tree, cf_v_scrollbar,
+                                                on_near_end=self.load_more_cannot_find_assets)
+
         list_frame.grid_rowconfigure(0, weight=1)
         list_frame.grid_columnconfigure(0, weight=1)
 
@@ -9408,8 +10054,8 @@ class AITCMMSSystem:
     
     def delete_cannot_find_asset(self):
         """Permanently delete selected asset from the cannot_find_assets table"""
-        # Get selected item
-        selected_item = self.cannot_find_tree.selection()
+        # Get selected item - iids are row indexes into the view's rows
+        selected_item = self.cannot_find_view.selection()
 
         if not selected_item:
             messagebox.showwarning("No Selection", "Please select an asset to delete.")
@@ -9417,7 +10063,7 @@ class AITCMMSSystem:
 
         # Get the selected item data
         item = selected_item[0]
-        asset_data = self.cannot_find_tree.item(item)['values']
+        asset_data = self.cannot_find_view.values(item)
         bfm_number = asset_data[0]  # BFM is the first column
         description = asset_data[1] if len(asset_data) > 1 else ''
 
@@ -9447,9 +10093,10 @@ class AITCMMSSystem:
             
                 # Commit the changes
                 self.conn.commit()
+                self._equipment_cache = None
             
                 # Remove from treeview display
-                self.cannot_find_tree.delete(item)
+                self._remove_cannot_find_row(item, bfm_number)
             
                 # Update statistics if method exists
                 if hasattr(self, 'update_equipment_statistics'):
@@ -9477,16 +10124,16 @@ class AITCMMSSystem:
 
     def edit_cannot_find_asset(self):
         """Edit selected asset from cannot find list"""
-        # Get selected item
-        selected_item = self.cannot_find_tree.selection()
+        # Get selected item - iids are row indexes into the view's rows
+        selected_item = self.cannot_find_view.selection()
     
         if not selected_item:
             messagebox.showwarning("No Selection", "Please select an asset to edit.")
             return
     
-        # Get the selected item data
+        # Get the selected item data (blank instead of None in the form fields)
         item = selected_item[0]
-        asset_data = self.cannot_find_tree.item(item)['values']
+        asset_data = ['' if value is None else value for value in self.cannot_find_view.values(item)]
         
         # Open edit window
         self.open_edit_window(item, asset_data)
@@ -9588,7 +10235,7 @@ class AITCMMSSystem:
                 # Example: self.update_asset_in_database(updated_data)
             
                 # Update treeview
-                self.cannot_find_tree.item(tree_item, values=updated_data)
+                self.cannot_find_view.update_row(tree_item, updated_data)
             
                 # Show success message
                 messagebox.showinfo("Success", "Asset information updated successfully.")
@@ -9687,6 +10334,10 @@ class AITCMMSSystem:
         self.run_to_failure_tree.grid(row=0, column=0, sticky='nsew')
         rtf_v_scrollbar.grid(row=0, column=1, sticky='ns')
         rtf_h_scrollbar.grid(row=1, column=0, sticky='ew')
+
+        # Only the rows in view are inserted; the vertical scrollbar follows the full list
+        self.run_to_failure_view = VirtualTreeview(self.run_to_failure_tree, rtf_v_scrollbar,
+                                                   on_near_end=self.load_more_run_to_failure_assets)
     
         list_frame.grid_rowconfigure(0, weight=1)
         list_frame.grid_columnconfigure(0, weight=1)
@@ -9717,6 +10368,9 @@ class AITCMMSSystem:
                 command=self.complete_cm_dialog).pack(side='left', padx=5)
         ttk.Button(controls_row1, text="Refresh CM List", 
                 command=self.load_corrective_maintenance_with_filter).pack(side='left', padx=5)
+        self.cm_load_more_button = ttk.Button(controls_row1, text="Load More CMs",
+                command=self.load_more_corrective_maintenance, state='disabled')
+        self.cm_load_more_button.pack(side='left', padx=5)
 
         # Filter controls
         filter_frame = ttk.Frame(controls_frame)
@@ -9785,39 +10439,26 @@ class AITCMMSSystem:
         # Initialize/clear filter data
         self.cm_original_data = []
     
-        # Call your existing load method
-        self.load_corrective_maintenance()
-    
-        # After loading, capture data for filtering
-        for item in self.cm_tree.get_children():
-            item_values = self.cm_tree.item(item, 'values')
-            self.cm_original_data.append(item_values)
-    
-        # Reset filter to show all
+        # Reset filter to show all (the status filter is part of the page query)
         if hasattr(self, 'cm_filter_var'):
             self.cm_filter_var.set("All")
     
-    def filter_cm_list(self, event=None):
-        """Filter the CM list based on selected status"""
-        # Don't filter if no data is loaded yet
-        if not hasattr(self, 'cm_original_data') or not self.cm_original_data:
-         
-            return
-        
-        selected_filter = self.cm_filter_var.get()
-        
-    
-        # Clear current tree
-        for item in self.cm_tree.get_children():
-            self.cm_tree.delete(item)
+        # Call your existing load method (it also captures the rows it loaded -
+        # the tree is filled in chunks, so it can't be read back here)
+        self.load_corrective_maintenance()
     
-        # Filter and display data
-        filtered_count = 0
-        for item_data in self.cm_original_data:
-            # Check if status matches (Status is at index 5)
-            if selected_filter == "All" or (len(item_data) > 5 and str(item_data[5]) == selected_filter):
-                self.cm_tree.insert('', 'end', values=item_data)
-                filtered_count += 1
+    def filter_cm_list(self, event=None):
+        """Filter the CM list based on selected status
+
+        The status is applied by the page query, so the list is reloaded from
+        the first page - CMs older than the pages loaded so far are found too.
+        """
+        self.load_corrective_maintenance()
+
+    def _cm_status_filter(self):
+        """Status picked in the CM list filter, or None for all CMs"""
+        selected_filter = self.cm_filter_var.get() if hasattr(self, 'cm_filter_var') else "All"
+        return None if selected_filter in ("", "All") else selected_filter
         
     def clear_cm_filter(self):
         """Clear the filter and show all items"""
@@ -10066,40 +10707,112 @@ class AITCMMSSystem:
 
     # Enhanced load_corrective_maintenance to show source
     def load_corrective_maintenance(self):
-        """Load corrective maintenance data with enhanced source tracking"""
+        """Load the first page of corrective maintenance data with enhanced source tracking"""
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('''
-                SELECT cm_number, bfm_equipment_no, description, priority, 
-                    assigned_technician, status, created_date, notes
-                FROM corrective_maintenance 
-                ORDER BY created_date DESC
-            ''')
+            self.cm_last_key = None
+            rows = self._fetch_cm_page()
         
-            # Clear existing items
-            for item in self.cm_tree.get_children():
-                self.cm_tree.delete(item)
+            # Clear existing items - a fill still pending from an earlier load stops first
+            token = self._tree_fill_tokens[self.cm_tree] = object()
+            children = self.cm_tree.get_children()
+            if children:
+                self.cm_tree.delete(*children)
         
-            # Add CM records
-            for idx, cm in enumerate(cursor.fetchall()):
-                cm_number, bfm_no, description, priority, assigned, status, created, notes = cm
+            # Add CM records - insert_rows_in_chunks hands the tree inserts to after_idle
+            self.cm_original_data = rows
+            self.insert_rows_in_chunks(self.cm_tree, rows, token=token)
+            
+        except Exception as e:
+            print(f"Error loading corrective maintenance: {e}")
+
+    def load_more_corrective_maintenance(self):
+        """Append the next page of CMs (Load More CMs button), keeping the status filter"""
+        if not self.cm_has_more:
+            return
+        try:
+            rows = self._fetch_cm_page()
+            self.cm_original_data.extend(rows)
 
-                # Determine source
-                source = "SharePoint" if notes and "Imported from SharePoint" in notes else "Manual"
+            # The tree shows cm_original_data in order, so carry on from the rows
+            # already inserted - this also takes over a first-page fill still pending
+            self.insert_rows_in_chunks(self.cm_tree, self.cm_original_data,
+                                       start=len(self.cm_tree.get_children()))
 
-                # Truncate description for display
-                display_desc = (description[:47] + '...') if description and len(description) > 50 else (description or '')
+        except Exception as e:
+            print(f"Error loading more corrective maintenance: {e}")
 
-                self.cm_tree.insert('', 'end', values=(
-                    cm_number, bfm_no, display_desc, priority, assigned, status, created, source
-                ))
+    def _fetch_cm_page(self):
+        """Fetch the page of CMs after cm_last_key matching the status filter, newest first
+
+        Keyset pagination on (created_date, cm_number) - CMs without a created date
+        sort last - so each page costs the same however far down the list it is.
+        """
+        last_date, last_cm = self.cm_last_key or (None, None)
+        cursor = self.conn.cursor()
+        cursor.execute(f'''
+            SELECT {self.CM_LIST_COLUMNS}
+            FROM corrective_maintenance 
+            WHERE (%(status)s IS NULL OR status = %(status)s)
+              AND (%(last_cm)s IS NULL
+                   OR (COALESCE(created_date, '-infinity'::timestamp), cm_number) < (%(last_date)s::timestamp, %(last_cm)s))
+            ORDER BY COALESCE(created_date, '-infinity'::timestamp) DESC, cm_number DESC
+            LIMIT %(limit)s
+        ''', {'status': self._cm_status_filter(), 'last_date': last_date, 'last_cm': last_cm,
+              'limit': self.cm_page_size})
+        rows = cursor.fetchall()
+
+        self.cm_has_more = len(rows) == self.cm_page_size
+        if rows:
+            last_row = rows[-1]
+            self.cm_last_key = (last_row[6] if last_row[6] is not None else '-infinity', last_row[0])
+        if hasattr(self, 'cm_load_more_button'):
+            self.cm_load_more_button.config(state='normal' if self.cm_has_more else 'disabled')
+        return rows
+
+    def _find_cm_item(self, cm_number, iid=None):
+        """Tree item showing cm_number - iid is tried first (usually the selection)"""
+        if iid is not None and self.cm_tree.exists(iid) and str(self.cm_tree.set(iid, 'CM Number')) == cm_number:
+            return iid
+        for item in self.cm_tree.get_children():
+            if str(self.cm_tree.set(item, 'CM Number')) == cm_number:
+                return item
+        return None
+
+    def refresh_cm_row(self, cm_number, iid=None):
+        """Re-read one CM and update its list row instead of reloading every CM"""
+        try:
+            cursor = self.conn.cursor()
+            db_pool.execute_prepared(cursor, 'cm_list_row', f'''
+                SELECT {self.CM_LIST_COLUMNS}
+                FROM corrective_maintenance 
+                WHERE cm_number = %(cm_number)s
+            ''', {'cm_number': cm_number}, {'cm_number': 'text'})
+            row = cursor.fetchone()
+            status_filter = self._cm_status_filter()
+            if row is not None and status_filter and str(row[5]) != status_filter:
+                row = None  # Its new status moves it out of the filtered list
+
+            # Keep the loaded copy of the list in step
+            data = getattr(self, 'cm_original_data', [])
+            index = next((i for i, values in enumerate(data) if str(values[0]) == cm_number), None)
+            if index is not None:
+                if row:
+                    data[index] = row
+                else:
+                    del data[index]
+
+            item = self._find_cm_item(cm_number, iid)
+            if row is None:
+                if item is not None:
+                    self.cm_tree.delete(item)
+            elif item is not None:
+                self.cm_tree.item(item, values=row)
+            else:
+                self.load_corrective_maintenance()
 
-                # Yield to event loop every 50 items to keep UI responsive
-                if idx % 50 == 0:
-                    self.root.update_idletasks()
-            
         except Exception as e:
-            print(f"Error loading corrective maintenance: {e}")
+            print(f"Error refreshing CM {cm_number}: {e}")
+            self.load_corrective_maintenance()
         
     
 
@@ -10212,8 +10925,16 @@ class AITCMMSSystem:
     
     
     def submit_pm_completion(self):
-        """Enhanced PM completion with validation and verification - PREVENTS DUPLICATES"""
+        """Enhanced PM completion with validation and verification - PREVENTS DUPLICATES
+
+        Database work runs on a background worker with its own pooled connection so the
+        UI stays responsive; dialogs and form updates happen back on the Tk thread.
+        """
         try:
+            if self._pm_submit_in_progress:
+                self.update_status("PM submission already in progress...")
+                return
+
             # Validate required fields
             if not self.completion_bfm_var.get():
                 messagebox.showerror("Error", "Please enter BFM Equipment Number")
@@ -10228,86 +10949,105 @@ class AITCMMSSystem:
                 return
 
             # Get form data
-            bfm_no = self.completion_bfm_var.get().strip()
-            pm_type = self.pm_type_var.get()
-            technician = self.completion_tech_var.get()
-            labor_hours = float(self.labor_hours_var.get() or 0)
-            labor_minutes = float(self.labor_minutes_var.get() or 0)
-            pm_due_date = self.pm_due_date_var.get().strip()
-            special_equipment = self.special_equipment_var.get()
-            notes = self.notes_text.get('1.0', 'end-1c')
-            next_annual_pm = self.next_annual_pm_var.get().strip()
+            form = {
+                'bfm_no': self.completion_bfm_var.get().strip(),
+                'pm_type': self.pm_type_var.get(),
+                'technician': self.completion_tech_var.get(),
+                'labor_hours': float(self.labor_hours_var.get() or 0),
+                'labor_minutes': float(self.labor_minutes_var.get() or 0),
+                'pm_due_date': self.pm_due_date_var.get().strip(),
+                'special_equipment': self.special_equipment_var.get(),
+                'notes': self.notes_text.get('1.0', 'end-1c'),
+                'next_annual_pm': self.next_annual_pm_var.get().strip()
+            }
 
             # Use PM Due Date as completion date if provided, otherwise today's date
-            if pm_due_date:
-                completion_date = pm_due_date
+            # Parsed once here; the date object is passed down and bound natively by psycopg2
+            if form['pm_due_date']:
+                try:
+                    form['completion_date'] = datetime.strptime(form['pm_due_date'], '%Y-%m-%d').date()
+                except ValueError:
+                    messagebox.showerror("Error", "PM Due Date must be in YYYY-MM-DD format")
+                    return
             else:
-                completion_date = datetime.now().strftime('%Y-%m-%d')
-
-            cursor = self.conn.cursor()
-            
-            # Ensure we start with a clean transaction state
-            try:
-                self.conn.rollback()
-            except:
-                pass
+                form['completion_date'] = datetime.now().date()
 
             # WARNING: ENHANCED VALIDATION - Check for recent duplicates
-            validation_result = self.validate_pm_completion(cursor, bfm_no, pm_type, technician, completion_date)
-            if not validation_result['valid']:
-                # Show detailed warning dialog
-                response = messagebox.askyesno(
-                    "WARNING: Potential Duplicate PM Detected", 
-                    f"{validation_result['message']}\n\n"
-                    f"Details:\n"
-                    f"- Equipment: {bfm_no}\n"
-                    f"- PM Type: {pm_type}\n"
-                    f"- Technician: {technician}\n"
-                    f"- Completion Date: {completion_date}\n\n"
-                    f"Do you want to proceed anyway?\n\n"
-                    f"Click 'No' to review and make changes.",
-                    icon='warning'
-                )
-                if not response:
-                    # User chose not to proceed - rollback any pending transaction
-                    try:
-                        self.conn.rollback()
-                    except:
-                        pass
-                    self.update_status("PM submission cancelled - potential duplicate detected")
-                    return
+            self._pm_submit_in_progress = True
+            self.update_status(f"Validating PM completion for {form['bfm_no']}...")
+            self.run_in_background(
+                lambda: self._validate_pm_completion_worker(form),
+                lambda validation_result: self._confirm_and_save_pm_completion(form, validation_result),
+                self._show_pm_submit_error
+            )
 
-            # Auto-calculate next annual PM date if blank
-            if not next_annual_pm and pm_type in ['Monthly', 'Six Month', 'Annual']:
-                try:
-                    completion_dt = datetime.strptime(completion_date, '%Y-%m-%d')
-                except ValueError:
-                    completion_dt = datetime.now()
+        except Exception as e:
+            self._show_pm_submit_error(e)
+
+    def _validate_pm_completion_worker(self, form):
+        """Background: run validate_pm_completion on a pooled connection"""
+        with db_pool.connection() as conn:
+            return self.validate_pm_completion(conn.cursor(), form['bfm_no'], form['pm_type'],
+                                               form['technician'], form['completion_date'])
+
+    def _confirm_and_save_pm_completion(self, form, validation_result):
+        """Tk thread: confirm a suspected duplicate, fill in the annual date, then save in background"""
+        bfm_no = form['bfm_no']
+        pm_type = form['pm_type']
+
+        if not validation_result['valid']:
+            # Show detailed warning dialog
+            response = messagebox.askyesno(
+                "WARNING: Potential Duplicate PM Detected",
+                f"{validation_result['message']}\n\n"
+                f"Details:\n"
+                f"- Equipment: {bfm_no}\n"
+                f"- PM Type: {pm_type}\n"
+                f"- Technician: {form['technician']}\n"
+                f"- Completion Date: {form['completion_date']}\n\n"
+                f"Do you want to proceed anyway?\n\n"
+                f"Click 'No' to review and make changes.",
+                icon='warning'
+            )
+            if not response:
+                self._pm_submit_in_progress = False
+                self.update_status("PM submission cancelled - potential duplicate detected")
+                return
+
+        # Auto-calculate next annual PM date if blank
+        if not form['next_annual_pm'] and pm_type in ['Monthly', 'Six Month', 'Annual']:
+            # ONLY set annual PM date when completing an Annual PM
+            if pm_type == 'Annual':
+                # Add equipment-specific offset to spread annual PMs
+                # (equipment.annual_offset_days, -30 to +30 days, fetched during validation)
+                offset_days = validation_result.get('annual_offset_days') or 0
+                next_annual_dt = form['completion_date'] + timedelta(days=365 + offset_days)
+
+                form['next_annual_pm'] = next_annual_dt.strftime('%Y-%m-%d')
+                self.next_annual_pm_var.set(form['next_annual_pm'])
+            # For Monthly and Six Month PMs, DO NOT change the existing Annual PM date
+            # This preserves the independent Annual PM schedule
+
+        self.update_status(f"Saving PM completion for {bfm_no}...")
+        self.run_in_background(
+            lambda: self._save_pm_completion_worker(form),
+            lambda verification_result: self._show_pm_submit_result(form, verification_result),
+            self._show_pm_submit_error
+        )
 
-                # ONLY set annual PM date when completing an Annual PM
-                if pm_type == 'Annual':
-                    next_annual_dt = completion_dt + timedelta(days=365)
+    def _save_pm_completion_worker(self, form):
+        """Background: write the PM completion in one transaction and verify it
 
-                    # Add equipment-specific offset to spread annual PMs
-                    try:
-                        import re
-                        numeric_part = re.findall(r'\d+', bfm_no)
-                        if numeric_part:
-                            last_digits = int(numeric_part[-1]) % 61
-                            offset_days = last_digits - 30  # -30 to +30 days
-                        else:
-                            offset_days = (hash(bfm_no) % 61) - 30
-        
-                        next_annual_dt = next_annual_dt + timedelta(days=offset_days)
-                    except Exception:
-                        import random
-                        offset_days = random.randint(-21, 21)
-                        next_annual_dt = next_annual_dt + timedelta(days=offset_days)
+        Returns the verification result dict, or None if the transaction was rolled back.
+        """
+        bfm_no = form['bfm_no']
+        pm_type = form['pm_type']
+        technician = form['technician']
+        completion_date = form['completion_date']
+        notes = form['notes']
 
-                    next_annual_pm = next_annual_dt.strftime('%Y-%m-%d')
-                    self.next_annual_pm_var.set(next_annual_pm)
-                # For Monthly and Six Month PMs, DO NOT change the existing Annual PM date
-                # This preserves the independent Annual PM schedule
+        with db_pool.connection() as conn:
+            cursor = conn.cursor()
 
             # Handle different PM types with TRANSACTION SAFETY
             try:
@@ -10316,62 +11056,124 @@ class AITCMMSSystem:
 
                 if pm_type == 'CANNOT FIND':
                     success = self.process_cannot_find_pm(cursor, bfm_no, technician, completion_date, notes)
-                
+
                 elif pm_type == 'Run to Failure':
-                    success = self.process_run_to_failure_pm(cursor, bfm_no, technician, completion_date, 
-                                                        labor_hours + (labor_minutes/60), notes)
-                
+                    success = self.process_run_to_failure_pm(cursor, bfm_no, technician, completion_date,
+                                                        form['labor_hours'] + (form['labor_minutes']/60), notes)
+
                 else:  # Normal PM (Monthly, Six Month, Annual)
-                    success = self.process_normal_pm_completion(cursor, bfm_no, pm_type, technician, 
-                                                            completion_date, labor_hours, labor_minutes, 
-                                                            pm_due_date, special_equipment, notes, next_annual_pm)
+                    success = self.process_normal_pm_completion(cursor, bfm_no, pm_type, technician,
+                                                            completion_date, form['labor_hours'], form['labor_minutes'],
+                                                            form['pm_due_date'], form['special_equipment'], notes,
+                                                            form['next_annual_pm'])
 
-                if success:
-                    # Commit transaction
-                    cursor.execute('COMMIT')
-                
-                    # WARNING: VERIFY the completion was saved correctly
-                    verification_result = self.verify_pm_completion_saved(cursor, bfm_no, pm_type, technician, completion_date)
-                
-                    if verification_result['verified']:
-                        messagebox.showinfo("CHECK: Success", 
-                                        f"PM completion recorded and verified!\n\n"
-                                        f"Equipment: {bfm_no}\n"
-                                        f"PM Type: {pm_type}\n"
-                                        f"Technician: {technician}\n"
-                                        f"Date: {completion_date}\n\n"
-                                        f"CHECK: Database verification passed")
-                    
-                        # Clear form and refresh displays
-                        self.clear_completion_form()
-                        self.load_recent_completions()
-                        if hasattr(self, 'refresh_technician_schedules'):
-                            self.refresh_technician_schedules()
-                        self.update_status(f"CHECK: PM completed and verified: {bfm_no} - {pm_type} by {technician}")
-                        if hasattr(self, 'auto_sync_after_action'):
-                            self.auto_sync_after_action()
-                    else:
-                        messagebox.showerror("WARNING: Warning", 
-                                        f"PM was saved but verification failed!\n\n"
-                                        f"{verification_result['message']}\n\n"
-                                        f"Please check the PM History tab to confirm the completion was recorded.")
-                        self.update_status(f"WARNING: PM saved but verification incomplete: {bfm_no}")
-                else:
+                if not success:
                     # Rollback on failure
-                    cursor.execute('ROLLBACK')
-                    messagebox.showerror("Error", "Failed to process PM completion. Transaction rolled back.")
-                
-            except Exception as e:
+                    conn.rollback()
+                    return None
+
+                # Commit transaction (psycopg2 tracks the transaction state itself)
+                conn.commit()
+                self._db_dirty = True  # Picked up by auto_save_and_sync
+                self._analytics_cache.clear()
+
+            except Exception:
                 # Rollback on exception
-                cursor.execute('ROLLBACK')
-                raise e
+                conn.rollback()
+                raise
+
+            # WARNING: VERIFY the completion was saved correctly
+            return self.verify_pm_completion_saved(success, pm_type, completion_date)
+
+    def _show_pm_submit_result(self, form, verification_result):
+        """Tk thread: report the outcome of a PM submission and refresh displays"""
+        self._pm_submit_in_progress = False
+        bfm_no = form['bfm_no']
+        pm_type = form['pm_type']
+        technician = form['technician']
+
+        if verification_result is None:
+            messagebox.showerror("Error", "Failed to process PM completion. Transaction rolled back.")
+        elif verification_result['verified']:
+            messagebox.showinfo("CHECK: Success",
+                            f"PM completion recorded and verified!\n\n"
+                            f"Equipment: {bfm_no}\n"
+                            f"PM Type: {pm_type}\n"
+                            f"Technician: {technician}\n"
+                            f"Date: {form['completion_date']}\n\n"
+                            f"CHECK: Database verification passed")
+
+            # Clear form and refresh displays (only the new row is added to recent completions)
+            self.clear_completion_form()
+            total_hours = form['labor_hours'] + form['labor_minutes'] / 60
+            self.append_recent_completion((
+                form['completion_date'].isoformat(), bfm_no, pm_type, technician,
+                f"{total_hours:.1f}h" if total_hours else "0.0h"
+            ))
+            if hasattr(self, 'refresh_technician_schedules'):
+                self.refresh_technician_schedules()
+            self.update_status(f"CHECK: PM completed and verified: {bfm_no} - {pm_type} by {technician}")
+            if hasattr(self, 'auto_sync_after_action'):
+                self.auto_sync_after_action()
+        else:
+            messagebox.showerror("WARNING: Warning",
+                            f"PM was saved but verification failed!\n\n"
+                            f"{verification_result['message']}\n\n"
+                            f"Please check the PM History tab to confirm the completion was recorded.")
+            self.update_status(f"WARNING: PM saved but verification incomplete: {bfm_no}")
+
+    def _show_pm_submit_error(self, e):
+        """Tk thread: report an exception raised while submitting a PM completion"""
+        self._pm_submit_in_progress = False
+        messagebox.showerror("Error", f"Failed to submit PM completion: {str(e)}")
+        print(f"PM Completion Error: {''.join(traceback.format_exception(type(e), e, e.__traceback__))}")
+
+    def insert_rows_in_chunks(self, tree, rows, start=0, chunk=100, token=None):
+        """Insert rows into a Treeview chunk rows at a time, yielding to Tk between chunks
+
+        The rest of the rows are scheduled with after_idle, so Tk repaints when it
+        needs to instead of being forced to every N rows. A later call for the same
+        tree supersedes any chunks still pending from an earlier one.
+        """
+        if token is None:
+            token = object()
+            self._tree_fill_tokens[tree] = token
+        elif self._tree_fill_tokens.get(tree) is not token:
+            return
+
+        insert = tree.insert  # Bound once - this loop runs for every row of every chunked fill
+        for values in rows[start:start + chunk]:
+            insert('', 'end', values=values)
+
+        if start + chunk < len(rows):
+            self.root.after_idle(self.insert_rows_in_chunks, tree, rows, start + chunk, chunk, token)
+
+    def run_in_background(self, work, on_done, on_error=None):
+        """Run work() on the background executor and pass its result to on_done on the Tk thread
+
+        Tk widgets may only be touched from the main thread, so the future is polled
+        with root.after instead of calling back from the worker thread.
+        """
+        future = self._executor.submit(work)
+
+        def poll():
+            if not future.done():
+                self.root.after(50, poll)
+                return
+            try:
+                result = future.result()
+            except Exception as e:
+                if on_error:
+                    on_error(e)
+                else:
+                    print(f"Background task error: {e}")
+                return
+            on_done(result)
+
+        self.root.after(50, poll)
+        return future
+
 
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to submit PM completion: {str(e)}")
-            import traceback
-            print(f"PM Completion Error: {traceback.format_exc()}")
-    
-    
     def auto_pull_from_sharepoint(self):
         """Automatically pull latest data from SharePoint every 30 seconds"""
         try:
@@ -10381,16 +11183,33 @@ class AITCMMSSystem:
                 backup_dir = self.backup_sync_dir
             
                 if os.path.exists(backup_dir):
-                    # Get latest backup
-                    backup_files = []
-                    for f in os.listdir(backup_dir):
-                        if f.startswith('ait_cmms_backup_') and f.endswith('.db'):
-                            full_path = os.path.join(backup_dir, f)
-                            backup_files.append((full_path, os.path.getmtime(full_path)))
+                    dir_mtime = os.stat(backup_dir).st_mtime
+                    latest = None
+                    if dir_mtime <= self._last_backup_dir_mtime:
+                        # Nothing added/removed since the last pull - skip the listing, but
+                        # the newest backup's content may still have landed since then
+                        if self._last_pulled_backup is None:
+                            return
+                        latest_path = self._last_pulled_backup[0]
+                        try:
+                            latest = (latest_path, os.stat(latest_path).st_mtime)
+                        except FileNotFoundError:
+                            # Deleted without the folder mtime moving on (e.g. coarse
+                            # timestamps) - forget it and list the folder again below
+                            self._last_pulled_backup = None
+                    if latest is None:
+                        # Get latest backup (scandir reuses the directory entry's stat data)
+                        with os.scandir(backup_dir) as entries:
+                            backup_files = [(e.path, e.stat().st_mtime) for e in entries
+                                            if e.name.startswith('ait_cmms_backup_') and e.name.endswith('.db')]
+                        latest = max(backup_files, key=lambda x: x[1], default=None)
+
+                    if latest == self._last_pulled_backup:
+                        self._last_backup_dir_mtime = dir_mtime
+                        return
                 
-                    if backup_files:
-                        backup_files.sort(key=lambda x: x[1], reverse=True)
-                        latest_backup_path, latest_backup_time = backup_files[0]
+                    if latest:
+                        latest_backup_path, latest_backup_time = latest
                     
                         # Check if backup is newer than local
                         if os.path.exists(db_file):
@@ -10399,11 +11218,9 @@ class AITCMMSSystem:
                             if latest_backup_time > local_time:
                                 print(f"Newer backup detected, pulling from SharePoint...")
                                 
-                                # Close connection
-                                self.conn.close()
-                                
-                                # Copy newer backup
-                                shutil.copy2(latest_backup_path, db_file)
+                                # Copy newer backup - only the changed blocks are rewritten
+                                bytes_written = copy_changed_blocks(latest_backup_path, db_file)
+                                print(f"Pulled {bytes_written} changed bytes from SharePoint backup")
                                 
                                 # Reopen connection
                                 #self.conn = sqlite3.connect(db_file)
@@ -10421,6 +11238,10 @@ class AITCMMSSystem:
                                     self.load_corrective_maintenance()
                             
                                 self.update_status("CHECK: Data updated from SharePoint")
+
+                    # Only now is this backup handled - a failed copy is retried next poll
+                    self._last_pulled_backup = latest
+                    self._last_backup_dir_mtime = dir_mtime
         
             # Schedule next pull in 30 seconds
             #self.root.after(30 * 1000, self.auto_pull_from_sharepoint)
@@ -10438,9 +11259,14 @@ class AITCMMSSystem:
             if hasattr(self, 'conn') and self.conn:
                 self.conn.commit()
         
+            # Nothing written since the last push - skip the SharePoint upload
+            if not self._db_dirty:
+                return
+
             # Push to SharePoint immediately after saving
             if hasattr(self, 'backup_sync_dir') and self.backup_sync_dir:
                 self.sharepoint_only_backup(self.backup_sync_dir)
+                self._db_dirty = False
                 print("Auto-saved and synced to SharePoint")
         
             # Schedule next auto-save in 5 minutes
@@ -10458,21 +11284,42 @@ class AITCMMSSystem:
         try:
             issues = []
         
+            # All checks are answered by a single round-trip (server-side prepared);
+            # pm_latest is kept current by trigger on pm_completions (see init_database)
+            db_pool.execute_prepared(cursor, 'pm_completion_validate', '''
+                WITH latest AS (
+                    SELECT last_date, last_tech, completion_id
+                    FROM pm_latest
+                    WHERE bfm_equipment_no = %(bfm_no)s AND pm_type = %(pm_type)s
+                ), eq AS (
+                    SELECT status, annual_offset_days FROM equipment WHERE bfm_equipment_no = %(bfm_no)s
+                )
+                SELECT
+                    (SELECT last_date FROM latest),
+                    (SELECT last_tech FROM latest),
+                    (SELECT completion_id FROM latest),
+                    (SELECT COUNT(*)
+                     FROM pm_completions
+                     WHERE bfm_equipment_no = %(bfm_no)s
+                     AND technician_name = %(technician)s
+                     AND pm_type = %(pm_type)s
+                     AND completion_date::date >= %(completion_date)s - 7),
+                    EXISTS (SELECT 1 FROM eq),
+                    (SELECT status FROM eq),
+                    (SELECT annual_offset_days FROM eq)
+            ''', {'bfm_no': bfm_no, 'pm_type': pm_type, 'technician': technician,
+                  'completion_date': completion_date},
+                {'bfm_no': 'text', 'pm_type': 'text', 'technician': 'text', 'completion_date': 'date'})
+
+            (last_completion_date, last_technician, completion_id,
+             recent_count, equipment_exists, equipment_status,
+             annual_offset_days) = cursor.fetchone()
+
             # Check 1: Same PM type completed recently for this equipment
-            cursor.execute('''
-                SELECT completion_date, technician_name, id
-                FROM pm_completions 
-                WHERE bfm_equipment_no = %s AND pm_type = %s
-                ORDER BY completion_date DESC LIMIT 1
-            ''', (bfm_no, pm_type))
-        
-            recent_completion = cursor.fetchone()
-            if recent_completion:
-                last_completion_date, last_technician, completion_id = recent_completion
+            if completion_id is not None:
                 try:
-                    last_date = datetime.strptime(last_completion_date, '%Y-%m-%d')
-                    current_date = datetime.strptime(completion_date, '%Y-%m-%d')
-                    days_since = (current_date - last_date).days
+                    last_date = datetime.strptime(last_completion_date, '%Y-%m-%d').date()
+                    days_since = (completion_date - last_date).days
                 
                     # Different thresholds for different PM types
                     min_days = {
@@ -10493,27 +11340,14 @@ class AITCMMSSystem:
                     issues.append(f"WARNING: Date parsing issue with previous completion: {last_completion_date}")
 
             # Check 2: Same technician completing SAME PM TYPE on same equipment too frequently  
-            cursor.execute('''
-                SELECT COUNT(*) 
-                FROM pm_completions 
-                WHERE bfm_equipment_no = %s 
-                AND technician_name = %s
-                AND pm_type = %s
-                AND completion_date::date >= %s::date - INTERVAL '7 days'
-            ''', (bfm_no, technician, pm_type, completion_date))
-        
-            recent_count = cursor.fetchone()[0]
             if recent_count > 0:
                 issues.append(f"WARNING: Same technician ({technician}) completed {pm_type} PM on {bfm_no} within last 7 days")
 
             # Check 3: Equipment exists and is active
-            cursor.execute('SELECT status FROM equipment WHERE bfm_equipment_no = %s', (bfm_no,))
-            equipment_status = cursor.fetchone()
-        
-            if not equipment_status:
+            if not equipment_exists:
                 issues.append(f"CHECK: Equipment {bfm_no} not found in database")
-            elif equipment_status[0] in ['Missing', 'Run to Failure'] and pm_type not in ['CANNOT FIND', 'Run to Failure']:
-                issues.append(f"WARNING: Equipment {bfm_no} has status '{equipment_status[0]}' - unusual for {pm_type} PM")
+            elif equipment_status in ['Missing', 'Run to Failure'] and pm_type not in ['CANNOT FIND', 'Run to Failure']:
+                issues.append(f"WARNING: Equipment {bfm_no} has status '{equipment_status}' - unusual for {pm_type} PM")
 
             # Check 4: Scheduled PM exists for this week
             #current_week_start = self.get_week_start(datetime.strptime(completion_date, '%Y-%m-%d'))
@@ -10531,19 +11365,20 @@ class AITCMMSSystem:
             if issues:
                 return {
                     'valid': False,
-                    'message': f"Found {len(issues)} potential issue(s):\n\n" + "\n\n".join(issues)
+                    'message': f"Found {len(issues)} potential issue(s):\n\n" + "\n\n".join(issues),
+                    'annual_offset_days': annual_offset_days
                 }
             else:
-                return {'valid': True, 'message': 'Validation passed'}
+                return {'valid': True, 'message': 'Validation passed',
+                        'annual_offset_days': annual_offset_days}
             
         except Exception as e:
             # Rollback any failed queries in validation
             try:
-                self.conn.rollback()
+                cursor.connection.rollback()
             except:
                 pass
             # Show the actual error for debugging
-            import traceback
             error_detail = f"{str(e)}\n\nQuery error details:\n{traceback.format_exc()}"
             return {
                 'valid': False,
@@ -10551,20 +11386,18 @@ class AITCMMSSystem:
                 'message': f"Validation error: {str(e)}"
             }
 
-    def verify_pm_completion_saved(self, cursor, bfm_no, pm_type, technician, completion_date):
-        """Verify that the PM completion was actually saved to the database"""
+    def verify_pm_completion_saved(self, saved, pm_type, completion_date):
+        """Verify the PM completion using the values RETURNING'd by the write statements"""
         try:
+            # CANNOT FIND / Run to Failure paths check their own rowcounts and return True
+            if not isinstance(saved, dict):
+                return {
+                    'verified': bool(saved),
+                    'message': "CHECK: All verification checks passed" if saved else "CHECK: PM completion was not saved"
+                }
+
             # Check 1: PM completion record exists
-            cursor.execute('''
-                SELECT id, completion_date, technician_name, created_date
-                FROM pm_completions 
-                WHERE bfm_equipment_no = %s AND pm_type = %s AND technician_name = %s
-                AND completion_date = %s
-                ORDER BY created_date DESC LIMIT 1
-            ''', (bfm_no, pm_type, technician, completion_date))
-        
-            completion_record = cursor.fetchone()
-            if not completion_record:
+            if not saved.get('completion_id'):
                 return {
                     'verified': False,
                     'message': f"CHECK: PM completion record not found in database"
@@ -10573,34 +11406,25 @@ class AITCMMSSystem:
             # Check 2: Equipment PM dates updated (for normal PMs)
             if pm_type in ['Monthly', 'Six Month', 'Annual']:
                 date_field = f'last_{pm_type.lower().replace(" ", "_")}_pm'
-                cursor.execute(f'SELECT {date_field} FROM equipment WHERE bfm_equipment_no = %s', (bfm_no,))
-            
-                equipment_date = cursor.fetchone()
-                if equipment_date and equipment_date[0] != completion_date:
+                equipment_date = saved.get('equipment_date')
+                if equipment_date != completion_date.isoformat():
                     return {
                         'verified': False,
-                        'message': f"WARNING: Equipment {date_field} not updated correctly. Expected: {completion_date}, Found: {equipment_date[0]}"
+                        'message': f"WARNING: Equipment {date_field} not updated correctly. Expected: {completion_date}, Found: {equipment_date}"
                     }
 
             # Check 3: Weekly schedule updated if applicable
-            current_week_start = self.get_week_start(datetime.strptime(completion_date, '%Y-%m-%d'))
-            cursor.execute('''
-                SELECT status FROM weekly_pm_schedules 
-                WHERE bfm_equipment_no = %s AND pm_type = %s
-                AND assigned_technician = %s AND week_start_date = %s
-            ''', (bfm_no, pm_type, technician, current_week_start.strftime('%Y-%m-%d')))
-        
-            schedule_status = cursor.fetchone()
-            if schedule_status and schedule_status[0] != 'Completed':
+            schedule_status = saved.get('schedule_status')
+            if schedule_status and schedule_status != 'Completed':
                 return {
                     'verified': False,
-                    'message': f"WARNING: Weekly schedule not marked as completed. Status: {schedule_status[0]}"
+                    'message': f"WARNING: Weekly schedule not marked as completed. Status: {schedule_status}"
                 }
 
             return {
                 'verified': True,
                 'message': f"CHECK: All verification checks passed",
-                'completion_id': completion_record[0]
+                'completion_id': saved['completion_id']
             }
         
         except Exception as e:
@@ -10611,175 +11435,193 @@ class AITCMMSSystem:
 
     def process_normal_pm_completion(self, cursor, bfm_no, pm_type, technician, completion_date, 
                                 labor_hours, labor_minutes, pm_due_date, special_equipment, notes, next_annual_pm):
-        """Process normal PM completion with enhanced error handling"""
+        """Process normal PM completion with enhanced error handling
+
+        Returns a dict of the values written (via RETURNING) for verification,
+        or None if the completion could not be processed.
+        """
         try:
-            cursor.execute('''
+            # The statements below run as server-side prepared statements (see
+            # DatabaseConnectionPool.execute_prepared) - parsed once per connection
+            db_pool.execute_prepared(cursor, 'pm_completion_insert', '''
                 INSERT INTO pm_completions 
                 (bfm_equipment_no, pm_type, technician_name, completion_date, 
                 labor_hours, labor_minutes, pm_due_date, special_equipment, 
                 notes, next_annual_pm_date)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                RETURNING id
-            ''', (
-                bfm_no, pm_type, technician, completion_date,
-                labor_hours, labor_minutes, pm_due_date, special_equipment,
-                notes, next_annual_pm
-            ))
+                VALUES (%(bfm_no)s, %(pm_type)s, %(technician)s, %(d)s, %(labor_hours)s, %(labor_minutes)s,
+                        %(pm_due_date)s, %(special_equipment)s, %(notes)s, %(next_annual_pm)s)
+                RETURNING id, completion_date, created_date
+            ''', {
+                'bfm_no': bfm_no, 'pm_type': pm_type, 'technician': technician, 'd': completion_date,
+                'labor_hours': labor_hours, 'labor_minutes': labor_minutes, 'pm_due_date': pm_due_date,
+                'special_equipment': special_equipment, 'notes': notes, 'next_annual_pm': next_annual_pm
+            }, {
+                'bfm_no': 'text', 'pm_type': 'text', 'technician': 'text', 'd': 'date',
+                'labor_hours': 'real', 'labor_minutes': 'real', 'pm_due_date': 'text',
+                'special_equipment': 'text', 'notes': 'text', 'next_annual_pm': 'text'
+            })
         
          
-            completion_id = cursor.fetchone()[0]
+            completion_id, saved_completion_date, created_date = cursor.fetchone()
             if not completion_id:
                 raise Exception("Failed to get completion record ID")
 
-            # Update equipment PM dates
-            if pm_type == 'Monthly':
-                if next_annual_pm: 
-                    cursor.execute('''
-                        UPDATE equipment SET 
-                        last_monthly_pm = %s, 
-                        next_monthly_pm = %s::date + INTERVAL '30 days',
-                        next_annual_pm = %s,  
-                        updated_date = CURRENT_TIMESTAMP
-                        WHERE bfm_equipment_no = %s
-                    ''', (completion_date, completion_date, next_annual_pm, bfm_no))
-                else:
-                    cursor.execute('''
-                        UPDATE equipment SET 
-                        last_monthly_pm = %s, 
-                        next_monthly_pm = %s::date + INTERVAL '30 days',
-                        updated_date = CURRENT_TIMESTAMP
-                        WHERE bfm_equipment_no = %s
-                    ''', (completion_date, completion_date, bfm_no))
-                    
-            elif pm_type == 'Six Month':
-                cursor.execute('''
-                    UPDATE equipment SET 
-                    last_six_month_pm = %s, 
-                    next_six_month_pm = %s::date + INTERVAL '180 days',
-                    updated_date = CURRENT_TIMESTAMP
-                    WHERE bfm_equipment_no = %s
-                ''', (completion_date, completion_date, bfm_no))
-                
-            elif pm_type == 'Annual':
-                cursor.execute('''
-                    UPDATE equipment SET 
-                    last_annual_pm = %s, 
-                    next_annual_pm = %s::date + INTERVAL '365 days',
-                    updated_date = CURRENT_TIMESTAMP
-                    WHERE bfm_equipment_no = %s
-                ''', (completion_date, completion_date, bfm_no))
+            # Update equipment PM dates - one statement for every PM type so a single
+            # plan is reused; only the columns for this PM type change
+            db_pool.execute_prepared(cursor, 'pm_completion_update_equipment', '''
+                UPDATE equipment SET
+                last_monthly_pm = CASE WHEN %(pm_type)s = 'Monthly'
+                    THEN %(d)s::text ELSE last_monthly_pm END,
+                next_monthly_pm = CASE WHEN %(pm_type)s = 'Monthly'
+                    THEN (%(d)s + 30)::text ELSE next_monthly_pm END,
+                last_six_month_pm = CASE WHEN %(pm_type)s = 'Six Month'
+                    THEN %(d)s::text ELSE last_six_month_pm END,
+                next_six_month_pm = CASE WHEN %(pm_type)s = 'Six Month'
+                    THEN (%(d)s + 180)::text ELSE next_six_month_pm END,
+                last_annual_pm = CASE WHEN %(pm_type)s = 'Annual'
+                    THEN %(d)s::text ELSE last_annual_pm END,
+                next_annual_pm = CASE
+                    WHEN %(pm_type)s = 'Annual' THEN (%(d)s + 365)::text
+                    WHEN %(pm_type)s = 'Monthly' AND %(next_annual_pm)s IS NOT NULL THEN %(next_annual_pm)s
+                    ELSE next_annual_pm END,
+                updated_date = CURRENT_TIMESTAMP
+                WHERE bfm_equipment_no = %(bfm_no)s
+                RETURNING CASE %(pm_type)s
+                    WHEN 'Monthly' THEN last_monthly_pm
+                    WHEN 'Six Month' THEN last_six_month_pm
+                    ELSE last_annual_pm END
+            ''', {'pm_type': pm_type, 'd': completion_date,
+                  'next_annual_pm': next_annual_pm or None, 'bfm_no': bfm_no},
+                {'pm_type': 'text', 'd': 'date', 'next_annual_pm': 'text', 'bfm_no': 'text'})
 
             # Verify equipment update worked
             affected_rows = cursor.rowcount
             if affected_rows != 1:
                 raise Exception(f"Equipment update failed - affected {affected_rows} rows instead of 1")
+            equipment_date = cursor.fetchone()[0]
 
             # Update weekly schedule status if exists
             # Find and update any scheduled PM for this equipment/PM type/technician combination
             # regardless of which week it was scheduled for (PMs can be completed in different weeks)
-            cursor.execute('''
+            db_pool.execute_prepared(cursor, 'pm_completion_update_schedule', '''
                 UPDATE weekly_pm_schedules SET
                 status = 'Completed',
-                completion_date = %s,
-                labor_hours = %s,
-                notes = %s
+                completion_date = %(d)s,
+                labor_hours = %(total_hours)s,
+                notes = %(notes)s
                 WHERE id = (
                     SELECT id FROM weekly_pm_schedules
-                    WHERE bfm_equipment_no = %s AND pm_type = %s AND assigned_technician = %s
+                    WHERE bfm_equipment_no = %(bfm_no)s AND pm_type = %(pm_type)s
+                    AND assigned_technician = %(technician)s
                     AND status = 'Scheduled'
                     ORDER BY scheduled_date
                     LIMIT 1
                 )
-            ''', (completion_date, labor_hours + (labor_minutes/60), notes,
-                bfm_no, pm_type, technician))
+                RETURNING status
+            ''', {'d': completion_date, 'total_hours': labor_hours + (labor_minutes/60), 'notes': notes,
+                  'bfm_no': bfm_no, 'pm_type': pm_type, 'technician': technician},
+                {'d': 'date', 'total_hours': 'real', 'notes': 'text',
+                 'bfm_no': 'text', 'pm_type': 'text', 'technician': 'text'})
 
             # DEBUG: Check if the update worked
             updated_rows = cursor.rowcount
+            schedule_row = cursor.fetchone()
             print(f"DEBUG: Updated {updated_rows} weekly schedule rows for {bfm_no} - {pm_type} by {technician}")
 
             print(f"CHECK: Normal PM completion processed successfully: {bfm_no} - {pm_type}")
-            return True
+            return {
+                'completion_id': completion_id,
+                'completion_date': saved_completion_date,
+                'created_date': created_date,
+                'equipment_date': equipment_date,
+                'schedule_status': schedule_row[0] if schedule_row else None
+            }
             
         except Exception as e:
             print(f"CHECK: Error processing normal PM completion: {str(e)}")
-            return False
+            return None
     
     def fix_weekly_schedule_status_flexible(self):
-        """Enhanced method to fix weekly schedule status with flexible matching"""
+        """Enhanced method to fix weekly schedule status with flexible matching
+
+        Matching is done set-based in SQL: one UPDATE ... FROM for exact matches,
+        then one for the flexible equipment + PM type fallback.
+        """
         try:
             cursor = self.conn.cursor()
+            params = {'week_start': '2025-08-25', 'week_end': '2025-08-31'}
         
-            # First, get all actual completions for the week
+            # First, count all actual completions for the week
             cursor.execute('''
-                SELECT bfm_equipment_no, pm_type, technician_name, completion_date,
-                    (labor_hours + labor_minutes/60.0) as total_hours, notes
-                FROM pm_completions 
-                WHERE completion_date BETWEEN '2025-08-25' AND '2025-08-31'
-            ''')
+                SELECT COUNT(*) FROM pm_completions 
+                WHERE completion_date BETWEEN %(week_start)s AND %(week_end)s
+            ''', params)
+            completion_count = cursor.fetchone()[0]
+            print(f"Found {completion_count} actual completions to process")
         
-            completions = cursor.fetchall()
-            print(f"Found {len(completions)} actual completions to process")
-        
-            updated_count = 0
-        
-            for completion in completions:
-                bfm_no, pm_type, technician, comp_date, hours, notes = completion
-            
-                # Try exact match first
-                cursor.execute('''
-                    UPDATE weekly_pm_schedules 
-                    SET status = 'Completed',
-                        completion_date = %s,
-                        labor_hours = %s,
-                        notes = %s
-                    WHERE bfm_equipment_no = %s AND pm_type = %s AND assigned_technician = %s
-                    AND week_start_date = '2025-08-25' AND status = 'Scheduled'
-                ''', (comp_date, hours, notes, bfm_no, pm_type, technician))
-            
-                exact_matches = cursor.rowcount
-            
-                # If no exact match, try equipment + PM type match (without LIMIT)
-                if exact_matches == 0:
-                    # First check if there's an available scheduled PM for this equipment/PM type
-                    cursor.execute('''
-                        SELECT id FROM weekly_pm_schedules 
-                        WHERE bfm_equipment_no = %s AND pm_type = %s
-                        AND week_start_date = '2025-08-25' AND status = 'Scheduled'
-                    ''', (bfm_no, pm_type))
-                
-                    available = cursor.fetchone()
-                
-                    if available:
-                        # Update the first available matching record
-                        cursor.execute('''
-                            UPDATE weekly_pm_schedules 
-                            SET status = 'Completed',
-                                completion_date = %s,
-                                labor_hours = %s,
-                                notes = %s,
-                                assigned_technician = %s
-                            WHERE id = %s
-                        ''', (comp_date, hours, notes, technician, available[0]))
-                    
-                        flexible_matches = cursor.rowcount
-                        if flexible_matches > 0:
-                            print(f"Flexible match: {bfm_no} {pm_type} reassigned to {technician}")
-                    
-                        updated_count += flexible_matches
-                    else:
-                        print(f"No scheduled PM found for {bfm_no} {pm_type}")
-                else:
-                    updated_count += exact_matches
-                    print(f"Exact match: {bfm_no} {pm_type} by {technician}")
+            # Exact match: same equipment, PM type and technician
+            cursor.execute('''
+                UPDATE weekly_pm_schedules w
+                SET status = 'Completed',
+                    completion_date = c.completion_date,
+                    labor_hours = c.total_hours,
+                    notes = c.notes
+                FROM pm_completions c
+                WHERE c.completion_date BETWEEN %(week_start)s AND %(week_end)s
+                AND w.bfm_equipment_no = c.bfm_equipment_no AND w.pm_type = c.pm_type
+                AND w.assigned_technician = c.technician_name
+                AND w.week_start_date = %(week_start)s AND w.status = 'Scheduled'
+            ''', params)
+            updated_count = cursor.rowcount
+            print(f"Exact matches: {updated_count}")
+
+            # Flexible match: completions with no schedule for their technician take one
+            # still-scheduled row for the same equipment/PM type each (paired by row number)
+            cursor.execute('''
+                WITH unmatched AS (
+                    SELECT c.bfm_equipment_no, c.pm_type, c.technician_name, c.completion_date,
+                        c.total_hours, c.notes,
+                        ROW_NUMBER() OVER (PARTITION BY c.bfm_equipment_no, c.pm_type ORDER BY c.id) AS rn
+                    FROM pm_completions c
+                    WHERE c.completion_date BETWEEN %(week_start)s AND %(week_end)s
+                    AND NOT EXISTS (
+                        SELECT 1 FROM weekly_pm_schedules x
+                        WHERE x.bfm_equipment_no = c.bfm_equipment_no AND x.pm_type = c.pm_type
+                        AND x.assigned_technician = c.technician_name
+                        AND x.week_start_date = %(week_start)s
+                    )
+                ), available AS (
+                    SELECT id, bfm_equipment_no, pm_type,
+                        ROW_NUMBER() OVER (PARTITION BY bfm_equipment_no, pm_type ORDER BY id) AS rn
+                    FROM weekly_pm_schedules
+                    WHERE week_start_date = %(week_start)s AND status = 'Scheduled'
+                )
+                UPDATE weekly_pm_schedules w
+                SET status = 'Completed',
+                    completion_date = u.completion_date,
+                    labor_hours = u.total_hours,
+                    notes = u.notes,
+                    assigned_technician = u.technician_name
+                FROM unmatched u
+                JOIN available a ON a.bfm_equipment_no = u.bfm_equipment_no
+                    AND a.pm_type = u.pm_type AND a.rn = u.rn
+                WHERE w.id = a.id
+                RETURNING w.bfm_equipment_no, w.pm_type, w.assigned_technician
+            ''', params)
+
+            for bfm_no, pm_type, technician in cursor.fetchall():
+                print(f"Flexible match: {bfm_no} {pm_type} reassigned to {technician}")
+                updated_count += 1
         
             self.conn.commit()
         
             messagebox.showinfo("Success", 
-                            f"Processed {len(completions)} completions\n"
+                            f"Processed {completion_count} completions\n"
                             f"Updated {updated_count} weekly schedule records!")
-            print(f"Final result: Updated {updated_count} out of {len(completions)} completions")
+            print(f"Final result: Updated {updated_count} out of {completion_count} completions")
         
         except Exception as e:
+            self.conn.rollback()
             messagebox.showerror("Error", f"Failed to fix weekly schedule: {str(e)}")
             print(f"Error: {e}")
     
@@ -10803,7 +11645,8 @@ class AITCMMSSystem:
             ''', (bfm_no, description, location, technician, completion_date, notes))
 
             # Update equipment status
-            cursor.execute('UPDATE equipment SET status = "Missing" WHERE bfm_equipment_no = %s', (bfm_no,))
+            cursor.execute("UPDATE equipment SET status = 'Missing' WHERE bfm_equipment_no = %s", (bfm_no,))
+            self._equipment_cache = None
 
             affected_rows = cursor.rowcount
             if affected_rows != 1:
@@ -10850,13 +11693,14 @@ class AITCMMSSystem:
             # Update equipment status and disable all PM types
             cursor.execute('''
                 UPDATE equipment SET 
-                status = "Run to Failure",
+                status = 'Run to Failure',
                 monthly_pm = 0,
                 six_month_pm = 0,
                 annual_pm = 0,
                 updated_date = CURRENT_TIMESTAMP
                 WHERE bfm_equipment_no = %s
             ''', (bfm_no,))
+            self._equipment_cache = None
         
             affected_rows = cursor.rowcount
             if affected_rows != 1:
@@ -10892,7 +11736,7 @@ class AITCMMSSystem:
             cursor = self.conn.cursor()
             cursor.execute('''
                 SELECT pm_type, technician_name, completion_date, 
-                    (labor_hours + labor_minutes/60.0) as total_hours,
+                    total_hours,
                     notes
                 FROM pm_completions 
                 WHERE bfm_equipment_no = %s
@@ -10902,24 +11746,41 @@ class AITCMMSSystem:
             completions = cursor.fetchall()
         
             if completions:
-                report = f"RECENT PM COMPLETIONS FOR {bfm_no}\n"
-                report += "=" * 50 + "\n\n"
+                # Collect the lines and join once rather than growing one string
+                parts = [f"RECENT PM COMPLETIONS FOR {bfm_no}\n", "=" * 50, "\n\n"]
             
                 for pm_type, tech, date, hours, notes in completions:
-                    report += f"- {date} - {pm_type} PM by {tech} ({hours:.1f}h)\n"
+                    parts.append(f"- {date} - {pm_type} PM by {tech} ({hours:.1f}h)\n")
                     if notes:
-                        report += f"  Notes: {notes[:100]}...\n" if len(notes) > 100 else f"  Notes: {notes}\n"
-                    report += "\n"
-            
-                # Show in a dialog
-                dialog = tk.Toplevel(self.root)
-                dialog.title(f"PM History - {bfm_no}")
-                dialog.geometry("600x400")
-            
-                text_widget = tk.Text(dialog, wrap='word', font=('Courier', 10))
-                text_widget.pack(fill='both', expand=True, padx=10, pady=10)
+                        parts.append(f"  Notes: {notes[:100]}{'...' if len(notes) > 100 else ''}\n")
+                    parts.append("\n")
+                report = ''.join(parts)
+            
+                # Show in a dialog - one per session, reused while it is open
+                dialog = self._pm_history_dialog
+                if dialog is None or not dialog.winfo_exists():
+                    dialog = tk.Toplevel(self.root)
+                    dialog.geometry("600x400")
+                
+                    self._pm_history_text_widget = tk.Text(dialog, wrap='word', font=('Courier', 10))
+                    self._pm_history_text_widget.pack(fill='both', expand=True, padx=10, pady=10)
+                
+                    def on_destroy(event, dialog=dialog):
+                        # <Destroy> also fires for the child Text widget
+                        if event.widget is dialog:
+                            self._pm_history_dialog = None
+                            self._pm_history_text_widget = None
+                    dialog.bind('<Destroy>', on_destroy)
+                    self._pm_history_dialog = dialog
+            
+                text_widget = self._pm_history_text_widget
+                text_widget.config(state='normal')
+                text_widget.delete('1.0', 'end')
                 text_widget.insert('1.0', report)
                 text_widget.config(state='disabled')
+                dialog.title(f"PM History - {bfm_no}")
+                dialog.deiconify()
+                dialog.lift()
             
             else:
                 messagebox.showinfo("No History", f"No PM completions found for equipment {bfm_no}")
@@ -10927,35 +11788,176 @@ class AITCMMSSystem:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load PM history: {str(e)}")
       
+    def stream_query(self, name, query, params=None, batch_size=2000):
+        """Yield the rows of a query from a server-side (named) cursor, batch_size at a time
+
+        For unbounded queries such as the PDF exports: rows are processed as they
+        arrive instead of materializing the whole result set with fetchall(). Each
+        batch is a round trip, so LIMITed list pages use a plain cursor instead.
+        The query runs when iteration starts.
+        """
+        cursor = self.conn.cursor(name=name)
+        try:
+            cursor.execute(query, params)
+            while True:
+                batch = cursor.fetchmany(batch_size)
+                if not batch:
+                    break
+                yield from batch
+        finally:
+            cursor.close()
+
     def load_cannot_find_assets(self):
-        """Load cannot find assets data and store for filtering"""
+        """Load the first page of cannot find assets and store for filtering"""
+        self.cannot_find_data = []
+        self._cf_all_display_rows = []
+        self.cf_last_key = None
+        self.cf_has_more = True
+        self._cf_last_term = None
+        self._cf_last_results = None
+        self._cf_rest_token = None  # Set while the rest of the list loads for a search
+        self.load_more_cannot_find_assets()
+
+    def load_more_cannot_find_assets(self):
+        """Fetch the next page of cannot find assets (called when the list is scrolled near its end)"""
+        # A search may already be loading every remaining page in the background
+        if not self.cf_has_more or self._cf_rest_token is not None:
+            return
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('''
-                SELECT bfm_equipment_no, description, location, technician_name, reported_date, status
-                FROM cannot_find_assets 
-                WHERE status = 'Missing'
-                ORDER BY reported_date DESC
-            ''')
-        
-            # Store all data for filtering
-            self.cannot_find_data = cursor.fetchall()
-        
-            # Display the data
-            self.filter_cannot_find_assets()
+            page = self._fetch_cannot_find_page()
+
+            if self._cf_last_results is None:
+                # First page - display the data
+                self.filter_cannot_find_assets()
+            else:
+                self._show_more_cannot_find(page)
         
         except Exception as e:
             print(f"Error loading cannot find assets: {e}")
 
+    def _show_more_cannot_find(self, page):
+        """Extend the current results with a newly loaded page without resetting the scroll position"""
+        search_term = self._cf_last_term
+        matches = self._match_cannot_find(page, search_term)
+        self._cf_last_results.extend(matches)
+        self.cannot_find_view.append_rows(self._cannot_find_display_rows(matches))
+        self._update_cannot_find_status(search_term)
+
+    def _load_remaining_cannot_find_assets(self):
+        """Fetch every page not loaded yet on a pooled connection, then add it to the results
+
+        Searches cover every missing asset; loading the rest of the list here keeps
+        the Tk thread free while the matches from the loaded pages are shown.
+        """
+        if self._cf_rest_token is not None:
+            return
+        token = self._cf_rest_token = object()
+        last_key = self.cf_last_key
+
+        def work():
+            with db_pool.connection() as conn:
+                return self._select_cannot_find_rows(conn.cursor(), last_key, None)
+
+        def done(rows):
+            if self._cf_rest_token is not token:  # List reloaded meanwhile
+                return
+            self._cf_rest_token = None
+            self._show_more_cannot_find(self._add_cannot_find_rows(rows, has_more=False))
+
+        def error(e):
+            if self._cf_rest_token is token:
+                self._cf_rest_token = None
+            print(f"Error loading cannot find assets: {e}")
+
+        self.run_in_background(work, done, error)
+
+    def _select_cannot_find_rows(self, cursor, last_key, limit):
+        """Missing assets after last_key (all of them when limit is None), newest first
+
+        Keyset pagination on (reported_date, bfm_equipment_no): each page costs the
+        same however far down the list it is, unlike OFFSET.
+        """
+        last_date, last_bfm = last_key or (None, None)
+        cursor.execute('''
+            SELECT bfm_equipment_no, description, location, technician_name, reported_date, status
+            FROM cannot_find_assets 
+            WHERE status = 'Missing'
+            AND (%(last_date)s IS NULL
+                 OR (COALESCE(reported_date, ''), COALESCE(bfm_equipment_no, '')) < (%(last_date)s, %(last_bfm)s))
+            ORDER BY COALESCE(reported_date, '') DESC, COALESCE(bfm_equipment_no, '') DESC
+            LIMIT %(limit)s
+        ''', {'last_date': last_date, 'last_bfm': last_bfm, 'limit': limit})
+        return cursor.fetchall()
+
+    def _fetch_cannot_find_page(self):
+        """Fetch the page after cf_last_key into cannot_find_data and return it"""
+        rows = self._select_cannot_find_rows(self.conn.cursor(), self.cf_last_key, self.cf_page_size)
+        return self._add_cannot_find_rows(rows, has_more=len(rows) == self.cf_page_size)
+
+    def _add_cannot_find_rows(self, rows, has_more):
+        """Store fetched rows in cannot_find_data and return them as (row, search text) pairs"""
+        # Each row is stored ready for display, paired with its lowercased searchable
+        # text so filtering is a single substring test per row; the display rows are
+        # also kept on their own for the unfiltered view
+        page = []
+        for bfm_no, description, location, technician, reported_date, status in rows:
+            display_row = (bfm_no, description or '', location or '', technician, reported_date, status)
+            page.append((display_row, ' '.join(str(x or '') for x in display_row).lower()))
+            self._cf_all_display_rows.append(display_row)
+        self.cannot_find_data.extend(page)
+
+        self.cf_has_more = has_more
+        if page:
+            last_row = page[-1][0]
+            self.cf_last_key = (last_row[4] or '', last_row[0] or '')
+        return page
+
+    def _remove_cannot_find_row(self, iid, bfm_no):
+        """Drop one asset from the tree and the loaded pages without refetching the list"""
+        self.cannot_find_view.delete_row(iid)
+
+        # Tk may hand back a numeric BFM as an int, so compare as strings
+        bfm_no = str(bfm_no)
+        self.cannot_find_data = [(asset, searchable_text) for asset, searchable_text in self.cannot_find_data
+                                 if str(asset[0]) != bfm_no]
+        self._cf_all_display_rows = [row for row in self._cf_all_display_rows if str(row[0]) != bfm_no]
+        if self._cf_last_results is not None:
+            self._cf_last_results = [(asset, searchable_text) for asset, searchable_text in self._cf_last_results
+                                     if str(asset[0]) != bfm_no]
+            self._update_cannot_find_status(self._cf_last_term)
+
+    def _match_cannot_find(self, candidates, search_term):
+        """Return the (row, search text) pairs containing every word of search_term"""
+        tokens = search_term.split()
+        if len(tokens) <= 1:
+            return [(asset, searchable_text) for asset, searchable_text in candidates
+                    if search_term in searchable_text]
+        return [(asset, searchable_text) for asset, searchable_text in candidates
+                if all(token in searchable_text for token in tokens)]
+
+    def _cannot_find_display_rows(self, results):
+        return [display_row for display_row, _ in results]
+
+    def _update_cannot_find_status(self, search_term):
+        # Update count in status bar if method exists
+        visible_count = len(self._cf_last_results)
+        total_count = len(self.cannot_find_data)
+        more = '+' if self.cf_has_more else ''
+    
+        if hasattr(self, 'update_status'):
+            if search_term and self._cf_rest_token is not None:
+                self.update_status(f"Showing {visible_count} of {total_count} Cannot Find assets (filtered) - "
+                                   f"searching the rest of the list...")
+            elif search_term:
+                self.update_status(f"Showing {visible_count} of {total_count} Cannot Find assets (filtered)")
+            else:
+                self.update_status(f"Showing {total_count}{more} Cannot Find assets")
+
 
 
 
     def filter_cannot_find_assets(self):
         """Filter the Cannot Find assets based on search term"""
-        # Clear existing items
-        for item in self.cannot_find_tree.get_children():
-            self.cannot_find_tree.delete(item)
-
         # Get search term
         search_term = self.cannot_find_search_var.get().lower().strip()
 
@@ -10963,44 +11965,38 @@ class AITCMMSSystem:
         if not hasattr(self, 'cannot_find_data'):
             return
 
-        # Filter and display data
-        for idx, asset in enumerate(self.cannot_find_data):
-            bfm_no, description, location, technician, reported_date, status = asset
+        # Tree already shows the results for this search term
+        if search_term == self._cf_last_term and self._cf_last_results is not None:
+            return
 
-            # If search term is empty, show all
-            if not search_term:
-                self.cannot_find_tree.insert('', 'end', values=(
-                    bfm_no, description or '', location or '', technician, reported_date, status
-                ))
-            else:
-                # Search in all fields
-                searchable_text = ' '.join([
-                    str(bfm_no or ''),
-                    str(description or ''),
-                    str(location or ''),
-                    str(technician or ''),
-                    str(reported_date or ''),
-                    str(status or '')
-                ]).lower()
-
-                if search_term in searchable_text:
-                    self.cannot_find_tree.insert('', 'end', values=(
-                        bfm_no, description or '', location or '', technician, reported_date, status
-                    ))
+        # A search has to cover every missing asset, not just the pages scrolled so far -
+        # the rest load in the background and their matches are appended when they arrive
+        if search_term and self.cf_has_more:
+            self._load_remaining_cannot_find_assets()
+
+        # A term that extends the previous one can only match a subset of the
+        # previous results (each of its words contains the word it grew from),
+        # so narrow those instead of rescanning everything
+        candidates = self.cannot_find_data
+        if (self._cf_last_results is not None and self._cf_last_term is not None
+                and search_term.startswith(self._cf_last_term)):
+            candidates = self._cf_last_results
+
+        # Filter and display data (search text is precomputed in _fetch_cannot_find_page)
+        if not search_term:
+            # Everything matches - use the prebuilt display rows without a per-row pass
+            results = list(self.cannot_find_data)
+            display_rows = self._cf_all_display_rows
+        else:
+            results = self._match_cannot_find(candidates, search_term)
+            display_rows = self._cannot_find_display_rows(results)
 
-            # Yield to event loop every 50 items to keep UI responsive
-            if idx % 50 == 0:
-                self.root.update_idletasks()
-    
-        # Update count in status bar if method exists
-        visible_count = len(self.cannot_find_tree.get_children())
-        total_count = len(self.cannot_find_data) if hasattr(self, 'cannot_find_data') else 0
-    
-        if hasattr(self, 'update_status'):
-            if search_term:
-                self.update_status(f"Showing {visible_count} of {total_count} Cannot Find assets (filtered)")
-            else:
-                self.update_status(f"Showing {total_count} Cannot Find assets")
+        self._cf_last_term = search_term
+        self._cf_last_results = results
+
+        # The view only inserts the rows currently scrolled into the tree
+        self.cannot_find_view.set_rows(display_rows)
+        self._update_cannot_find_status(search_term)
 
 
 
@@ -11008,60 +12004,78 @@ class AITCMMSSystem:
     # 8. LOAD RUN TO FAILURE ASSETS
     def load_run_to_failure_assets(self):
         """Enhanced method to load run to failure assets with better data handling"""
+        self.rtf_last_key = None
+        self.rtf_has_more = True
+        self.run_to_failure_view.set_rows([])
+        self.load_more_run_to_failure_assets()
+
+        # Update the count in equipment statistics
+        self.update_equipment_statistics()
+
+    def load_more_run_to_failure_assets(self):
+        """Fetch the next page of run to failure assets (keyset pagination, see _fetch_cannot_find_page)"""
+        if not self.rtf_has_more:
+            return
         try:
-            cursor = self.conn.cursor()
-        
+            last_date, last_bfm = self.rtf_last_key or (None, None)
+
             # Get data from both run_to_failure_assets table AND equipment table
+            cursor = self.conn.cursor()
             cursor.execute('''
-                SELECT DISTINCT
-                    COALESCE(rtf.bfm_equipment_no, e.bfm_equipment_no) as bfm_no,
-                    COALESCE(rtf.description, e.description) as description,
-                    COALESCE(rtf.location, e.location) as location,
-                    COALESCE(rtf.technician_name, 'System Change') as technician,
-                    COALESCE(rtf.completion_date, e.updated_date, CURRENT_DATE) as completion_date,
-                    COALESCE(rtf.labor_hours, 0) as labor_hours,
-                    COALESCE(rtf.notes, 'Set via equipment edit') as notes
-                FROM equipment e
-                LEFT JOIN run_to_failure_assets rtf ON e.bfm_equipment_no = rtf.bfm_equipment_no
-                WHERE e.status = 'Run to Failure'
-            
-                UNION
-            
-                SELECT 
-                    rtf.bfm_equipment_no,
-                    rtf.description,
-                    rtf.location,
-                    rtf.technician_name,
-                    rtf.completion_date,
-                    rtf.labor_hours,
-                    rtf.notes
-                FROM run_to_failure_assets rtf
-                LEFT JOIN equipment e ON rtf.bfm_equipment_no = e.bfm_equipment_no
-                WHERE e.bfm_equipment_no IS NULL OR e.status = 'Run to Failure'
-            
-                ORDER BY completion_date DESC
-            ''')
-        
-            # Clear existing items
-            for item in self.run_to_failure_tree.get_children():
-                self.run_to_failure_tree.delete(item)
-        
-            # Add run to failure records
-            for asset in cursor.fetchall():
-                bfm_no, description, location, technician, completion_date, hours, notes = asset
-                hours_display = f"{hours:.1f}h" if hours else "0.0h"
-            
-                self.run_to_failure_tree.insert('', 'end', values=(
-                    bfm_no,
-                    description or 'No description',
-                    location or 'Unknown location',
-                    technician or 'Unknown',
-                    completion_date or '',
-                    hours_display
-                ))
-            
-            # Update the count in equipment statistics
-            self.update_equipment_statistics()
+                SELECT bfm_no,
+                    COALESCE(description, 'No description'),
+                    COALESCE(location, 'Unknown location'),
+                    COALESCE(technician, 'Unknown'),
+                    completion_date,
+                    -- Same as f"{hours:.1f}h", with NULL / 0 shown as 0.0h
+                    to_char(COALESCE(labor_hours, 0), 'FM999999990.0') || 'h' as hours_display,
+                    COALESCE(completion_date::text, '') as sort_date
+                FROM (
+                    -- Run to Failure equipment, with its run_to_failure_assets record if any
+                    SELECT
+                        COALESCE(rtf.bfm_equipment_no, e.bfm_equipment_no) as bfm_no,
+                        COALESCE(rtf.description, e.description) as description,
+                        COALESCE(rtf.location, e.location) as location,
+                        COALESCE(rtf.technician_name, 'System Change') as technician,
+                        COALESCE(rtf.completion_date, e.updated_date, CURRENT_DATE) as completion_date,
+                        COALESCE(rtf.labor_hours, 0) as labor_hours,
+                        COALESCE(rtf.notes, 'Set via equipment edit') as notes
+                    FROM equipment e
+                    LEFT JOIN run_to_failure_assets rtf ON e.bfm_equipment_no = rtf.bfm_equipment_no
+                    WHERE e.status = 'Run to Failure'
+                
+                    UNION ALL
+                
+                    -- run_to_failure_assets records with no equipment row (disjoint from the above)
+                    SELECT 
+                        rtf.bfm_equipment_no,
+                        rtf.description,
+                        rtf.location,
+                        rtf.technician_name,
+                        rtf.completion_date,
+                        rtf.labor_hours,
+                        rtf.notes
+                    FROM run_to_failure_assets rtf
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM equipment e WHERE e.bfm_equipment_no = rtf.bfm_equipment_no
+                    )
+                ) rtf_union
+                WHERE %(last_date)s IS NULL
+                   OR (COALESCE(completion_date::text, ''), COALESCE(bfm_no, '')) < (%(last_date)s, %(last_bfm)s)
+                ORDER BY sort_date DESC, COALESCE(bfm_no, '') DESC
+                LIMIT %(limit)s
+            ''', {'last_date': last_date, 'last_bfm': last_bfm, 'limit': self.rtf_page_size})
+        
+            # Add run to failure records (the view only inserts the rows in view);
+            # display fallbacks and the hours text come formatted from the query
+            assets = cursor.fetchall()
+            rows = [(bfm_no, description, location, technician, completion_date or '', hours_display)
+                    for bfm_no, description, location, technician, completion_date, hours_display, sort_date in assets]
+            if assets:
+                self.rtf_last_key = (assets[-1][6], assets[-1][0] or '')
+
+            self.rtf_has_more = len(rows) == self.rtf_page_size
+            self.run_to_failure_view.append_rows(rows)
             
         except Exception as e:
             print(f"Error loading run to failure assets: {e}")
@@ -11075,62 +12089,50 @@ class AITCMMSSystem:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = f"Cannot_Find_Assets_{timestamp}.pdf"
         
-            cursor = self.conn.cursor()
-            cursor.execute('''
+            assets = self.stream_query('cannot_find_assets_export', '''
                 SELECT bfm_equipment_no, description, location, technician_name, reported_date, notes
                 FROM cannot_find_assets 
                 WHERE status = 'Missing'
                 ORDER BY reported_date DESC
             ''')
         
-            assets = cursor.fetchall()
+            # Table rows are built as the result streams in
+            data = [['BFM Equipment No.', 'Description', 'Location', 'Reported By', 'Report Date']]
+            data += [
+                [bfm_no, truncate_text(description, 30), location or '', technician, reported_date]
+                for bfm_no, description, location, technician, reported_date, notes in assets
+            ]
+            asset_count = len(data) - 1
         
             doc = SimpleDocTemplate(filename, pagesize=letter)
             story = []
-            styles = getSampleStyleSheet()
+            styles = self._pdf_styles
         
             # Title
-            title_style = ParagraphStyle('TitleStyle', parent=styles['Title'], 
-                                    fontSize=18, textColor=colors.darkred, alignment=1)
+            title_style = self._pdf_title_red
             story.append(Paragraph("AIRBUS AIT - CANNOT FIND ASSETS REPORT", title_style))
             story.append(Spacer(1, 20))
         
             # Report info
             story.append(Paragraph(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']))
-            story.append(Paragraph(f"Total Missing Assets: {len(assets)}", styles['Normal']))
+            story.append(Paragraph(f"Total Missing Assets: {asset_count}", styles['Normal']))
             story.append(Spacer(1, 20))
         
-            if assets:
+            if asset_count:
                 # Create table
-                data = [['BFM Equipment No.', 'Description', 'Location', 'Reported By', 'Report Date']]
-                for asset in assets:
-                    bfm_no, description, location, technician, reported_date, notes = asset
-                    data.append([
-                        bfm_no,
-                        (description[:30] + '...') if description and len(description) > 30 else (description or ''),
-                        location or '',
-                        technician,
-                        reported_date
-                    ])
-                
                 table = Table(data, colWidths=[1.5*inch, 2.5*inch, 1.2*inch, 1.2*inch, 1*inch])
-                table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 10),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                ]))
+                table.setStyle(self._pdf_table_style)
             
                 story.append(table)
             else:
                 story.append(Paragraph("No missing assets found.", styles['Normal']))
         
-            doc.build(story)
-            messagebox.showinfo("Success", f"Cannot Find report exported to: {filename}")
+            # Rendering runs on the background executor; dialogs come back on the Tk thread
+            self.run_in_background(
+                lambda: doc.build(story),
+                lambda result: messagebox.showinfo("Success", f"Cannot Find report exported to: {filename}"),
+                lambda e: messagebox.showerror("Error", f"Failed to export Cannot Find report: {str(e)}")
+            )
         
         except Exception as e:
             messagebox.showerror("Error", f"Failed to export Cannot Find report: {str(e)}")
@@ -11142,62 +12144,50 @@ class AITCMMSSystem:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = f"Run_to_Failure_Assets_{timestamp}.pdf"
         
-            cursor = self.conn.cursor()
-            cursor.execute('''
+            assets = self.stream_query('run_to_failure_assets_export', '''
                 SELECT bfm_equipment_no, description, location, technician_name, completion_date, labor_hours, notes
                 FROM run_to_failure_assets 
                 ORDER BY completion_date DESC
             ''')
         
-            assets = cursor.fetchall()
+            # Table rows are built as the result streams in
+            data = [['BFM Equipment No.', 'Description', 'Location', 'Completed By', 'Date', 'Hours']]
+            data += [
+                [bfm_no, truncate_text(description, 25), location or '', technician, completion_date,
+                 f"{hours:.1f}h" if hours else '']
+                for bfm_no, description, location, technician, completion_date, hours, notes in assets
+            ]
+            asset_count = len(data) - 1
         
             doc = SimpleDocTemplate(filename, pagesize=letter)
             story = []
-            styles = getSampleStyleSheet()
+            styles = self._pdf_styles
         
             # Title
-            title_style = ParagraphStyle('TitleStyle', parent=styles['Title'], 
-                                    fontSize=18, textColor=colors.darkblue, alignment=1)
+            title_style = self._pdf_title_blue
             story.append(Paragraph("AIRBUS AIT - RUN TO FAILURE ASSETS REPORT", title_style))
             story.append(Spacer(1, 20))
         
             # Report info
             story.append(Paragraph(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']))
-            story.append(Paragraph(f"Total Run to Failure Assets: {len(assets)}", styles['Normal']))
+            story.append(Paragraph(f"Total Run to Failure Assets: {asset_count}", styles['Normal']))
             story.append(Spacer(1, 20))
         
-            if assets:
+            if asset_count:
                 # Create table
-                data = [['BFM Equipment No.', 'Description', 'Location', 'Completed By', 'Date', 'Hours']]
-                for asset in assets:
-                    bfm_no, description, location, technician, completion_date, hours, notes = asset
-                    data.append([
-                        bfm_no,
-                        (description[:25] + '...') if description and len(description) > 25 else (description or ''),
-                        location or '',
-                        technician,
-                        completion_date,
-                        f"{hours:.1f}h" if hours else ''
-                    ])
-            
                 table = Table(data, colWidths=[1.4*inch, 2.2*inch, 1*inch, 1*inch, 0.8*inch, 0.6*inch])
-                table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 10),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                ]))
+                table.setStyle(self._pdf_table_style)
             
                 story.append(table)
             else:
                 story.append(Paragraph("No Run to Failure assets found.", styles['Normal']))
         
-            doc.build(story)
-            messagebox.showinfo("Success", f"Run to Failure report exported to: {filename}")
+            # Rendering runs on the background executor; dialogs come back on the Tk thread
+            self.run_in_background(
+                lambda: doc.build(story),
+                lambda result: messagebox.showinfo("Success", f"Run to Failure report exported to: {filename}"),
+                lambda e: messagebox.showerror("Error", f"Failed to export Run to Failure report: {str(e)}")
+            )
         
         except Exception as e:
             messagebox.showerror("Error", f"Failed to export Run to Failure report: {str(e)}")
@@ -11205,30 +12195,40 @@ class AITCMMSSystem:
     # 11. MARK ASSET AS FOUND
     def mark_asset_found(self):
         """Mark a cannot find asset as found"""
-        selected = self.cannot_find_tree.selection()
+        # iids are row indexes into the view's rows
+        selected = self.cannot_find_view.selection()
         if not selected:
             messagebox.showwarning("Warning", "Please select an asset to mark as found")
             return
 
-        item = self.cannot_find_tree.item(selected[0])
-        bfm_no = str(item['values'][0])
+        bfm_no = str(self.cannot_find_view.values(selected[0])[0])
 
         try:
             cursor = self.conn.cursor()
-            cursor.execute('UPDATE cannot_find_assets SET status = "Found" WHERE bfm_equipment_no = %s', (bfm_no,))
-            cursor.execute('UPDATE equipment SET status = "Active" WHERE bfm_equipment_no = %s', (bfm_no,))
+            cursor.execute("UPDATE cannot_find_assets SET status = 'Found' WHERE bfm_equipment_no = %s", (bfm_no,))
+            cursor.execute("UPDATE equipment SET status = 'Active' WHERE bfm_equipment_no = %s", (bfm_no,))
             self.conn.commit()
+            self._equipment_cache = None
         
             messagebox.showinfo("Success", f"Asset {bfm_no} marked as found and reactivated")
-            self.load_cannot_find_assets()
         
         except Exception as e:
+            self.conn.rollback()
             messagebox.showerror("Error", f"Failed to mark asset as found: {str(e)}")
+            return
+
+        try:
+            # Only this row changed - drop it instead of reloading the whole list
+            self._remove_cannot_find_row(selected[0], bfm_no)
+        except Exception as e:
+            print(f"Error updating cannot find list: {e}")
+            self.load_cannot_find_assets()
 
     # 12. REACTIVATE ASSET
     def reactivate_asset(self):
         """Enhanced method to reactivate multiple run to failure assets at once"""
-        selected = self.run_to_failure_tree.selection()
+        # The view keeps selected rows that have scrolled out of the tree
+        selected = self.run_to_failure_view.selection()
         if not selected:
             messagebox.showwarning("Warning", "Please select one or more assets to reactivate")
             return
@@ -11236,9 +12236,9 @@ class AITCMMSSystem:
         # Get all selected assets
         selected_assets = []
         for item in selected:
-            item_data = self.run_to_failure_tree.item(item)
-            bfm_no = item_data['values'][0]
-            description = item_data['values'][1]
+            values = self.run_to_failure_view.values(item)
+            bfm_no = values[0]
+            description = values[1]
             selected_assets.append((bfm_no, description))
     
         # Create reactivation dialog
@@ -11413,38 +12413,32 @@ class AITCMMSSystem:
             try:
                 cursor = self.conn.cursor()
             
-                successful = 0
-                failed = []
+                # Every selected asset gets the same PM flags, so one statement per table
+                # covers them all (psycopg2 passes the list as a PostgreSQL array)
+                bfm_nos = [str(bfm_no) for bfm_no, description in selected_assets]
             
-                for bfm_no, description in selected_assets:
-                    try:
-                        # Update equipment status and enable selected PMs
-                        cursor.execute('''
-                            UPDATE equipment SET 
-                            status = 'Active',
-                            monthly_pm = %s,
-                            six_month_pm = %s,
-                            annual_pm = %s,
-                            updated_date = CURRENT_TIMESTAMP
-                            WHERE bfm_equipment_no = %s
-                        ''', (
-                            1 if monthly_var.get() else 0,
-                            1 if six_month_var.get() else 0,
-                            1 if annual_var.get() else 0,
-                            bfm_no
-                        ))
-                    
-                        # Remove from run_to_failure_assets table
-                        cursor.execute('DELETE FROM run_to_failure_assets WHERE bfm_equipment_no = %s', (bfm_no,))
-                    
-                        successful += 1
-                    
-                    except Exception as e:
-                        failed.append(f"{bfm_no}: {str(e)}")
+                # Update equipment status and enable selected PMs
+                cursor.execute('''
+                    UPDATE equipment SET 
+                    status = 'Active',
+                    monthly_pm = %s,
+                    six_month_pm = %s,
+                    annual_pm = %s,
+                    updated_date = CURRENT_TIMESTAMP
+                    WHERE bfm_equipment_no = ANY(%s)
+                ''', (
+                    1 if monthly_var.get() else 0,
+                    1 if six_month_var.get() else 0,
+                    1 if annual_var.get() else 0,
+                    bfm_nos
+                ))
+            
+                # Remove from run_to_failure_assets table
+                cursor.execute('DELETE FROM run_to_failure_assets WHERE bfm_equipment_no = ANY(%s)', (bfm_nos,))
             
                 self.conn.commit()
             
-                # Show results
+                # Show results - both statements succeed or fail as a whole
                 if len(selected_assets) == 1:
                     messagebox.showinfo(
                         "Success", 
@@ -11454,20 +12448,12 @@ class AITCMMSSystem:
                         f"Equipment moved back to main equipment list"
                     )
                 else:
-                    result_msg = f"Bulk Reactivation Complete!\n\n"
-                    result_msg += f"Successfully reactivated: {successful} assets\n"
-                    if failed:
-                        result_msg += f"Failed: {len(failed)} assets\n\n"
-                        result_msg += "Failed assets:\n" + "\n".join(failed[:5])
-                        if len(failed) > 5:
-                            result_msg += f"\n... and {len(failed) - 5} more"
-                
-                    result_msg += f"\n\nPMs Enabled: {pm_enabled}"
-                
-                    if failed:
-                        messagebox.showwarning("Partial Success", result_msg)
-                    else:
-                        messagebox.showinfo("Success", result_msg)
+                    messagebox.showinfo(
+                        "Success",
+                        f"Bulk Reactivation Complete!\n\n"
+                        f"Successfully reactivated: {len(selected_assets)} assets\n\n"
+                        f"PMs Enabled: {pm_enabled}"
+                    )
             
                 dialog.destroy()
             
@@ -11479,9 +12465,10 @@ class AITCMMSSystem:
                 if len(selected_assets) == 1:
                     self.update_status(f"Reactivated asset {selected_assets[0][0]} with {pm_enabled} PMs")
                 else:
-                    self.update_status(f"Reactivated {successful} assets with {pm_enabled} PMs")
+                    self.update_status(f"Reactivated {len(selected_assets)} assets with {pm_enabled} PMs")
             
             except Exception as e:
+                self.conn.rollback()
                 messagebox.showerror("Error", f"Failed to reactivate assets: {str(e)}")
     
         # Buttons
@@ -11514,102 +12501,154 @@ class AITCMMSSystem:
     
     def load_recent_completions(self):
         """Load recent PM completions with debugging"""
-        print("DEBUG: load_recent_completions called")
+        if DEBUG:
+            print("DEBUG: load_recent_completions called")
         
         # ADD THIS SAFETY CHECK AT THE VERY BEGINNING:
         if not hasattr(self, 'recent_completions_tree'):
-            print("DEBUG: recent_completions_tree not yet created, skipping load")
+            if DEBUG:
+                print("DEBUG: recent_completions_tree not yet created, skipping load")
             return
         
         
         
         try:
             cursor = self.conn.cursor()
-            print("DEBUG: Database cursor created")
-        
             cursor.execute('''
                 SELECT completion_date, bfm_equipment_no, pm_type, technician_name, 
-                    (labor_hours + labor_minutes/60.0) as total_hours
+                    total_hours
                 FROM pm_completions 
-                ORDER BY completion_date DESC, id DESC LIMIT 500
-            ''')
-        
-            completions = cursor.fetchall()
-            print(f"DEBUG: Found {len(completions)} completions in database")
+                ORDER BY completion_date DESC, id DESC LIMIT %s
+            ''', (self.RECENT_COMPLETIONS_LIMIT,))
         
-            # Clear existing items
-            for item in self.recent_completions_tree.get_children():
-                self.recent_completions_tree.delete(item)
-            print("DEBUG: Cleared existing tree items")
-        
-            # Add recent completions
-            for idx, completion in enumerate(completions):
+            # Add recent completions (the view only inserts the rows in view)
+            rows = []
+            for completion in cursor.fetchall():
                 completion_date, bfm_no, pm_type, technician, total_hours = completion
                 hours_display = f"{total_hours:.1f}h" if total_hours else "0.0h"
 
-                self.recent_completions_tree.insert('', 'end', values=(
-                    completion_date, bfm_no, pm_type, technician, hours_display
-                ))
-                print(f"DEBUG: Added {bfm_no} - {pm_type} - {technician}")
-
-                # Yield to event loop every 50 items to keep UI responsive
-                if idx % 50 == 0:
-                    self.root.update_idletasks()
+                rows.append((completion_date, bfm_no, pm_type, technician, hours_display))
+            self.recent_completions_view.set_rows(rows)
         
-            print("DEBUG: Successfully loaded recent completions")
-            print(f"Refreshed: {len(completions)} recent completions loaded")
+            if DEBUG:
+                print("DEBUG: Successfully loaded recent completions")
+            print(f"Refreshed: {len(rows)} recent completions loaded")
         
         except Exception as e:
             print(f"ERROR in load_recent_completions: {e}")
-            import traceback
             traceback.print_exc()
+
+    def append_recent_completion(self, completion_row):
+        """Add one just-saved completion to the recent list instead of reloading all of it
+
+        completion_row is (completion_date, bfm_no, pm_type, technician, hours_display).
+        The list is ordered newest first, so the row goes before the first row with
+        the same or an earlier date; the oldest row drops off past the limit.
+        """
+        if not hasattr(self, 'recent_completions_view'):
+            return
+
+        rows = self.recent_completions_view.rows
+        index = next((i for i, row in enumerate(rows) if str(row[0]) <= completion_row[0]), len(rows))
+        if index < self.RECENT_COMPLETIONS_LIMIT:
+            self.recent_completions_view.insert_row(index, completion_row,
+                                                    max_rows=self.RECENT_COMPLETIONS_LIMIT)
     
     def generate_current_week_report(self):
         """Generate report for current week"""
         try:
             week_start = datetime.strptime(self.week_start_var.get(), '%Y-%m-%d')
             week_end = week_start + timedelta(days=6)
+            week_start_str = week_start.strftime('%Y-%m-%d')
             
             cursor = self.conn.cursor()
             
-            # Get weekly statistics
-            cursor.execute('''
-                SELECT 
-                    COUNT(*) as total_scheduled,
-                    COUNT(CASE WHEN status = 'Completed' THEN 1 END) as total_completed
-                FROM weekly_pm_schedules 
-                WHERE week_start_date = %s
-            ''', (week_start.strftime('%Y-%m-%d'),))
-            
-            total_scheduled, total_completed = cursor.fetchone()
-            completion_rate = (total_completed / total_scheduled * 100) if total_scheduled > 0 else 0
-            
-            # Get technician performance
-            cursor.execute('''
+            # Digest of every report input for the week - if it matches the cached report
+            # nothing has changed and the summary aggregate below is skipped
+            # (prepared once per connection - see DatabaseConnectionPool.execute_prepared)
+            db_pool.execute_prepared(cursor, 'weekly_report_signature', '''
+                SELECT md5(string_agg(concat_ws('|', id, assigned_technician, pm_type, status, labor_hours),
+                                      ',' ORDER BY id))
+                FROM weekly_pm_schedules
+                WHERE week_start_date = %(week_start)s
+            ''', {'week_start': week_start_str}, {'week_start': 'text'})
+
+            # Same inputs and target as the last report for this week - redisplay it and
+            # skip formatting and re-saving an identical weekly_reports row
+            signature = (cursor.fetchone()[0], self.weekly_pm_target)
+            cached = self._report_cache.get(week_start_str)
+            if cached and cached[0] == signature:
+                _, report, tree_rows, completion_rate = cached
+                children = self.tech_performance_tree.get_children()
+                if children:
+                    self.tech_performance_tree.delete(*children)
+                for values in tree_rows:
+                    self.tech_performance_tree.insert('', 'end', values=values)
+                self.weekly_report_text.delete('1.0', 'end')
+                self.weekly_report_text.insert('end', report)
+                self.update_status(f"Weekly report generated - {completion_rate:.1f}% completion rate")
+                return
+
+            # Week totals, technician performance and PM type breakdown in one round-trip.
+            # GROUPING() tells the sets apart even when a technician or PM type is NULL:
+            # 3 = week total, 1 = per technician, 2 = per PM type
+            db_pool.execute_prepared(cursor, 'weekly_report_summary', '''
                 SELECT 
+                    GROUPING(assigned_technician, pm_type) as grouping_set,
                     assigned_technician,
-                    COUNT(*) as assigned,
-                    COUNT(CASE WHEN status = 'Completed' THEN 1 END) as completed,
-                    AVG(CASE WHEN status = 'Completed' THEN labor_hours END) as avg_hours
+                    pm_type,
+                    COUNT(*) as scheduled,
+                    COUNT(*) FILTER (WHERE status = 'Completed') as completed,
+                    AVG(labor_hours) FILTER (WHERE status = 'Completed') as avg_hours,
+                    COALESCE(100.0 * COUNT(*) FILTER (WHERE status = 'Completed')
+                             / NULLIF(COUNT(*), 0), 0)::float8 as rate
                 FROM weekly_pm_schedules 
-                WHERE week_start_date = %s
-                GROUP BY assigned_technician
-                ORDER BY assigned_technician
-            ''', (week_start.strftime('%Y-%m-%d'),))
-            
-            tech_performance = cursor.fetchall()
+                WHERE week_start_date = %(week_start)s
+                GROUP BY GROUPING SETS ((), (assigned_technician), (pm_type))
+                ORDER BY grouping_set, assigned_technician, pm_type
+            ''', {'week_start': week_start_str}, {'week_start': 'text'})
+            
+            summary_rows = cursor.fetchall()
+
+            total_scheduled, total_completed, completion_rate = 0, 0, 0
+            tech_performance = []
+            tech_rates = []
+            pm_types = []
+            for grouping_set, technician, pm_type, scheduled, completed, avg_hours, rate in summary_rows:
+                if grouping_set == 3:
+                    total_scheduled, total_completed, completion_rate = scheduled, completed, rate
+                elif grouping_set == 1:
+                    # AVG comes back as Decimal if labor_hours is NUMERIC - the saved
+                    # technician_performance JSON needs a plain float
+                    tech_performance.append((technician, scheduled, completed,
+                                             float(avg_hours) if avg_hours is not None else None))
+                    tech_rates.append(rate)
+                else:
+                    pm_types.append((pm_type, scheduled, completed, rate))
+
+            if total_scheduled == 0:
+                # Nothing scheduled - skip the report body, tree rows and saved report
+                children = self.tech_performance_tree.get_children()
+                if children:
+                    self.tech_performance_tree.delete(*children)
+                self.weekly_report_text.delete('1.0', 'end')
+                self.weekly_report_text.insert('end', f"WEEKLY PM PERFORMANCE REPORT\n"
+                                                      f"Week: {week_start_str} to {week_end.strftime('%Y-%m-%d')}\n\n"
+                                                      f"No PMs scheduled for this week.\n")
+                self.update_status(f"No PMs scheduled for week of {week_start_str}")
+                return
             
             # Generate report text
-            report = f"WEEKLY PM PERFORMANCE REPORT\n"
-            report += f"Week: {week_start.strftime('%Y-%m-%d')} to {week_end.strftime('%Y-%m-%d')}\n"
-            report += "=" * 80 + "\n\n"
+            parts = [f"WEEKLY PM PERFORMANCE REPORT\n"]
+            parts.append(f"Week: {week_start_str} to {week_end.strftime('%Y-%m-%d')}\n")
+            parts.append("=" * 80 + "\n\n")
             
-            report += f"OVERALL PERFORMANCE:\n"
-            report += f"Target PMs for Week: {self.weekly_pm_target}\n"
-            report += f"Scheduled PMs: {total_scheduled}\n"
-            report += f"Completed PMs: {total_completed}\n"
-            report += f"Completion Rate: {completion_rate:.1f}%\n"
-            report += f"Remaining PMs: {total_scheduled - total_completed}\n\n"
+            parts.append(f"OVERALL PERFORMANCE:\n")
+            parts.append(f"Target PMs for Week: {self.weekly_pm_target}\n")
+            parts.append(f"Scheduled PMs: {total_scheduled}\n")
+            parts.append(f"Completed PMs: {total_completed}\n")
+            parts.append(f"Completion Rate: {completion_rate:.1f}%\n")
+            parts.append(f"Remaining PMs: {total_scheduled - total_completed}\n\n")
             
             # Performance status
             if completion_rate >= 95:
@@ -11621,69 +12660,68 @@ class AITCMMSSystem:
             else:
                 status = "NEEDS IMPROVEMENT"
             
-            report += f"PERFORMANCE STATUS: {status}\n\n"
+            parts.append(f"PERFORMANCE STATUS: {status}\n\n")
             
-            report += "TECHNICIAN PERFORMANCE:\n"
-            report += f"{'Technician':<20} {'Assigned':<10} {'Completed':<10} {'Rate':<8} {'Avg Hours':<10}\n"
-            report += "-" * 70 + "\n"
+            parts.append("TECHNICIAN PERFORMANCE:\n")
+            parts.append(f"{'Technician':<20} {'Assigned':<10} {'Completed':<10} {'Rate':<8} {'Avg Hours':<10}\n")
+            parts.append("-" * 70 + "\n")
             
             # Clear and update technician performance tree
-            for item in self.tech_performance_tree.get_children():
-                self.tech_performance_tree.delete(item)
+            children = self.tech_performance_tree.get_children()
+            if children:
+                self.tech_performance_tree.delete(*children)
             
-            for tech_data in tech_performance:
+            tree_rows = []
+            for tech_data, tech_rate in zip(tech_performance, tech_rates):
                 technician, assigned, completed, avg_hours = tech_data
-                tech_rate = (completed / assigned * 100) if assigned > 0 else 0
+                rate_display = f"{tech_rate:.1f}%"
                 avg_hours_display = f"{avg_hours:.1f}h" if avg_hours else "N/A"
                 
-                report += f"{technician:<20} {assigned:<10} {completed:<10} {tech_rate:<7.1f}% {avg_hours_display:<10}\n"
+                # Report line and tree row share the formatted rate and hours
+                parts.append(f"{technician:<20} {assigned:<10} {completed:<10} {rate_display:<8} {avg_hours_display:<10}\n")
                 
                 # Add to tree
-                self.tech_performance_tree.insert('', 'end', values=(
-                    technician, assigned, completed, f"{tech_rate:.1f}%", avg_hours_display
-                ))
+                values = (technician, assigned, completed, rate_display, avg_hours_display)
+                self.tech_performance_tree.insert('', 'end', values=values)
+                tree_rows.append(values)
             
             # Add PM type breakdown
-            cursor.execute('''
-                SELECT pm_type, 
-                       COUNT(*) as scheduled,
-                       COUNT(CASE WHEN status = 'Completed' THEN 1 END) as completed
-                FROM weekly_pm_schedules 
-                WHERE week_start_date = %s
-                GROUP BY pm_type
-            ''', (week_start.strftime('%Y-%m-%d'),))
-            
-            pm_types = cursor.fetchall()
-            
             if pm_types:
-                report += "\nPM TYPE BREAKDOWN:\n"
-                report += f"{'PM Type':<15} {'Scheduled':<10} {'Completed':<10} {'Rate':<8}\n"
-                report += "-" * 45 + "\n"
+                parts.append("\nPM TYPE BREAKDOWN:\n")
+                parts.append(f"{'PM Type':<15} {'Scheduled':<10} {'Completed':<10} {'Rate':<8}\n")
+                parts.append("-" * 45 + "\n")
                 
-                for pm_type, scheduled, completed in pm_types:
-                    pm_rate = (completed / scheduled * 100) if scheduled > 0 else 0
-                    report += f"{pm_type:<15} {scheduled:<10} {completed:<10} {pm_rate:<7.1f}%\n"
+                for pm_type, scheduled, completed, pm_rate in pm_types:
+                    parts.append(f"{pm_type:<15} {scheduled:<10} {completed:<10} {pm_rate:<7.1f}%\n")
             
             # Display report
+            report = ''.join(parts)
             self.weekly_report_text.delete('1.0', 'end')
             self.weekly_report_text.insert('end', report)
             
             # Save report to database
             cursor.execute('''
-                INSERT OR REPLACE INTO weekly_reports 
+                INSERT INTO weekly_reports 
                 (week_start_date, total_scheduled, total_completed, completion_rate, 
                  technician_performance, report_data)
                 VALUES (%s, %s, %s, %s, %s, %s)
+                ON CONFLICT (week_start_date) DO UPDATE SET
+                    total_scheduled = EXCLUDED.total_scheduled,
+                    total_completed = EXCLUDED.total_completed,
+                    completion_rate = EXCLUDED.completion_rate,
+                    technician_performance = EXCLUDED.technician_performance,
+                    report_data = EXCLUDED.report_data
             ''', (
-                week_start.strftime('%Y-%m-%d'),
+                week_start_str,
                 total_scheduled,
                 total_completed,
                 completion_rate,
-                json.dumps(tech_performance),
+                extras.Json(tech_performance),
                 report
             ))
             
             self.conn.commit()
+            self._report_cache[week_start_str] = (signature, report, tree_rows, completion_rate)
             self.update_status(f"Weekly report generated - {completion_rate:.1f}% completion rate")
             
         except Exception as e:
@@ -11697,65 +12735,79 @@ class AITCMMSSystem:
 
             current_date = datetime.now()
             month_start = current_date.replace(day=1)
+            current_date_str = current_date.strftime('%Y-%m-%d')
 
             cursor = self.conn.cursor()
             
-            # Get monthly statistics from weekly reports
-            cursor.execute('''
-                SELECT week_start_date, total_scheduled, total_completed, completion_rate
+            # Get monthly statistics from weekly reports; the month totals ride along
+            # on every row as window aggregates, so the weekly breakdown and the
+            # summary come back in the same round-trip
+            db_pool.execute_prepared(cursor, 'monthly_report_weeks', '''
+                SELECT week_start_date, total_scheduled, total_completed, completion_rate,
+                       COUNT(*) OVER () as weeks_reported,
+                       SUM(total_scheduled) OVER () as month_scheduled,
+                       SUM(total_completed) OVER () as month_completed,
+                       AVG(completion_rate) OVER () as avg_completion_rate
                 FROM weekly_reports 
-                WHERE week_start_date >= DATE_TRUNC('month', %s::date)
+                WHERE week_start_date >= to_char(DATE_TRUNC('month', %(month_date)s::date), 'YYYY-MM-DD')
                 ORDER BY week_start_date
-            ''', (current_date.strftime('%Y-%m-%d'),))
+            ''', {'month_date': current_date_str}, {'month_date': 'text'})
             
             weekly_data = cursor.fetchall()
             
             # Get monthly PM completions
-            cursor.execute('''
+            db_pool.execute_prepared(cursor, 'monthly_report_pm_types', '''
                 SELECT 
                     pm_type,
                     COUNT(*) as total_completed,
-                    AVG(labor_hours + labor_minutes/60.0) as avg_hours
+                    AVG(total_hours) as avg_hours
                 FROM pm_completions 
-                WHERE completion_date >= DATE_TRUNC('month', %s::date)
+                WHERE completion_date >= DATE_TRUNC('month', %(month_date)s::date)
                 GROUP BY pm_type
-            ''', (current_date.strftime('%Y-%m-%d'),))
+            ''', {'month_date': current_date_str}, {'month_date': 'text'})
             
             monthly_completions = cursor.fetchall()
+
+            if not weekly_data and not monthly_completions:
+                self.weekly_report_text.delete('1.0', 'end')
+                self.weekly_report_text.insert('end', f"MONTHLY PM PERFORMANCE REPORT\n"
+                                                      f"Month: {current_date.strftime('%B %Y')}\n\n"
+                                                      f"No weekly reports or PM completions this month.\n")
+                self.update_status("Monthly report generated - no data for this month")
+                return
             
             # Generate monthly report
-            report = f"MONTHLY PM PERFORMANCE REPORT\n"
-            report += f"Month: {current_date.strftime('%B %Y')}\n"
-            report += "=" * 80 + "\n\n"
+            parts = [f"MONTHLY PM PERFORMANCE REPORT\n"]
+            parts.append(f"Month: {current_date.strftime('%B %Y')}\n")
+            parts.append("=" * 80 + "\n\n")
             
             if weekly_data:
-                total_scheduled = sum(row[1] for row in weekly_data)
-                total_completed = sum(row[2] for row in weekly_data)
-                avg_completion_rate = sum(row[3] for row in weekly_data) / len(weekly_data)
+                weeks_reported, total_scheduled, total_completed, avg_completion_rate = weekly_data[0][4:]
                 
-                report += f"MONTHLY SUMMARY:\n"
-                report += f"Total Weeks Reported: {len(weekly_data)}\n"
-                report += f"Total PMs Scheduled: {total_scheduled}\n"
-                report += f"Total PMs Completed: {total_completed}\n"
-                report += f"Average Completion Rate: {avg_completion_rate:.1f}%\n"
-                report += f"Monthly Target ({len(weekly_data)} weeks  {self.weekly_pm_target}): {len(weekly_data) * self.weekly_pm_target}\n\n"
+                parts.append(f"MONTHLY SUMMARY:\n")
+                parts.append(f"Total Weeks Reported: {weeks_reported}\n")
+                parts.append(f"Total PMs Scheduled: {total_scheduled}\n")
+                parts.append(f"Total PMs Completed: {total_completed}\n")
+                parts.append(f"Average Completion Rate: {avg_completion_rate:.1f}%\n")
+                parts.append(f"Monthly Target ({weeks_reported} weeks  {self.weekly_pm_target}): {weeks_reported * self.weekly_pm_target}\n\n")
                 
-                report += "WEEKLY BREAKDOWN:\n"
-                report += f"{'Week Starting':<15} {'Scheduled':<10} {'Completed':<10} {'Rate':<8}\n"
-                report += "-" * 45 + "\n"
+                parts.append("WEEKLY BREAKDOWN:\n")
+                parts.append(f"{'Week Starting':<15} {'Scheduled':<10} {'Completed':<10} {'Rate':<8}\n")
+                parts.append("-" * 45 + "\n")
                 
-                for week_start, scheduled, completed, rate in weekly_data:
-                    report += f"{week_start:<15} {scheduled:<10} {completed:<10} {rate:<7.1f}%\n"
+                for week_start, scheduled, completed, rate, *_ in weekly_data:
+                    parts.append(f"{week_start:<15} {scheduled:<10} {completed:<10} {rate:<7.1f}%\n")
             
             if monthly_completions:
-                report += "\nPM TYPE PERFORMANCE (Month):\n"
-                report += f"{'PM Type':<15} {'Completed':<10} {'Avg Hours':<10}\n"
-                report += "-" * 37 + "\n"
+                parts.append("\nPM TYPE PERFORMANCE (Month):\n")
+                parts.append(f"{'PM Type':<15} {'Completed':<10} {'Avg Hours':<10}\n")
+                parts.append("-" * 37 + "\n")
                 
                 for pm_type, completed, avg_hours in monthly_completions:
-                    report += f"{pm_type:<15} {completed:<10} {avg_hours:<9.1f}h\n"
+                    parts.append(f"{pm_type:<15} {completed:<10} {avg_hours:<9.1f}h\n")
             
             # Display report
+            report = ''.join(parts)
             self.weekly_report_text.delete('1.0', 'end')
             self.weekly_report_text.insert('end', report)
             
@@ -11783,6 +12835,63 @@ class AITCMMSSystem:
     
     
     
+    def _show_date_picker(self, parent, date_var):
+        """Pick a date into date_var (YYYY-MM-DD)
+
+        The calendar window is built on first use and only hidden afterwards, so
+        later opens skip creating the Calendar widget and its images.
+        """
+        if not TKCALENDAR_AVAILABLE:
+            messagebox.showerror("Error", "Calendar picker unavailable (tkcalendar not installed).\n"
+                                 "Enter the date as YYYY-MM-DD.", parent=parent)
+            return
+
+        # Parse current date or use today
+        try:
+            current_date = datetime.strptime(date_var.get(), '%Y-%m-%d')
+        except ValueError:
+            current_date = datetime.now()
+
+        if self._cal_dialog is None or not self._cal_dialog.winfo_exists():
+            cal_dialog = tk.Toplevel(self.root)
+            cal_dialog.title("Select Date")
+            cal_dialog.geometry("300x300")
+
+            cal = Calendar(cal_dialog, selectmode='day', date_pattern='yyyy-mm-dd')
+            cal.pack(pady=20, padx=20, fill='both', expand=True)
+
+            def close():
+                cal_dialog.grab_release()
+                cal_dialog.withdraw()
+                # Hand the grab back to the dialog the picker was opened from
+                if self._cal_parent is not None and self._cal_parent.winfo_exists():
+                    self._cal_parent.grab_set()
+
+            def choose(value):
+                self._cal_target.set(value)
+                close()
+
+            # Buttons
+            button_frame = ttk.Frame(cal_dialog)
+            button_frame.pack(pady=10)
+            ttk.Button(button_frame, text="Select", command=lambda: choose(cal.get_date())).pack(side='left', padx=5)
+            ttk.Button(button_frame, text="Today",
+                    command=lambda: choose(datetime.now().strftime('%Y-%m-%d'))).pack(side='left', padx=5)
+            ttk.Button(button_frame, text="Cancel", command=close).pack(side='left', padx=5)
+            cal_dialog.protocol("WM_DELETE_WINDOW", close)
+
+            self._cal_dialog = cal_dialog
+            self._cal_widget = cal
+
+        self._cal_target = date_var
+        self._cal_parent = parent
+        self._cal_widget.selection_set(current_date.date())  # Also shows that month
+
+        self._cal_dialog.transient(parent)
+        self._cal_dialog.deiconify()
+        self._cal_dialog.lift()
+        self._cal_dialog.grab_set()
+
     def create_cm_dialog(self):
         """Create new Corrective Maintenance with calendar date picker"""
         dialog = tk.Toplevel(self.root)
@@ -11791,24 +12900,11 @@ class AITCMMSSystem:
         dialog.transient(self.root)
         dialog.grab_set()
 
-        # Generate next CM number in format CM-YYYYMMDD-XXXX
-        cursor = self.conn.cursor()
-        today = datetime.now().strftime('%Y%m%d')
-        cursor.execute(
-            "SELECT MAX(CAST(SPLIT_PART(cm_number, '-', 3) AS INTEGER)) "
-            "FROM corrective_maintenance "
-            "WHERE cm_number LIKE %s",
-            (f'CM-{today}-%',)
-        )
-        result = cursor.fetchone()[0]
-        next_seq = (result + 1) if result else 1
-        next_cm_num = f"CM-{today}-{next_seq:04d}"
-
         row = 0
 
-        # CM Number (auto-generated, read-only)
+        # CM Number (reserved when the CM is saved, read-only)
         ttk.Label(dialog, text="CM Number:", font=('Arial', 10, 'bold')).grid(row=row, column=0, sticky='w', padx=10, pady=5)
-        cm_number_var = tk.StringVar(value=next_cm_num)
+        cm_number_var = tk.StringVar(value="Assigned on save")
         ttk.Entry(dialog, textvariable=cm_number_var, width=20, state='readonly').grid(row=row, column=1, sticky='w', padx=10, pady=5)
         row += 1
 
@@ -11827,42 +12923,7 @@ class AITCMMSSystem:
         # Calendar picker button
         def open_calendar():
             """Open calendar dialog to pick a date"""
-            from tkcalendar import Calendar
-        
-            # Create calendar dialog
-            cal_dialog = tk.Toplevel(dialog)
-            cal_dialog.title("Select Date")
-            cal_dialog.geometry("300x300")
-            cal_dialog.transient(dialog)
-            cal_dialog.grab_set()
-        
-            # Parse current date or use today
-            try:
-                current_date = datetime.strptime(cm_date_var.get(), '%Y-%m-%d')
-            except:
-                current_date = datetime.now()
-        
-            # Create calendar widget
-            cal = Calendar(cal_dialog, 
-                          selectmode='day',
-                          year=current_date.year,
-                          month=current_date.month,
-                          day=current_date.day,
-                          date_pattern='yyyy-mm-dd')
-            cal.pack(pady=20, padx=20, fill='both', expand=True)
-        
-            def select_date():
-                cm_date_var.set(cal.get_date())
-                cal_dialog.destroy()
-        
-            # Buttons
-            button_frame = ttk.Frame(cal_dialog)
-            button_frame.pack(pady=10)
-            ttk.Button(button_frame, text="Select", command=select_date).pack(side='left', padx=5)
-            ttk.Button(button_frame, text="Today", 
-                    command=lambda: [cm_date_var.set(datetime.now().strftime('%Y-%m-%d')), 
-                                    cal_dialog.destroy()]).pack(side='left', padx=5)
-            ttk.Button(button_frame, text="Cancel", command=cal_dialog.destroy).pack(side='left', padx=5)
+            self._show_date_picker(dialog, cm_date_var)
     
         # Calendar button with icon
         ttk.Button(date_frame, text="Pick Date", command=open_calendar).pack(side='left')
@@ -11877,8 +12938,7 @@ class AITCMMSSystem:
         ttk.Label(dialog, text="Equipment (BFM):").grid(row=row, column=0, sticky='w', padx=10, pady=5)
         bfm_var = tk.StringVar()
         
-        cursor.execute("SELECT DISTINCT bfm_equipment_no FROM equipment WHERE status = 'Active' ORDER BY bfm_equipment_no")
-        equipment_list = [row[0] for row in cursor.fetchall()]
+        equipment_list = self._get_equipment_numbers(active_only=True)
         
         bfm_combo = ttk.Combobox(dialog, textvariable=bfm_var, values=equipment_list, width=20)
         bfm_combo.grid(row=row, column=1, sticky='w', padx=10, pady=5)
@@ -11965,12 +13025,13 @@ class AITCMMSSystem:
         
                 # Save to database with the manually entered date
                 cursor = self.conn.cursor()
+                cm_number = self.generate_cm_number(cursor)
                 cursor.execute('''
                     INSERT INTO corrective_maintenance 
                     (cm_number, bfm_equipment_no, description, priority, assigned_technician, created_date)
                     VALUES (%s, %s, %s, %s, %s, %s)
                 ''', (
-                    cm_number_var.get(),
+                    cm_number,
                     bfm_var.get(),
                     description_text.get('1.0', 'end-1c'),
                     priority_var.get(),
@@ -11978,6 +13039,7 @@ class AITCMMSSystem:
                     validated_date
                 ))
                 self.conn.commit()
+                cm_number_var.set(cm_number)
             
                 messagebox.showinfo("Success", 
                                 f"Corrective Maintenance created successfully!\n\n"
@@ -11986,9 +13048,11 @@ class AITCMMSSystem:
                                 f"Equipment: {bfm_var.get()}\n"
                                 f"Assigned to: {assigned_var.get()}")
                 dialog.destroy()
+                self._analytics_cache.clear()
                 self.load_corrective_maintenance()
         
             except Exception as e:
+                self.conn.rollback()
                 messagebox.showerror("Error", f"Failed to create CM: {str(e)}")
 
         # Buttons
@@ -12013,12 +13077,13 @@ class AITCMMSSystem:
         item = self.cm_tree.item(selected[0])
         cm_number = item['values'][0]
 
-        # Fetch full CM data from database
+        # Fetch full CM data from database, with the parts count for the View Parts button
         cursor = self.conn.cursor()
         cursor.execute('''
             SELECT cm_number, bfm_equipment_no, description, priority, assigned_technician, 
-                status, created_date, completion_date, labor_hours, notes, root_cause, corrective_action
-            FROM corrective_maintenance 
+                status, created_date, completion_date, labor_hours, notes, root_cause, corrective_action,
+                (SELECT COUNT(*) FROM cm_parts_used p WHERE p.cm_number = cm.cm_number) as parts_count
+            FROM corrective_maintenance cm
             WHERE cm_number = %s
         ''', (cm_number,))
 
@@ -12030,7 +13095,7 @@ class AITCMMSSystem:
         # Extract CM data
         (orig_cm_number, orig_bfm_no, orig_description, orig_priority, orig_assigned, 
         orig_status, orig_created, orig_completion, orig_hours, orig_notes, 
-        orig_root_cause, orig_corrective_action) = cm_data
+        orig_root_cause, orig_corrective_action, parts_count) = cm_data
 
         # Create edit dialog
         dialog = tk.Toplevel(self.root)
@@ -12070,8 +13135,7 @@ class AITCMMSSystem:
         bfm_combo.grid(row=row, column=1, sticky='w', padx=5, pady=5)
 
         # Populate equipment list
-        cursor.execute('SELECT bfm_equipment_no FROM equipment ORDER BY bfm_equipment_no')
-        equipment_list = [row[0] for row in cursor.fetchall()]
+        equipment_list = self._get_equipment_numbers()
         bfm_combo['values'] = equipment_list
         row += 1
 
@@ -12188,7 +13252,8 @@ class AITCMMSSystem:
                 self.conn.commit()
                 messagebox.showinfo("Success", f"CM {orig_cm_number} updated successfully!")
                 dialog.destroy()
-                self.load_corrective_maintenance()
+                self._analytics_cache.clear()
+                self.refresh_cm_row(orig_cm_number, selected[0])
 
             except Exception as e:
                 try:
@@ -12211,7 +13276,9 @@ class AITCMMSSystem:
                     self.conn.commit()
                     messagebox.showinfo("Success", f"CM {orig_cm_number} deleted successfully!")
                     dialog.destroy()
-                    self.load_corrective_maintenance()
+                    # Row is gone from the database - refresh_cm_row drops it from the list
+                    self._analytics_cache.clear()
+                    self.refresh_cm_row(orig_cm_number, selected[0])
                 except Exception as e:
                     # Roll back so the connection is not left in an aborted state
                     try:
@@ -12230,10 +13297,6 @@ class AITCMMSSystem:
         # ============ ADD THIS NEW SECTION ============
         # View Parts button - shows parts consumed for this CM
         if hasattr(self, 'parts_integration'):
-            cursor = self.conn.cursor()
-            cursor.execute('SELECT COUNT(*) FROM cm_parts_used WHERE cm_number = %s', (orig_cm_number,))
-            parts_count = cursor.fetchone()[0]
-            
             if parts_count > 0:
                 button_text = f"WARNING: View Parts Used ({parts_count})"
             else:
@@ -12248,13 +13311,10 @@ class AITCMMSSystem:
         
         ttk.Button(button_frame, text="Cancel", command=dialog.destroy).pack(side='right', padx=5)
 
-        # Pack the canvas and scrollbar
+        # Pack the canvas and scrollbar - the <Configure> binding above sets the
+        # scroll region once Tk lays the form out at idle
         main_canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
-
-        # Update scroll region
-        scrollable_frame.update_idletasks()
-        main_canvas.configure(scrollregion=main_canvas.bbox("all"))
     
     
     
@@ -12270,15 +13330,7 @@ class AITCMMSSystem:
         cm_number = item['values'][0]
     
         # Fetch CM details
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            SELECT cm_number, bfm_equipment_no, description, assigned_technician, 
-                status, labor_hours, notes, root_cause, corrective_action
-            FROM corrective_maintenance 
-            WHERE cm_number = %s
-        ''', (cm_number,))
-    
-        cm_data = cursor.fetchone()
+        cm_data = self._fetch_cm_for_completion(cm_number)
         if not cm_data:
             messagebox.showerror("Error", "CM not found")
             return
@@ -12482,6 +13534,7 @@ class AITCMMSSystem:
                     f"Status: Closed")
 
                 dialog.destroy()
+                self._analytics_cache.clear()
                 self.load_corrective_maintenance()
 
             except Exception as e:
@@ -12525,115 +13578,99 @@ class AITCMMSSystem:
  
     
     
-    def load_corrective_maintenance(self):
-        """Load corrective maintenance data"""
-        try:
-            cursor = self.conn.cursor()
-            cursor.execute('''
-                SELECT cm_number, bfm_equipment_no, description, priority, 
-                       assigned_technician, status, created_date
-                FROM corrective_maintenance 
-                ORDER BY created_date DESC
-            ''')
-            
-            # Clear existing items
-            for item in self.cm_tree.get_children():
-                self.cm_tree.delete(item)
-            
-            # Add CM records
-            for cm in cursor.fetchall():
-                cm_number, bfm_no, description, priority, assigned, status, created = cm
-                # Truncate description for display
-                display_desc = (description[:47] + '...') if len(description) > 50 else description
-                self.cm_tree.insert('', 'end', values=(
-                    cm_number, bfm_no, display_desc, priority, assigned, status, created
-                ))
-                
-        except Exception as e:
-            print(f"Error loading corrective maintenance: {e}")
-    
     def refresh_analytics_dashboard(self):
         """Refresh analytics dashboard with current data"""
         try:
+            cached = self._cached_analytics('dashboard')
+            if cached:
+                self.analytics_text.delete('1.0', 'end')
+                self.analytics_text.insert('end', cached)
+                return
+
             cursor = self.conn.cursor()
             
             # Generate comprehensive analytics
-            analytics = "AIT CMMS ANALYTICS DASHBOARD\n"
-            analytics += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-            analytics += "=" * 80 + "\n\n"
-            
-            # Equipment statistics
-            cursor.execute("SELECT COUNT(*) FROM equipment WHERE status = 'Active'")
-            active_equipment = cursor.fetchone()[0]
-            
-            cursor.execute('SELECT COUNT(*) FROM equipment WHERE monthly_pm = 1')
-            monthly_pm_equipment = cursor.fetchone()[0]
-            
-            cursor.execute('SELECT COUNT(*) FROM equipment WHERE six_month_pm = 1')
-            six_month_pm_equipment = cursor.fetchone()[0]
-            
-            cursor.execute('SELECT COUNT(*) FROM equipment WHERE annual_pm = 1')
-            annual_pm_equipment = cursor.fetchone()[0]
-            
-            analytics += "EQUIPMENT OVERVIEW:\n"
-            analytics += f"Total Active Equipment: {active_equipment}\n"
-            analytics += f"Equipment with Monthly PM: {monthly_pm_equipment}\n"
-            analytics += f"Equipment with Six Month PM: {six_month_pm_equipment}\n"
-            analytics += f"Equipment with Annual PM: {annual_pm_equipment}\n\n"
+            now = datetime.now()
+            parts = ["AIT CMMS ANALYTICS DASHBOARD\n"]
+            parts.append(f"Generated: {now.strftime('%Y-%m-%d %H:%M:%S')}\n")
+            parts.append("=" * 80 + "\n\n")
             
-            # PM completion statistics (last 30 days)
+            # Equipment statistics - all counts in one pass over equipment
             cursor.execute('''
-                SELECT COUNT(*) FROM pm_completions
-                WHERE completion_date >= CURRENT_DATE - INTERVAL '30 days'
+                SELECT 
+                    COUNT(*) FILTER (WHERE status = 'Active'),
+                    COUNT(*) FILTER (WHERE monthly_pm = 1),
+                    COUNT(*) FILTER (WHERE six_month_pm = 1),
+                    COUNT(*) FILTER (WHERE annual_pm = 1)
+                FROM equipment
             ''')
-            recent_completions = cursor.fetchone()[0]
-            
-            cursor.execute('''
-                SELECT pm_type, COUNT(*)
+            active_equipment, monthly_pm_equipment, six_month_pm_equipment, annual_pm_equipment = cursor.fetchone()
+            
+            parts.append("EQUIPMENT OVERVIEW:\n")
+            parts.append(f"Total Active Equipment: {active_equipment}\n")
+            parts.append(f"Equipment with Monthly PM: {monthly_pm_equipment}\n")
+            parts.append(f"Equipment with Six Month PM: {six_month_pm_equipment}\n")
+            parts.append(f"Equipment with Annual PM: {annual_pm_equipment}\n\n")
+            
+            # PM completion statistics (last 30 days) - per-type counts plus the
+            # grand total row (GROUPING(pm_type) = 1) from a single query.
+            # Prepared once on self.conn; the window is bound so both dashboard
+            # statements stay plain fixed-shape SQL across refreshes
+            recent_window = {'window': '30 days'}
+            db_pool.execute_prepared(cursor, 'dashboard_pm_types', '''
+                SELECT GROUPING(pm_type), pm_type, COUNT(*)
                 FROM pm_completions
-                WHERE completion_date >= CURRENT_DATE - INTERVAL '30 days'
-                GROUP BY pm_type
-            ''')
-            pm_type_stats = cursor.fetchall()
+                WHERE completion_date >= CURRENT_DATE - %(window)s::interval
+                GROUP BY GROUPING SETS ((pm_type), ())
+            ''', recent_window, {'window': 'text'})
+            recent_completions = 0
+            pm_type_stats = []
+            for is_total, pm_type, count in cursor.fetchall():
+                if is_total:
+                    recent_completions = count
+                else:
+                    pm_type_stats.append((pm_type, count))
             
-            analytics += "PM COMPLETION STATISTICS (Last 30 Days):\n"
-            analytics += f"Total PM Completions: {recent_completions}\n"
+            parts.append("PM COMPLETION STATISTICS (Last 30 Days):\n")
+            parts.append(f"Total PM Completions: {recent_completions}\n")
             for pm_type, count in pm_type_stats:
-                analytics += f"{pm_type} PMs: {count}\n"
-            analytics += "\n"
+                parts.append(f"{pm_type} PMs: {count}\n")
+            parts.append("\n")
             
             # Technician performance (last 30 days)
-            cursor.execute('''
+            db_pool.execute_prepared(cursor, 'dashboard_technicians', '''
                 SELECT technician_name,
                        COUNT(*) as completed_pms,
-                       AVG(labor_hours + labor_minutes/60.0) as avg_hours
+                       AVG(total_hours) as avg_hours
                 FROM pm_completions
-                WHERE completion_date >= CURRENT_DATE - INTERVAL '30 days'
+                WHERE completion_date >= CURRENT_DATE - %(window)s::interval
                 GROUP BY technician_name
                 ORDER BY completed_pms DESC
-            ''')
+            ''', recent_window, {'window': 'text'})
             tech_stats = cursor.fetchall()
             
-            analytics += "TECHNICIAN PERFORMANCE (Last 30 Days):\n"
-            analytics += f"{'Technician':<20} {'Completed PMs':<15} {'Avg Hours':<10}\n"
-            analytics += "-" * 47 + "\n"
+            parts.append("TECHNICIAN PERFORMANCE (Last 30 Days):\n")
+            parts.append(f"{'Technician':<20} {'Completed PMs':<15} {'Avg Hours':<10}\n")
+            parts.append("-" * 47 + "\n")
             for tech, completed, avg_hours in tech_stats:
-                analytics += f"{tech:<20} {completed:<15} {avg_hours:<9.1f}h\n"
-            analytics += "\n"
+                parts.append(f"{tech:<20} {completed:<15} {avg_hours:<9.1f}h\n")
+            parts.append("\n")
             
             # CM statistics
-            cursor.execute("SELECT COUNT(*) FROM corrective_maintenance WHERE status = 'Open'")
-            open_cms = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM corrective_maintenance WHERE status = 'Completed'")
-            completed_cms = cursor.fetchone()[0]
+            cursor.execute('''
+                SELECT 
+                    COUNT(*) FILTER (WHERE status = 'Open'),
+                    COUNT(*) FILTER (WHERE status = 'Completed')
+                FROM corrective_maintenance
+            ''')
+            open_cms, completed_cms = cursor.fetchone()
             
-            analytics += "CORRECTIVE MAINTENANCE:\n"
-            analytics += f"Open CMs: {open_cms}\n"
-            analytics += f"Completed CMs: {completed_cms}\n\n"
+            parts.append("CORRECTIVE MAINTENANCE:\n")
+            parts.append(f"Open CMs: {open_cms}\n")
+            parts.append(f"Completed CMs: {completed_cms}\n\n")
             
-            # Current week performance
-            current_week_start = self.get_week_start(datetime.now()).strftime('%Y-%m-%d')
+            # Current week performance (week start from the local clock, as on the weekly report)
+            current_week_start = self.get_week_start(now).strftime('%Y-%m-%d')
             cursor.execute('''
                 SELECT 
                     COUNT(*) as scheduled,
@@ -12645,11 +13682,14 @@ class AITCMMSSystem:
             week_scheduled, week_completed = cursor.fetchone()
             week_rate = (week_completed / week_scheduled * 100) if week_scheduled > 0 else 0
             
-            analytics += "CURRENT WEEK PERFORMANCE:\n"
-            analytics += f"Scheduled PMs: {week_scheduled}\n"
-            analytics += f"Completed PMs: {week_completed}\n"
-            analytics += f"Completion Rate: {week_rate:.1f}%\n\n"
+            parts.append("CURRENT WEEK PERFORMANCE:\n")
+            parts.append(f"Scheduled PMs: {week_scheduled}\n")
+            parts.append(f"Completed PMs: {week_completed}\n")
+            parts.append(f"Completion Rate: {week_rate:.1f}%\n\n")
             
+            analytics = ''.join(parts)
+            self._analytics_cache['dashboard'] = (time.monotonic(), analytics)
+
             # Display analytics
             self.analytics_text.delete('1.0', 'end')
             self.analytics_text.insert('end', analytics)
@@ -12687,11 +13727,23 @@ class AITCMMSSystem:
             technician_frame = ttk.Frame(analytics_notebook)
             analytics_notebook.add(technician_frame, text="Technician Analysis")
         
-            # Generate analytics for each tab
-            self.generate_equipment_overview(overview_frame)
-            self.generate_pm_performance_analysis(pm_performance_frame)
-            self.generate_location_analysis(location_frame)
-            self.generate_technician_analysis(technician_frame)
+            # Build each tab the first time it is shown - the overview straight away,
+            # the others only if the user opens them
+            tab_builders = {
+                str(overview_frame): (self.generate_equipment_overview, overview_frame),
+                str(pm_performance_frame): (self.generate_pm_performance_analysis, pm_performance_frame),
+                str(location_frame): (self.generate_location_analysis, location_frame),
+                str(technician_frame): (self.generate_technician_analysis, technician_frame),
+            }
+
+            def build_selected_tab(event=None):
+                builder = tab_builders.pop(str(analytics_notebook.select()), None)
+                if builder:
+                    generate, frame = builder
+                    generate(frame)
+
+            analytics_notebook.bind('<<NotebookTabChanged>>', build_selected_tab)
+            build_selected_tab()
         
             # Add export button
             export_frame = ttk.Frame(analytics_dialog)
@@ -12705,11 +13757,43 @@ class AITCMMSSystem:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to generate equipment analytics: {str(e)}")
 
+    def _fill_analytics_text(self, text_widget, key, build, label):
+        """Show analytics page key in text_widget, running build(cursor) on a background worker
+
+        The queries run on their own pooled connection, so the four Equipment
+        Analytics tabs are built in parallel while the dialog stays responsive.
+        """
+        def show(text):
+            text_widget.config(state='normal')
+            text_widget.delete('1.0', 'end')
+            text_widget.insert('end', text)
+            text_widget.config(state='disabled')
+
+        cached = self._cached_analytics(key)
+        if cached:
+            show(cached)
+            return
+
+        def work():
+            with db_pool.connection() as conn:
+                return build(conn.cursor())
+
+        def done(analytics):
+            self._analytics_cache[key] = (time.monotonic(), analytics)
+            if text_widget.winfo_exists():  # Dialog may have been closed meanwhile
+                show(analytics)
+
+        def error(e):
+            print(f"Error generating {label}: {e}")
+            if text_widget.winfo_exists():
+                show(f"Error generating {label}: {e}\n")
+
+        show(f"Generating {label}...\n")
+        self.run_in_background(work, done, error)
+
     def generate_equipment_overview(self, parent_frame):
         """Generate equipment overview analytics"""
         try:
-            cursor = self.conn.cursor()
-        
             # Create scrollable text area
             text_frame = ttk.Frame(parent_frame)
             text_frame.pack(fill='both', expand=True, padx=10, pady=10)
@@ -12720,138 +13804,135 @@ class AITCMMSSystem:
         
             overview_text.pack(side='left', fill='both', expand=True)
             scrollbar.pack(side='right', fill='y')
-        
-            # Generate analytics content
-            analytics = "EQUIPMENT ANALYTICS OVERVIEW\n"
-            analytics += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-            analytics += "=" * 80 + "\n\n"
-        
-            # Basic equipment statistics
-            cursor.execute('SELECT COUNT(*) FROM equipment')
-            total_equipment = cursor.fetchone()[0]
-        
-            cursor.execute("SELECT COUNT(*) FROM equipment WHERE status = 'Active'")
-            active_equipment = cursor.fetchone()[0]
-        
-            cursor.execute("SELECT COUNT(*) FROM equipment WHERE status = 'Missing'")
-            missing_equipment = cursor.fetchone()[0]
-        
-            cursor.execute("SELECT COUNT(*) FROM equipment WHERE status = 'Run to Failure'")
-            rtf_equipment = cursor.fetchone()[0]
-        
-            analytics += "EQUIPMENT STATUS SUMMARY:\n"
-            analytics += f"Total Equipment: {total_equipment}\n"
-            analytics += f"Active Equipment: {active_equipment} ({active_equipment/total_equipment*100:.1f}%)\n"
-            analytics += f"Missing Equipment: {missing_equipment} ({missing_equipment/total_equipment*100:.1f}%)\n"
-            analytics += f"Run to Failure: {rtf_equipment} ({rtf_equipment/total_equipment*100:.1f}%)\n\n"
-        
-            # PM Type Distribution
-            cursor.execute('SELECT COUNT(*) FROM equipment WHERE monthly_pm = 1')
-            monthly_pm_count = cursor.fetchone()[0]
-        
-            cursor.execute('SELECT COUNT(*) FROM equipment WHERE six_month_pm = 1')
-            six_month_pm_count = cursor.fetchone()[0]
-        
-            cursor.execute('SELECT COUNT(*) FROM equipment WHERE annual_pm = 1')
-            annual_pm_count = cursor.fetchone()[0]
-            
-            analytics += "PM TYPE REQUIREMENTS:\n"
-            analytics += f"Monthly PM Required: {monthly_pm_count} assets ({monthly_pm_count/total_equipment*100:.1f}%)\n"
-            analytics += f"Six Month PM Required: {six_month_pm_count} assets ({six_month_pm_count/total_equipment*100:.1f}%)\n"
-            analytics += f"Annual PM Required: {annual_pm_count} assets ({annual_pm_count/total_equipment*100:.1f}%)\n\n"
-        
-            # Location distribution
-            cursor.execute('''
-                SELECT location, COUNT(*) as count 
-                FROM equipment 
-                WHERE location IS NOT NULL AND location != ''
-                GROUP BY location 
-                ORDER BY count DESC 
-                LIMIT 10
-            ''')
-            location_stats = cursor.fetchall()
-        
-            if location_stats:
-                analytics += "TOP 10 EQUIPMENT LOCATIONS:\n"
-                analytics += f"{'Location':<20} {'Count':<10} {'Percentage':<12}\n"
-                analytics += "-" * 45 + "\n"
-            
-                for location, count in location_stats:
-                    percentage = count / total_equipment * 100
-                    analytics += f"{location:<20} {count:<10} {percentage:<11.1f}%\n"
-                analytics += "\n"
-        
-            # Equipment without PM completions (never serviced)
-            cursor.execute('''
-                SELECT e.bfm_equipment_no, e.description, e.location
-                FROM equipment e
-                LEFT JOIN pm_completions pc ON e.bfm_equipment_no = pc.bfm_equipment_no
-                WHERE pc.bfm_equipment_no IS NULL 
-                AND e.status = 'Active'
-                ORDER BY e.bfm_equipment_no
-                LIMIT 20
-            ''')
-            never_serviced = cursor.fetchall()
-        
-            if never_serviced:
-                analytics += f"EQUIPMENT NEVER SERVICED ({len(never_serviced)} items shown, may be more):\n"
-                analytics += f"{'BFM Number':<15} {'Description':<30} {'Location':<15}\n"
-                analytics += "-" * 62 + "\n"
-            
-                for bfm_no, description, location in never_serviced:
-                    desc_short = (description[:27] + '...') if description and len(description) > 27 else (description or 'N/A')
-                    loc_short = (location[:12] + '...') if location and len(location) > 12 else (location or 'N/A')
-                    analytics += f"{bfm_no:<15} {desc_short:<30} {loc_short:<15}\n"
-                analytics += "\n"
-        
-            # Equipment age analysis (based on creation date if available)
-            cursor.execute('''
+
+            self._fill_analytics_text(overview_text, 'equipment_overview', self._build_equipment_overview, 'equipment overview')
+
+        except Exception as e:
+            print(f"Error generating equipment overview: {e}")
+
+    def _build_equipment_overview(self, cursor):
+        """Equipment overview analytics text (runs on a background worker - no Tk calls)"""
+        # Generate analytics content
+        parts = ["EQUIPMENT ANALYTICS OVERVIEW\n"]
+        parts.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        parts.append("=" * 80 + "\n\n")
+
+        # Basic equipment statistics and PM type distribution in one pass over equipment
+        cursor.execute('''
+            SELECT 
+                COUNT(*),
+                COUNT(*) FILTER (WHERE status = 'Active'),
+                COUNT(*) FILTER (WHERE status = 'Missing'),
+                COUNT(*) FILTER (WHERE status = 'Run to Failure'),
+                COUNT(*) FILTER (WHERE monthly_pm = 1),
+                COUNT(*) FILTER (WHERE six_month_pm = 1),
+                COUNT(*) FILTER (WHERE annual_pm = 1)
+            FROM equipment
+        ''')
+        (total_equipment, active_equipment, missing_equipment, rtf_equipment,
+         monthly_pm_count, six_month_pm_count, annual_pm_count) = cursor.fetchone()
+
+        parts.append("EQUIPMENT STATUS SUMMARY:\n")
+        parts.append(f"Total Equipment: {total_equipment}\n")
+        parts.append(f"Active Equipment: {active_equipment} ({active_equipment/total_equipment*100:.1f}%)\n")
+        parts.append(f"Missing Equipment: {missing_equipment} ({missing_equipment/total_equipment*100:.1f}%)\n")
+        parts.append(f"Run to Failure: {rtf_equipment} ({rtf_equipment/total_equipment*100:.1f}%)\n\n")
+
+        # PM Type Distribution
+        parts.append("PM TYPE REQUIREMENTS:\n")
+        parts.append(f"Monthly PM Required: {monthly_pm_count} assets ({monthly_pm_count/total_equipment*100:.1f}%)\n")
+        parts.append(f"Six Month PM Required: {six_month_pm_count} assets ({six_month_pm_count/total_equipment*100:.1f}%)\n")
+        parts.append(f"Annual PM Required: {annual_pm_count} assets ({annual_pm_count/total_equipment*100:.1f}%)\n\n")
+
+        # Location distribution
+        cursor.execute('''
+            SELECT location, COUNT(*) as count 
+            FROM equipment 
+            WHERE location IS NOT NULL AND location != ''
+            GROUP BY location 
+            ORDER BY count DESC 
+            LIMIT 10
+        ''')
+        location_stats = cursor.fetchall()
+
+        if location_stats:
+            parts.append("TOP 10 EQUIPMENT LOCATIONS:\n")
+            parts.append(f"{'Location':<20} {'Count':<10} {'Percentage':<12}\n")
+            parts.append("-" * 45 + "\n")
+
+            for location, count in location_stats:
+                percentage = count / total_equipment * 100
+                parts.append(f"{location:<20} {count:<10} {percentage:<11.1f}%\n")
+            parts.append("\n")
+
+        # Equipment without PM completions (never serviced) - planned as a merge anti
+        # join walking equipment in bfm order against idx_pm_completions_equipment,
+        # stopping after 20 rows
+        cursor.execute('''
+            SELECT e.bfm_equipment_no, e.description, e.location
+            FROM equipment e
+            WHERE e.status = 'Active'
+            AND NOT EXISTS (
+                SELECT 1 FROM pm_completions pc
+                WHERE pc.bfm_equipment_no = e.bfm_equipment_no
+            )
+            ORDER BY e.bfm_equipment_no
+            LIMIT 20
+        ''')
+        never_serviced = cursor.fetchall()
+
+        if never_serviced:
+            parts.append(f"EQUIPMENT NEVER SERVICED ({len(never_serviced)} items shown, may be more):\n")
+            parts.append(f"{'BFM Number':<15} {'Description':<30} {'Location':<15}\n")
+            parts.append("-" * 62 + "\n")
+
+            for bfm_no, description, location in never_serviced:
+                desc_short = truncate_text(description, 27) or 'N/A'
+                loc_short = truncate_text(location, 12) or 'N/A'
+                parts.append(f"{bfm_no:<15} {desc_short:<30} {loc_short:<15}\n")
+            parts.append("\n")
+
+        # Equipment age analysis (based on creation date if available). Each row is
+        # bucketed once by number; the labels come from a small VALUES list so the
+        # buckets sort by number rather than needing a second CASE over the label
+        cursor.execute('''
+            SELECT b.age_category, COUNT(*) as count
+            FROM (
                 SELECT
                     CASE
-                        WHEN created_date >= CURRENT_DATE - INTERVAL '30 days' THEN 'Last 30 days'
-                        WHEN created_date >= CURRENT_DATE - INTERVAL '90 days' THEN 'Last 90 days'
-                        WHEN created_date >= CURRENT_DATE - INTERVAL '180 days' THEN 'Last 6 months'
-                        WHEN created_date >= CURRENT_DATE - INTERVAL '365 days' THEN 'Last year'
-                        ELSE 'Over 1 year'
-                    END as age_category,
-                    COUNT(*) as count
+                        WHEN created_date >= CURRENT_DATE - INTERVAL '30 days' THEN 1
+                        WHEN created_date >= CURRENT_DATE - INTERVAL '90 days' THEN 2
+                        WHEN created_date >= CURRENT_DATE - INTERVAL '180 days' THEN 3
+                        WHEN created_date >= CURRENT_DATE - INTERVAL '365 days' THEN 4
+                        ELSE 5
+                    END as bucket
                 FROM equipment
                 WHERE created_date IS NOT NULL
-                GROUP BY age_category
-                ORDER BY 
-                    CASE 
-                        WHEN age_category = 'Last 30 days' THEN 1
-                        WHEN age_category = 'Last 90 days' THEN 2
-                        WHEN age_category = 'Last 6 months' THEN 3
-                        WHEN age_category = 'Last year' THEN 4
-                        ELSE 5
-                    END
-            ''')
-            age_stats = cursor.fetchall()
-        
-            if age_stats:
-                analytics += "EQUIPMENT AGE DISTRIBUTION (by creation date):\n"
-                analytics += f"{'Age Category':<20} {'Count':<10} {'Percentage':<12}\n"
-                analytics += "-" * 45 + "\n"
-            
-                total_with_dates = sum(count for _, count in age_stats)
-                for age_category, count in age_stats:
-                    percentage = count / total_with_dates * 100
-                    analytics += f"{age_category:<20} {count:<10} {percentage:<11.1f}%\n"
-                analytics += "\n"
-        
-            # Display analytics
-            overview_text.insert('end', analytics)
-            overview_text.config(state='disabled')
-        
-        except Exception as e:
-            print(f"Error generating equipment overview: {e}")
+            ) e
+            JOIN (VALUES (1, 'Last 30 days'), (2, 'Last 90 days'), (3, 'Last 6 months'),
+                         (4, 'Last year'), (5, 'Over 1 year')) as b(bucket, age_category)
+                USING (bucket)
+            GROUP BY b.bucket, b.age_category
+            ORDER BY b.bucket
+        ''')
+        age_stats = cursor.fetchall()
+
+        if age_stats:
+            parts.append("EQUIPMENT AGE DISTRIBUTION (by creation date):\n")
+            parts.append(f"{'Age Category':<20} {'Count':<10} {'Percentage':<12}\n")
+            parts.append("-" * 45 + "\n")
+
+            total_with_dates = sum(count for _, count in age_stats)
+            for age_category, count in age_stats:
+                percentage = count / total_with_dates * 100
+                parts.append(f"{age_category:<20} {count:<10} {percentage:<11.1f}%\n")
+            parts.append("\n")
+
+        return ''.join(parts)
 
     def generate_pm_performance_analysis(self, parent_frame):
         """Generate PM performance analytics"""
         try:
-            cursor = self.conn.cursor()
-            
             text_frame = ttk.Frame(parent_frame)
             text_frame.pack(fill='both', expand=True, padx=10, pady=10)
         
@@ -12861,128 +13942,127 @@ class AITCMMSSystem:
         
             pm_text.pack(side='left', fill='both', expand=True)
             scrollbar.pack(side='right', fill='y')
-        
-            analytics = "PM PERFORMANCE ANALYTICS\n"
-            analytics += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-            analytics += "=" * 80 + "\n\n"
-        
-            # PM completion statistics by type
-            cursor.execute('''
-                SELECT pm_type, COUNT(*) as count, 
-                    AVG(labor_hours + labor_minutes/60.0) as avg_hours,
-                    MIN(completion_date) as first_completion,
-                    MAX(completion_date) as last_completion
-                FROM pm_completions 
-                GROUP BY pm_type 
-                ORDER BY count DESC
-            ''')
-            pm_type_stats = cursor.fetchall()
-        
-            if pm_type_stats:
-                analytics += "PM COMPLETION STATISTICS BY TYPE:\n"
-                analytics += f"{'PM Type':<15} {'Count':<10} {'Avg Hours':<12} {'Date Range':<25}\n"
-                analytics += "-" * 65 + "\n"
-            
-                for pm_type, count, avg_hours, first_date, last_date in pm_type_stats:
-                    avg_hours_display = f"{avg_hours:.1f}h" if avg_hours else "N/A"
-                    date_range = f"{first_date} to {last_date}" if first_date and last_date else "N/A"
-                    analytics += f"{pm_type:<15} {count:<10} {avg_hours_display:<12} {date_range:<25}\n"
-                analytics += "\n"
-        
-            # Monthly completion trends (last 12 months)
-            cursor.execute('''
-                SELECT
-                    TO_CHAR(completion_date::date, 'YYYY-MM') as month,
-                    COUNT(*) as completions,
-                    AVG(labor_hours + labor_minutes/60.0) as avg_hours
-                FROM pm_completions
-                WHERE completion_date::date >= CURRENT_DATE - INTERVAL '12 months'
-                GROUP BY TO_CHAR(completion_date::date, 'YYYY-MM')
-                ORDER BY month DESC
-            ''')
-            monthly_trends = cursor.fetchall()
-        
-            if monthly_trends:
-                analytics += "MONTHLY PM COMPLETION TRENDS (Last 12 months):\n"
-                analytics += f"{'Month':<10} {'Completions':<12} {'Avg Hours':<12}\n"
-                analytics += "-" * 36 + "\n"
-            
-                for month, completions, avg_hours in monthly_trends:
-                    avg_hours_display = f"{avg_hours:.1f}h" if avg_hours else "0.0h"
-                    analytics += f"{month:<10} {completions:<12} {avg_hours_display:<12}\n"
-                analytics += "\n"
-        
-            # Equipment with overdue PMs
-            current_date = datetime.now()
-        
-            cursor.execute('''
-                SELECT e.bfm_equipment_no, e.description, e.location,
-                    e.last_monthly_pm, e.last_annual_pm,
-                    CASE
-                        WHEN e.last_monthly_pm IS NULL OR e.last_monthly_pm + INTERVAL '30 days' < CURRENT_DATE THEN 'Monthly Overdue'
-                        WHEN e.last_annual_pm IS NULL OR e.last_annual_pm + INTERVAL '365 days' < CURRENT_DATE THEN 'Annual Overdue'
-                        ELSE 'Current'
-                    END as pm_status
-                FROM equipment e
-                WHERE e.status = 'Active'
-                AND (
-                    (e.monthly_pm = 1 AND (e.last_monthly_pm IS NULL OR e.last_monthly_pm + INTERVAL '30 days' < CURRENT_DATE))
-                    OR
-                    (e.annual_pm = 1 AND (e.last_annual_pm IS NULL OR e.last_annual_pm + INTERVAL '365 days' < CURRENT_DATE))
-                )
-                ORDER BY e.bfm_equipment_no
-                LIMIT 25
-            ''')
-            overdue_equipment = cursor.fetchall()
-        
-            if overdue_equipment:
-                analytics += f"OVERDUE PM EQUIPMENT ({len(overdue_equipment)} items shown):\n"
-                analytics += f"{'BFM Number':<15} {'Description':<25} {'Location':<12} {'Status':<15}\n"
-                analytics += "-" * 70 + "\n"
-                
-                for bfm_no, description, location, pm_status in overdue_equipment:
-                    desc_short = (description[:22] + '...') if description and len(description) > 22 else (description or 'N/A')
-                    loc_short = (location[:9] + '...') if location and len(location) > 9 else (location or 'N/A')
-                    analytics += f"{bfm_no:<15} {desc_short:<25} {loc_short:<12} {pm_status:<15}\n"
-                analytics += "\n"
-        
-            # PM frequency analysis
-            cursor.execute('''
-                SELECT e.bfm_equipment_no, COUNT(pc.id) as pm_count,
-                    MIN(pc.completion_date) as first_pm,
-                    MAX(pc.completion_date) as last_pm,
-                    AVG(pc.labor_hours + pc.labor_minutes/60.0) as avg_hours
-                FROM equipment e
-                LEFT JOIN pm_completions pc ON e.bfm_equipment_no = pc.bfm_equipment_no
-                WHERE e.status = 'Active'
-                GROUP BY e.bfm_equipment_no
-                HAVING pm_count > 0
-                ORDER BY pm_count DESC
-                LIMIT 15
-            ''')
-            high_maintenance_equipment = cursor.fetchall()
-        
-            if high_maintenance_equipment:
-                analytics += "TOP 15 MOST SERVICED EQUIPMENT:\n"
-                analytics += f"{'BFM Number':<15} {'PM Count':<10} {'First PM':<12} {'Last PM':<12} {'Avg Hours':<10}\n"
-                analytics += "-" * 62 + "\n"
-            
-                for bfm_no, pm_count, first_pm, last_pm, avg_hours in high_maintenance_equipment:
-                    avg_hours_display = f"{avg_hours:.1f}h" if avg_hours else "0.0h"
-                    analytics += f"{bfm_no:<15} {pm_count:<10} {first_pm or 'N/A':<12} {last_pm or 'N/A':<12} {avg_hours_display:<10}\n"
-                analytics += "\n"
-        
-            pm_text.insert('end', analytics)
-            pm_text.config(state='disabled')
-        
+
+            self._fill_analytics_text(pm_text, 'pm_performance', self._build_pm_performance_analysis, 'PM performance analysis')
+
         except Exception as e:
             print(f"Error generating PM performance analysis: {e}")
 
+    def _build_pm_performance_analysis(self, cursor):
+        """PM performance analytics text (runs on a background worker - no Tk calls)"""
+        parts = ["PM PERFORMANCE ANALYTICS\n"]
+        parts.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        parts.append("=" * 80 + "\n\n")
+
+        # PM completion statistics by type
+        cursor.execute('''
+            SELECT pm_type, COUNT(*) as count, 
+                AVG(total_hours) as avg_hours,
+                MIN(completion_date) as first_completion,
+                MAX(completion_date) as last_completion
+            FROM pm_completions 
+            GROUP BY pm_type 
+            ORDER BY count DESC
+        ''')
+        pm_type_stats = cursor.fetchall()
+
+        if pm_type_stats:
+            parts.append("PM COMPLETION STATISTICS BY TYPE:\n")
+            parts.append(f"{'PM Type':<15} {'Count':<10} {'Avg Hours':<12} {'Date Range':<25}\n")
+            parts.append("-" * 65 + "\n")
+
+            for pm_type, count, avg_hours, first_date, last_date in pm_type_stats:
+                avg_hours_display = f"{avg_hours:.1f}h" if avg_hours else "N/A"
+                date_range = f"{first_date} to {last_date}" if first_date and last_date else "N/A"
+                parts.append(f"{pm_type:<15} {count:<10} {avg_hours_display:<12} {date_range:<25}\n")
+            parts.append("\n")
+
+        # Monthly completion trends (last 12 months, from the pm_completions_monthly rollup)
+        cursor.execute('''
+            SELECT
+                month,
+                SUM(completions) as completions,
+                SUM(labor_hours_sum) / NULLIF(SUM(labor_hours_count), 0) as avg_hours
+            FROM pm_completions_monthly
+            WHERE month >= TO_CHAR(CURRENT_DATE - INTERVAL '12 months', 'YYYY-MM')
+            GROUP BY month
+            ORDER BY month DESC
+        ''')
+        monthly_trends = cursor.fetchall()
+
+        if monthly_trends:
+            parts.append("MONTHLY PM COMPLETION TRENDS (Last 12 months):\n")
+            parts.append(f"{'Month':<10} {'Completions':<12} {'Avg Hours':<12}\n")
+            parts.append("-" * 36 + "\n")
+
+            for month, completions, avg_hours in monthly_trends:
+                avg_hours_display = f"{avg_hours or 0:.1f}h"
+                parts.append(f"{month:<10} {completions:<12} {avg_hours_display:<12}\n")
+            parts.append("\n")
+
+        # Equipment with overdue PMs
+        cursor.execute('''
+            SELECT e.bfm_equipment_no, e.description, e.location,
+                e.last_monthly_pm, e.last_annual_pm,
+                CASE
+                    WHEN e.last_monthly_pm IS NULL OR e.last_monthly_pm + INTERVAL '30 days' < CURRENT_DATE THEN 'Monthly Overdue'
+                    WHEN e.last_annual_pm IS NULL OR e.last_annual_pm + INTERVAL '365 days' < CURRENT_DATE THEN 'Annual Overdue'
+                    ELSE 'Current'
+                END as pm_status
+            FROM equipment e
+            WHERE e.status = 'Active'
+            AND (
+                (e.monthly_pm = 1 AND (e.last_monthly_pm IS NULL OR e.last_monthly_pm + INTERVAL '30 days' < CURRENT_DATE))
+                OR
+                (e.annual_pm = 1 AND (e.last_annual_pm IS NULL OR e.last_annual_pm + INTERVAL '365 days' < CURRENT_DATE))
+            )
+            ORDER BY e.bfm_equipment_no
+            LIMIT 25
+        ''')
+        overdue_equipment = cursor.fetchall()
+
+        if overdue_equipment:
+            parts.append(f"OVERDUE PM EQUIPMENT ({len(overdue_equipment)} items shown):\n")
+            parts.append(f"{'BFM Number':<15} {'Description':<25} {'Location':<12} {'Status':<15}\n")
+            parts.append("-" * 70 + "\n")
+
+            for bfm_no, description, location, pm_status in overdue_equipment:
+                desc_short = truncate_text(description, 22) or 'N/A'
+                loc_short = truncate_text(location, 9) or 'N/A'
+                parts.append(f"{bfm_no:<15} {desc_short:<25} {loc_short:<12} {pm_status:<15}\n")
+            parts.append("\n")
+
+        # PM frequency analysis
+        cursor.execute('''
+            SELECT e.bfm_equipment_no, COUNT(pc.id) as pm_count,
+                MIN(pc.completion_date) as first_pm,
+                MAX(pc.completion_date) as last_pm,
+                AVG(pc.total_hours) as avg_hours
+            FROM equipment e
+            LEFT JOIN pm_completions pc ON e.bfm_equipment_no = pc.bfm_equipment_no
+            WHERE e.status = 'Active'
+            GROUP BY e.bfm_equipment_no
+            HAVING pm_count > 0
+            ORDER BY pm_count DESC
+            LIMIT 15
+        ''')
+        high_maintenance_equipment = cursor.fetchall()
+
+        if high_maintenance_equipment:
+            parts.append("TOP 15 MOST SERVICED EQUIPMENT:\n")
+            parts.append(f"{'BFM Number':<15} {'PM Count':<10} {'First PM':<12} {'Last PM':<12} {'Avg Hours':<10}\n")
+            parts.append("-" * 62 + "\n")
+
+            for bfm_no, pm_count, first_pm, last_pm, avg_hours in high_maintenance_equipment:
+                avg_hours_display = f"{avg_hours or 0:.1f}h"
+                parts.append(f"{bfm_no:<15} {pm_count:<10} {first_pm or 'N/A':<12} {last_pm or 'N/A':<12} {avg_hours_display:<10}\n")
+            parts.append("\n")
+
+        return ''.join(parts)
+
     def generate_location_analysis(self, parent_frame):
         """Generate location-based analytics"""
         try:
-            cursor = self.conn.cursor()
-        
             text_frame = ttk.Frame(parent_frame)
             text_frame.pack(fill='both', expand=True, padx=10, pady=10)
         
@@ -12992,290 +14072,287 @@ class AITCMMSSystem:
         
             location_text.pack(side='left', fill='both', expand=True)
             scrollbar.pack(side='right', fill='y')
-        
-            analytics = "LOCATION-BASED ANALYTICS\n"
-            analytics += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-            analytics += "=" * 80 + "\n\n"
-        
-            # Equipment distribution by location
-            cursor.execute('''
-                SELECT 
-                    COALESCE(location, 'Unknown') as location,
-                    COUNT(*) as total_equipment,
-                    COUNT(CASE WHEN status = 'Active' THEN 1 END) as active,
-                    COUNT(CASE WHEN status = 'Missing' THEN 1 END) as missing,
-                    COUNT(CASE WHEN status = 'Run to Failure' THEN 1 END) as rtf
-                FROM equipment
-                GROUP BY COALESCE(location, 'Unknown')
-                ORDER BY total_equipment DESC
-            ''')
-            location_distribution = cursor.fetchall()
-        
-            if location_distribution:
-                analytics += "EQUIPMENT DISTRIBUTION BY LOCATION:\n"
-                analytics += f"{'Location':<20} {'Total':<8} {'Active':<8} {'Missing':<8} {'RTF':<8}\n"
-                analytics += "-" * 55 + "\n"
-            
-                for location, total, active, missing, rtf in location_distribution:
-                    loc_display = location[:17] + '...' if len(location) > 17 else location
-                    analytics += f"{loc_display:<20} {total:<8} {active:<8} {missing:<8} {rtf:<8}\n"
-                analytics += "\n"
-        
-            # PM completion activity by location
-            cursor.execute('''
-                SELECT 
-                    COALESCE(e.location, 'Unknown') as location,
-                    COUNT(pc.id) as total_pms,
-                    COUNT(CASE WHEN pc.pm_type = 'Monthly' THEN 1 END) as monthly,
-                    COUNT(CASE WHEN pc.pm_type = 'Annual' THEN 1 END) as annual,
-                    AVG(pc.labor_hours + pc.labor_minutes/60.0) as avg_hours
-                FROM pm_completions pc
-                JOIN equipment e ON pc.bfm_equipment_no = e.bfm_equipment_no
-                WHERE pc.completion_date >= CURRENT_DATE - INTERVAL '90 days'
-                GROUP BY COALESCE(e.location, 'Unknown')
-                ORDER BY total_pms DESC
-            ''')
-            location_pm_activity = cursor.fetchall()
-        
-            if location_pm_activity:
-                analytics += "PM ACTIVITY BY LOCATION (Last 90 days):\n"
-                analytics += f"{'Location':<20} {'Total PMs':<10} {'Monthly':<8} {'Annual':<8} {'Avg Hours':<10}\n"
-                analytics += "-" * 60 + "\n"
-            
-                for location, total_pms, monthly, annual, avg_hours in location_pm_activity:
-                    loc_display = location[:17] + '...' if len(location) > 17 else location
-                    avg_hours_display = f"{avg_hours:.1f}h" if avg_hours else "0.0h"
-                    analytics += f"{loc_display:<20} {total_pms:<10} {monthly:<8} {annual:<8} {avg_hours_display:<10}\n"
-                analytics += "\n"
-        
-            # Cannot Find assets by location
-            cursor.execute('''
+
+            self._fill_analytics_text(location_text, 'location', self._build_location_analysis, 'location analysis')
+
+        except Exception as e:
+            print(f"Error generating location analysis: {e}")
+
+    def _build_location_analysis(self, cursor):
+        """Location-based analytics text (runs on a background worker - no Tk calls)"""
+        parts = ["LOCATION-BASED ANALYTICS\n"]
+        parts.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        parts.append("=" * 80 + "\n\n")
+
+        # Equipment distribution by location
+        cursor.execute('''
+            SELECT 
+                COALESCE(location, 'Unknown') as location,
+                COUNT(*) as total_equipment,
+                COUNT(CASE WHEN status = 'Active' THEN 1 END) as active,
+                COUNT(CASE WHEN status = 'Missing' THEN 1 END) as missing,
+                COUNT(CASE WHEN status = 'Run to Failure' THEN 1 END) as rtf
+            FROM equipment
+            GROUP BY COALESCE(location, 'Unknown')
+            ORDER BY total_equipment DESC
+        ''')
+        location_distribution = cursor.fetchall()
+
+        if location_distribution:
+            parts.append("EQUIPMENT DISTRIBUTION BY LOCATION:\n")
+            parts.append(f"{'Location':<20} {'Total':<8} {'Active':<8} {'Missing':<8} {'RTF':<8}\n")
+            parts.append("-" * 55 + "\n")
+
+            for location, total, active, missing, rtf in location_distribution:
+                loc_display = truncate_text(location, 17)
+                parts.append(f"{loc_display:<20} {total:<8} {active:<8} {missing:<8} {rtf:<8}\n")
+            parts.append("\n")
+
+        # PM completion activity by location
+        cursor.execute('''
+            SELECT 
+                COALESCE(e.location, 'Unknown') as location,
+                COUNT(pc.id) as total_pms,
+                COUNT(CASE WHEN pc.pm_type = 'Monthly' THEN 1 END) as monthly,
+                COUNT(CASE WHEN pc.pm_type = 'Annual' THEN 1 END) as annual,
+                AVG(pc.total_hours) as avg_hours
+            FROM pm_completions pc
+            JOIN equipment e ON pc.bfm_equipment_no = e.bfm_equipment_no
+            WHERE pc.completion_date >= CURRENT_DATE - INTERVAL '90 days'
+            GROUP BY COALESCE(e.location, 'Unknown')
+            ORDER BY total_pms DESC
+        ''')
+        location_pm_activity = cursor.fetchall()
+
+        if location_pm_activity:
+            parts.append("PM ACTIVITY BY LOCATION (Last 90 days):\n")
+            parts.append(f"{'Location':<20} {'Total PMs':<10} {'Monthly':<8} {'Annual':<8} {'Avg Hours':<10}\n")
+            parts.append("-" * 60 + "\n")
+
+            for location, total_pms, monthly, annual, avg_hours in location_pm_activity:
+                loc_display = truncate_text(location, 17)
+                avg_hours_display = f"{avg_hours or 0:.1f}h"
+                parts.append(f"{loc_display:<20} {total_pms:<10} {monthly:<8} {annual:<8} {avg_hours_display:<10}\n")
+            parts.append("\n")
+
+        # Cannot Find assets by location (equipment list truncated for the column server-side)
+        cursor.execute('''
+            SELECT location, missing_count,
+                CASE WHEN length(missing_assets) > 47 THEN left(missing_assets, 47) || '...'
+                     ELSE COALESCE(missing_assets, '') END
+            FROM (
                 SELECT 
                     COALESCE(location, 'Unknown') as location,
                     COUNT(*) as missing_count,
-                    GROUP_CONCAT(bfm_equipment_no, ', ') as missing_assets
+                    STRING_AGG(bfm_equipment_no, ', ' ORDER BY bfm_equipment_no) as missing_assets
                 FROM cannot_find_assets
                 WHERE status = 'Missing'
                 GROUP BY COALESCE(location, 'Unknown')
-                ORDER BY missing_count DESC
-            ''')
-            missing_by_location = cursor.fetchall()
-        
-            if missing_by_location:
-                analytics += "MISSING ASSETS BY LOCATION:\n"
-                analytics += f"{'Location':<20} {'Count':<8} {'Equipment Numbers':<50}\n"
-                analytics += "-" * 80 + "\n"
-            
-                for location, count, assets in missing_by_location:
-                    loc_display = location[:17] + '...' if len(location) > 17 else location
-                    assets_display = assets[:47] + '...' if assets and len(assets) > 47 else (assets or '')
-                    analytics += f"{loc_display:<20} {count:<8} {assets_display:<50}\n"
-                analytics += "\n"
-        
-            # Location efficiency analysis
-            cursor.execute('''
-                SELECT 
-                    COALESCE(e.location, 'Unknown') as location,
-                    COUNT(DISTINCT e.bfm_equipment_no) as equipment_count,
-                    COUNT(pc.id) as pm_completions,
-                    ROUND(CAST(COUNT(pc.id) AS FLOAT) / COUNT(DISTINCT e.bfm_equipment_no), 2) as pms_per_equipment
-                FROM equipment e
-                LEFT JOIN pm_completions pc ON e.bfm_equipment_no = pc.bfm_equipment_no
-                    AND pc.completion_date >= CURRENT_DATE - INTERVAL '365 days'
-                WHERE e.status = 'Active'
-                GROUP BY COALESCE(e.location, 'Unknown')
-                HAVING equipment_count >= 3
-                ORDER BY pms_per_equipment DESC
-            ''')
-            location_efficiency = cursor.fetchall()
-        
-            if location_efficiency:
-                analytics += "LOCATION PM EFFICIENCY (PMs per equipment, last year):\n"
-                analytics += f"{'Location':<20} {'Equipment':<10} {'PMs':<8} {'PMs/Equipment':<15}\n"
-                analytics += "-" * 55 + "\n"
-                
-                for location, equipment_count, pm_completions, pms_per_equipment in location_efficiency:
-                    loc_display = location[:17] + '...' if len(location) > 17 else location
-                    analytics += f"{loc_display:<20} {equipment_count:<10} {pm_completions:<8} {pms_per_equipment:<15}\n"
-                analytics += "\n"
-        
-            location_text.insert('end', analytics)
-            location_text.config(state='disabled')
-        
-        except Exception as e:
-            print(f"Error generating location analysis: {e}")
+            ) m
+            ORDER BY missing_count DESC
+        ''')
+        missing_by_location = cursor.fetchall()
 
-    def generate_technician_analysis(self, parent_frame):
-        """Generate technician workload and performance analytics"""
-        try:
-            cursor = self.conn.cursor()
-        
-            text_frame = ttk.Frame(parent_frame)
-            text_frame.pack(fill='both', expand=True, padx=10, pady=10)
-        
-            tech_text = tk.Text(text_frame, wrap='word', font=('Courier', 10))
-            scrollbar = ttk.Scrollbar(text_frame, orient='vertical', command=tech_text.yview)
-            tech_text.configure(yscrollcommand=scrollbar.set)
-        
-            tech_text.pack(side='left', fill='both', expand=True)
-            scrollbar.pack(side='right', fill='y')
-        
-            analytics = "TECHNICIAN PERFORMANCE ANALYTICS\n"
-            analytics += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-            analytics += "=" * 80 + "\n\n"
-        
-            # Overall technician performance
-            cursor.execute('''
-                SELECT 
-                    technician_name,
-                    COUNT(*) as total_pms,
-                    COUNT(CASE WHEN pm_type = 'Monthly' THEN 1 END) as monthly_pms,
-                    COUNT(CASE WHEN pm_type = 'Annual' THEN 1 END) as annual_pms,
-                    AVG(labor_hours + labor_minutes/60.0) as avg_hours,
-                    SUM(labor_hours + labor_minutes/60.0) as total_hours,
-                    MIN(completion_date) as first_completion,
-                    MAX(completion_date) as last_completion
-                FROM pm_completions
-                GROUP BY technician_name
-                ORDER BY total_pms DESC
-            ''')
-            technician_performance = cursor.fetchall()
-        
-            if technician_performance:
-                analytics += "OVERALL TECHNICIAN PERFORMANCE:\n"
-                analytics += f"{'Technician':<20} {'Total PMs':<10} {'Monthly':<8} {'Annual':<8} {'Avg Hrs':<8} {'Total Hrs':<10}\n"
-                analytics += "-" * 75 + "\n"
-            
-                for tech_data in technician_performance:
-                    technician, total_pms, monthly, annual, avg_hours, total_hours, first_date, last_date = tech_data
-                    tech_display = technician[:17] + '...' if len(technician) > 17 else technician
-                    avg_hours_display = f"{avg_hours:.1f}" if avg_hours else "0.0"
-                    total_hours_display = f"{total_hours:.1f}" if total_hours else "0.0"
-                
-                    analytics += f"{tech_display:<20} {total_pms:<10} {monthly:<8} {annual:<8} {avg_hours_display:<8} {total_hours_display:<10}\n"
-                analytics += "\n"
-        
-            # Recent activity (last 30 days)
-            cursor.execute('''
-                SELECT 
-                    technician_name,
-                    COUNT(*) as recent_pms,
-                    AVG(labor_hours + labor_minutes/60.0) as avg_hours,
-                    COUNT(DISTINCT bfm_equipment_no) as unique_equipment
-                FROM pm_completions
-                WHERE completion_date >= CURRENT_DATE - INTERVAL '30 days'
-                GROUP BY technician_name
-                ORDER BY recent_pms DESC
-            ''')
-            recent_activity = cursor.fetchall()
-        
-            if recent_activity:
-                analytics += "RECENT ACTIVITY (Last 30 days):\n"
-                analytics += f"{'Technician':<20} {'PMs':<6} {'Avg Hours':<10} {'Unique Equipment':<18}\n"
-                analytics += "-" * 56 + "\n"
-            
-                for technician, recent_pms, avg_hours, unique_equipment in recent_activity:
-                    tech_display = technician[:17] + '...' if len(technician) > 17 else technician
-                    avg_hours_display = f"{avg_hours:.1f}h" if avg_hours else "0.0h"
-                
-                    analytics += f"{tech_display:<20} {recent_pms:<6} {avg_hours_display:<10} {unique_equipment:<18}\n"
-                analytics += "\n"
-        
-            # Cannot Find reports by technician
-            cursor.execute('''
-                SELECT
-                    technician_name,
-                    COUNT(*) as cannot_find_count,
-                    COUNT(CASE WHEN reported_date >= CURRENT_DATE - INTERVAL '30 days' THEN 1 END) as recent_cf
-                FROM cannot_find_assets
-                WHERE status = 'Missing'
-                GROUP BY technician_name
-                ORDER BY cannot_find_count DESC
-            ''')
-            cannot_find_by_tech = cursor.fetchall()
-        
-            if cannot_find_by_tech:
-                analytics += "CANNOT FIND REPORTS BY TECHNICIAN:\n"
-                analytics += f"{'Technician':<20} {'Total CF':<10} {'Recent (30d)':<15}\n"
-                analytics += "-" * 47 + "\n"
-            
-                for technician, total_cf, recent_cf in cannot_find_by_tech:
-                    tech_display = technician[:17] + '...' if len(technician) > 17 else technician
-                    analytics += f"{tech_display:<20} {total_cf:<10} {recent_cf:<15}\n"
-                analytics += "\n"
-        
-            # Workload distribution analysis
-            cursor.execute('''
-                SELECT
-                    technician_name,
-                    TO_CHAR(completion_date::date, 'YYYY-MM') as month,
-                    COUNT(*) as monthly_completions,
-                    AVG(labor_hours + labor_minutes/60.0) as avg_hours
-                FROM pm_completions
-                WHERE completion_date::date >= CURRENT_DATE - INTERVAL '6 months'
-                GROUP BY technician_name, TO_CHAR(completion_date::date, 'YYYY-MM')
-                ORDER BY technician_name, month DESC
-            ''')
-            monthly_workload = cursor.fetchall()
-        
-            if monthly_workload:
-                analytics += "MONTHLY WORKLOAD DISTRIBUTION (Last 6 months):\n"
-            
-                # Group by technician
-                tech_monthly = {}
-                for technician, month, completions, avg_hours in monthly_workload:
-                    if technician not in tech_monthly:
-                        tech_monthly[technician] = []
-                    tech_monthly[technician].append((month, completions, avg_hours))
-            
-                for technician, monthly_data in tech_monthly.items():
-                    tech_display = technician[:17] + '...' if len(technician) > 17 else technician
-                    analytics += f"\n{tech_display}:\n"
-                    analytics += f"{'  Month':<12} {'PMs':<6} {'Avg Hours':<10}\n"
-                    analytics += "  " + "-" * 30 + "\n"
-                
-                    for month, completions, avg_hours in monthly_data[:6]:  # Show last 6 months
-                        avg_hours_display = f"{avg_hours:.1f}h" if avg_hours else "0.0h"
-                        analytics += f"  {month:<12} {completions:<6} {avg_hours_display:<10}\n"
-                analytics += "\n"
-        
-            # Efficiency metrics
-            if technician_performance:
-                analytics += "TECHNICIAN EFFICIENCY METRICS:\n"
-                analytics += f"{'Technician':<20} {'PMs/Month':<12} {'Hours/PM':<10} {'Productivity':<12}\n"
-                analytics += "-" * 60 + "\n"
-            
-                for tech_data in technician_performance:
-                    technician, total_pms, monthly, annual, avg_hours, total_hours, first_date, last_date = tech_data
-                
-                    # Calculate months active (rough estimate)
-                    if first_date and last_date:
-                        try:
-                            first_dt = datetime.strptime(first_date, '%Y-%m-%d')
-                            last_dt = datetime.strptime(last_date, '%Y-%m-%d')
-                            months_active = max(1, (last_dt - first_dt).days / 30.44)  # Average days per month
-                            pms_per_month = total_pms / months_active
-                        except:
-                            months_active = 1
-                            pms_per_month = total_pms
-                    else:
-                        pms_per_month = total_pms
-                
-                    hours_per_pm = avg_hours if avg_hours else 0
-                
-                    # Productivity score (PMs per month / hours per PM)
-                    productivity = pms_per_month / max(hours_per_pm, 0.1) if hours_per_pm > 0 else pms_per_month
-                    
-                    tech_display = technician[:17] + '...' if len(technician) > 17 else technician
-                    analytics += f"{tech_display:<20} {pms_per_month:<11.1f} {hours_per_pm:<9.1f} {productivity:<11.1f}\n"
-                analytics += "\n"
+        if missing_by_location:
+            parts.append("MISSING ASSETS BY LOCATION:\n")
+            parts.append(f"{'Location':<20} {'Count':<8} {'Equipment Numbers':<50}\n")
+            parts.append("-" * 80 + "\n")
+
+            for location, count, assets_display in missing_by_location:
+                loc_display = truncate_text(location, 17)
+                parts.append(f"{loc_display:<20} {count:<8} {assets_display:<50}\n")
+            parts.append("\n")
+
+        # Location efficiency analysis
+        cursor.execute('''
+            SELECT 
+                COALESCE(e.location, 'Unknown') as location,
+                COUNT(DISTINCT e.bfm_equipment_no) as equipment_count,
+                COUNT(pc.id) as pm_completions,
+                ROUND(CAST(COUNT(pc.id) AS FLOAT) / COUNT(DISTINCT e.bfm_equipment_no), 2) as pms_per_equipment
+            FROM equipment e
+            LEFT JOIN pm_completions pc ON e.bfm_equipment_no = pc.bfm_equipment_no
+                AND pc.completion_date >= CURRENT_DATE - INTERVAL '365 days'
+            WHERE e.status = 'Active'
+            GROUP BY COALESCE(e.location, 'Unknown')
+            HAVING equipment_count >= 3
+            ORDER BY pms_per_equipment DESC
+        ''')
+        location_efficiency = cursor.fetchall()
+
+        if location_efficiency:
+            parts.append("LOCATION PM EFFICIENCY (PMs per equipment, last year):\n")
+            parts.append(f"{'Location':<20} {'Equipment':<10} {'PMs':<8} {'PMs/Equipment':<15}\n")
+            parts.append("-" * 55 + "\n")
+
+            for location, equipment_count, pm_completions, pms_per_equipment in location_efficiency:
+                loc_display = truncate_text(location, 17)
+                parts.append(f"{loc_display:<20} {equipment_count:<10} {pm_completions:<8} {pms_per_equipment:<15}\n")
+            parts.append("\n")
+
+        return ''.join(parts)
+
+    def generate_technician_analysis(self, parent_frame):
+        """Generate technician workload and performance analytics"""
+        try:
+            text_frame = ttk.Frame(parent_frame)
+            text_frame.pack(fill='both', expand=True, padx=10, pady=10)
         
-            tech_text.insert('end', analytics)
-            tech_text.config(state='disabled')
+            tech_text = tk.Text(text_frame, wrap='word', font=('Courier', 10))
+            scrollbar = ttk.Scrollbar(text_frame, orient='vertical', command=tech_text.yview)
+            tech_text.configure(yscrollcommand=scrollbar.set)
         
+            tech_text.pack(side='left', fill='both', expand=True)
+            scrollbar.pack(side='right', fill='y')
+
+            self._fill_analytics_text(tech_text, 'technician', self._build_technician_analysis, 'technician analysis')
+
         except Exception as e:
             print(f"Error generating technician analysis: {e}")
     
+    def _build_technician_analysis(self, cursor):
+        """Technician workload and performance analytics text (runs on a background worker - no Tk calls)"""
+        parts = ["TECHNICIAN PERFORMANCE ANALYTICS\n"]
+        parts.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        parts.append("=" * 80 + "\n\n")
+
+        # Overall technician performance, with the efficiency metrics computed in the
+        # same pass: PMs per month over the months active (first to last completion,
+        # at least one) and productivity as PMs per month per average hour
+        cursor.execute('''
+            SELECT
+                technician_name, total_pms, monthly_pms, annual_pms, avg_hours, total_hours,
+                pms_per_month,
+                CASE WHEN avg_hours > 0 THEN pms_per_month / GREATEST(avg_hours, 0.1)
+                     ELSE pms_per_month END as productivity
+            FROM (
+                SELECT 
+                    technician_name,
+                    COUNT(*) as total_pms,
+                    COUNT(CASE WHEN pm_type = 'Monthly' THEN 1 END) as monthly_pms,
+                    COUNT(CASE WHEN pm_type = 'Annual' THEN 1 END) as annual_pms,
+                    AVG(total_hours) as avg_hours,
+                    SUM(total_hours) as total_hours,
+                    COUNT(*) / GREATEST(1, (MAX(completion_date::date) - MIN(completion_date::date)) / 30.44) as pms_per_month
+                FROM pm_completions
+                GROUP BY technician_name
+            ) t
+            ORDER BY total_pms DESC
+        ''')
+        technician_performance = cursor.fetchall()
+
+        if technician_performance:
+            parts.append("OVERALL TECHNICIAN PERFORMANCE:\n")
+            parts.append(f"{'Technician':<20} {'Total PMs':<10} {'Monthly':<8} {'Annual':<8} {'Avg Hrs':<8} {'Total Hrs':<10}\n")
+            parts.append("-" * 75 + "\n")
+
+            for tech_data in technician_performance:
+                technician, total_pms, monthly, annual, avg_hours, total_hours, pms_per_month, productivity = tech_data
+                tech_display = truncate_text(technician, 17)
+                avg_hours_display = f"{avg_hours or 0:.1f}"
+                total_hours_display = f"{total_hours or 0:.1f}"
+
+                parts.append(f"{tech_display:<20} {total_pms:<10} {monthly:<8} {annual:<8} {avg_hours_display:<8} {total_hours_display:<10}\n")
+            parts.append("\n")
+
+        # Recent activity (last 30 days)
+        cursor.execute('''
+            SELECT 
+                technician_name,
+                COUNT(*) as recent_pms,
+                AVG(total_hours) as avg_hours,
+                COUNT(DISTINCT bfm_equipment_no) as unique_equipment
+            FROM pm_completions
+            WHERE completion_date >= CURRENT_DATE - INTERVAL '30 days'
+            GROUP BY technician_name
+            ORDER BY recent_pms DESC
+        ''')
+        recent_activity = cursor.fetchall()
+
+        if recent_activity:
+            parts.append("RECENT ACTIVITY (Last 30 days):\n")
+            parts.append(f"{'Technician':<20} {'PMs':<6} {'Avg Hours':<10} {'Unique Equipment':<18}\n")
+            parts.append("-" * 56 + "\n")
+
+            for technician, recent_pms, avg_hours, unique_equipment in recent_activity:
+                tech_display = truncate_text(technician, 17)
+                avg_hours_display = f"{avg_hours or 0:.1f}h"
+
+                parts.append(f"{tech_display:<20} {recent_pms:<6} {avg_hours_display:<10} {unique_equipment:<18}\n")
+            parts.append("\n")
+
+        # Cannot Find reports by technician
+        cursor.execute('''
+            SELECT
+                technician_name,
+                COUNT(*) as cannot_find_count,
+                COUNT(CASE WHEN reported_date >= CURRENT_DATE - INTERVAL '30 days' THEN 1 END) as recent_cf
+            FROM cannot_find_assets
+            WHERE status = 'Missing'
+            GROUP BY technician_name
+            ORDER BY cannot_find_count DESC
+        ''')
+        cannot_find_by_tech = cursor.fetchall()
+
+        if cannot_find_by_tech:
+            parts.append("CANNOT FIND REPORTS BY TECHNICIAN:\n")
+            parts.append(f"{'Technician':<20} {'Total CF':<10} {'Recent (30d)':<15}\n")
+            parts.append("-" * 47 + "\n")
+
+            for technician, total_cf, recent_cf in cannot_find_by_tech:
+                tech_display = truncate_text(technician, 17)
+                parts.append(f"{tech_display:<20} {total_cf:<10} {recent_cf:<15}\n")
+            parts.append("\n")
+
+        # Workload distribution analysis
+        cursor.execute('''
+            SELECT
+                NULLIF(technician_name, '') as technician_name,
+                month,
+                SUM(completions) as monthly_completions,
+                SUM(labor_hours_sum) / NULLIF(SUM(labor_hours_count), 0) as avg_hours
+            FROM pm_completions_monthly
+            WHERE month >= TO_CHAR(CURRENT_DATE - INTERVAL '6 months', 'YYYY-MM')
+            GROUP BY technician_name, month
+            ORDER BY technician_name, month DESC
+        ''')
+        monthly_workload = cursor.fetchall()
+
+        if monthly_workload:
+            parts.append("MONTHLY WORKLOAD DISTRIBUTION (Last 6 months):\n")
+
+            # Group by technician
+            tech_monthly = {}
+            for technician, month, completions, avg_hours in monthly_workload:
+                if technician not in tech_monthly:
+                    tech_monthly[technician] = []
+                tech_monthly[technician].append((month, completions, avg_hours))
+
+            for technician, monthly_data in tech_monthly.items():
+                tech_display = truncate_text(technician, 17)
+                parts.append(f"\n{tech_display}:\n")
+                parts.append(f"{'  Month':<12} {'PMs':<6} {'Avg Hours':<10}\n")
+                parts.append("  " + "-" * 30 + "\n")
+
+                for month, completions, avg_hours in monthly_data[:6]:  # Show last 6 months
+                    avg_hours_display = f"{avg_hours or 0:.1f}h"
+                    parts.append(f"  {month:<12} {completions:<6} {avg_hours_display:<10}\n")
+            parts.append("\n")
+
+        # Efficiency metrics
+        if technician_performance:
+            parts.append("TECHNICIAN EFFICIENCY METRICS:\n")
+            parts.append(f"{'Technician':<20} {'PMs/Month':<12} {'Hours/PM':<10} {'Productivity':<12}\n")
+            parts.append("-" * 60 + "\n")
+
+            for technician, total_pms, monthly, annual, avg_hours, total_hours, pms_per_month, productivity in technician_performance:
+                hours_per_pm = avg_hours if avg_hours else 0
+                tech_display = truncate_text(technician, 17)
+                parts.append(f"{tech_display:<20} {pms_per_month:<11.1f} {hours_per_pm:<9.1f} {productivity:<11.1f}\n")
+            parts.append("\n")
+
+        return ''.join(parts)
+
     def export_equipment_analytics_pdf(self, parent_dialog):
         """Export all analytics to a comprehensive PDF report"""
         try:
@@ -13298,20 +14375,17 @@ class AITCMMSSystem:
             story.append(Paragraph(f"Report ID: {timestamp}", styles['Normal']))
             story.append(Spacer(1, 40))
         
-            # Executive Summary
+            # Executive Summary - all four figures in one round-trip
             cursor = self.conn.cursor()
         
-            cursor.execute('SELECT COUNT(*) FROM equipment')
-            total_equipment = cursor.fetchone()[0]
-        
-            cursor.execute("SELECT COUNT(*) FROM equipment WHERE status = 'Active'")
-            active_equipment = cursor.fetchone()[0]
-        
-            cursor.execute("SELECT COUNT(*) FROM pm_completions WHERE completion_date >= CURRENT_DATE - INTERVAL '30 days'")
-            recent_pms = cursor.fetchone()[0]
-        
-            cursor.execute("SELECT COUNT(*) FROM cannot_find_assets WHERE status = 'Missing'")
-            missing_assets = cursor.fetchone()[0]
+            cursor.execute('''
+                SELECT 
+                    (SELECT COUNT(*) FROM equipment),
+                    (SELECT COUNT(*) FROM equipment WHERE status = 'Active'),
+                    (SELECT COUNT(*) FROM pm_completions WHERE completion_date >= CURRENT_DATE - INTERVAL '30 days'),
+                    (SELECT COUNT(*) FROM cannot_find_assets WHERE status = 'Missing')
+            ''')
+            total_equipment, active_equipment, recent_pms, missing_assets = cursor.fetchone()
         
             story.append(Paragraph("EXECUTIVE SUMMARY", styles['Heading1']))
             summary_data = [
@@ -13358,39 +14432,50 @@ class AITCMMSSystem:
             
                 story.append(PageBreak())
         
-            # Build PDF
-            doc.build(story)
-        
-            messagebox.showinfo("Success", f"Analytics report exported to: {filename}")
-            self.update_status(f"Equipment analytics exported to {filename}")
+            def done(result):
+                messagebox.showinfo("Success", f"Analytics report exported to: {filename}")
+                self.update_status(f"Equipment analytics exported to {filename}")
+
+            # Rendering runs on the background executor; dialogs come back on the Tk thread
+            self.update_status("Building equipment analytics PDF...")
+            self.run_in_background(
+                lambda: doc.build(story),
+                done,
+                lambda e: messagebox.showerror("Error", f"Failed to export analytics: {str(e)}")
+            )
         
         except Exception as e:
             messagebox.showerror("Error", f"Failed to export analytics: {str(e)}")
 
     def get_equipment_overview_text(self):
         """Get equipment overview text for PDF export"""
+        cached = self._cached_analytics('pdf_equipment_overview')
+        if cached:
+            return cached
+
         try:
             cursor = self.conn.cursor()
         
-            # Basic statistics
-            cursor.execute('SELECT COUNT(*) FROM equipment')
-            total_equipment = cursor.fetchone()[0]
-        
-            cursor.execute("SELECT COUNT(*) FROM equipment WHERE status = 'Active'")
-            active_equipment = cursor.fetchone()[0]
+            # Basic statistics and PM requirements in one pass over equipment
+            cursor.execute('''
+                SELECT 
+                    COUNT(*),
+                    COUNT(*) FILTER (WHERE status = 'Active'),
+                    COUNT(*) FILTER (WHERE monthly_pm = 1),
+                    COUNT(*) FILTER (WHERE annual_pm = 1)
+                FROM equipment
+            ''')
+            total_equipment, active_equipment, monthly_count, annual_count = cursor.fetchone()
         
-            text = f"Total Equipment: {total_equipment}\n"
-            text += f"Active Equipment: {active_equipment} ({active_equipment/total_equipment*100:.1f}%)\n\n"
+            parts = [f"Total Equipment: {total_equipment}\n"]
+            parts.append(f"Active Equipment: {active_equipment} ({active_equipment/total_equipment*100:.1f}%)\n\n")
         
             # PM requirements
-            cursor.execute('SELECT COUNT(*) FROM equipment WHERE monthly_pm = 1')
-            monthly_count = cursor.fetchone()[0]
-            text += f"Equipment requiring Monthly PM: {monthly_count}\n"
-        
-            cursor.execute('SELECT COUNT(*) FROM equipment WHERE annual_pm = 1')
-            annual_count = cursor.fetchone()[0]
-            text += f"Equipment requiring Annual PM: {annual_count}\n"
+            parts.append(f"Equipment requiring Monthly PM: {monthly_count}\n")
+            parts.append(f"Equipment requiring Annual PM: {annual_count}\n")
         
+            text = ''.join(parts)
+            self._analytics_cache['pdf_equipment_overview'] = (time.monotonic(), text)
             return text
         
         except Exception as e:
@@ -13398,16 +14483,22 @@ class AITCMMSSystem:
 
     def get_pm_performance_text(self):
         """Get PM performance text for PDF export"""
+        cached = self._cached_analytics('pdf_pm_performance')
+        if cached:
+            return cached
+
         try:
             cursor = self.conn.cursor()
         
             cursor.execute('SELECT pm_type, COUNT(*) FROM pm_completions GROUP BY pm_type')
             pm_stats = cursor.fetchall()
         
-            text = "PM Completion Statistics:\n"
+            parts = ["PM Completion Statistics:\n"]
             for pm_type, count in pm_stats:
-                text += f"{pm_type}: {count} completions\n"
+                parts.append(f"{pm_type}: {count} completions\n")
         
+            text = ''.join(parts)
+            self._analytics_cache['pdf_pm_performance'] = (time.monotonic(), text)
             return text
         
         except Exception as e:
@@ -13415,6 +14506,10 @@ class AITCMMSSystem:
 
     def get_location_analysis_text(self):
         """Get location analysis text for PDF export"""
+        cached = self._cached_analytics('pdf_location')
+        if cached:
+            return cached
+
         try:
             cursor = self.conn.cursor()
         
@@ -13428,10 +14523,12 @@ class AITCMMSSystem:
             ''')
             location_stats = cursor.fetchall()
         
-            text = "Equipment by Location:\n"
+            parts = ["Equipment by Location:\n"]
             for location, count in location_stats:
-                text += f"{location}: {count} assets\n"
+                parts.append(f"{location}: {count} assets\n")
         
+            text = ''.join(parts)
+            self._analytics_cache['pdf_location'] = (time.monotonic(), text)
             return text
         
         except Exception as e:
@@ -13439,6 +14536,10 @@ class AITCMMSSystem:
 
     def get_technician_analysis_text(self):
         """Get technician analysis text for PDF export"""
+        cached = self._cached_analytics('pdf_technician')
+        if cached:
+            return cached
+
         try:
             cursor = self.conn.cursor()
             
@@ -13450,10 +14551,12 @@ class AITCMMSSystem:
             ''')
             tech_stats = cursor.fetchall()
         
-            text = "PM Completions by Technician:\n"
+            parts = ["PM Completions by Technician:\n"]
             for technician, count in tech_stats:
-                text += f"{technician}: {count} PMs completed\n"
+                parts.append(f"{technician}: {count} PMs completed\n")
         
+            text = ''.join(parts)
+            self._analytics_cache['pdf_technician'] = (time.monotonic(), text)
             return text
         
         except Exception as e:
@@ -13513,8 +14616,6 @@ class AITCMMSSystem:
     def generate_monthly_trends_analysis(self, parent_frame):
         """Generate monthly PM completion trends analysis"""
         try:
-            cursor = self.conn.cursor()
-
             # Create scrollable frame
             canvas = tk.Canvas(parent_frame)
             scrollbar = ttk.Scrollbar(parent_frame, orient="vertical", command=canvas.yview)
@@ -13528,152 +14629,11 @@ class AITCMMSSystem:
             canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
             canvas.configure(yscrollcommand=scrollbar.set)
 
-            # Monthly completion data (last 24 months)
-            cursor.execute('''
-                SELECT
-                    TO_CHAR(completion_date::date, 'YYYY-MM') as month,
-                    COUNT(*) as total_completions,
-                    COUNT(CASE WHEN pm_type = 'Monthly' THEN 1 END) as monthly_pms,
-                    COUNT(CASE WHEN pm_type = 'Annual' THEN 1 END) as annual_pms,
-                    COUNT(CASE WHEN pm_type = 'Six Month' THEN 1 END) as six_month_pms,
-                    AVG(labor_hours + labor_minutes/60.0) as avg_hours,
-                    COUNT(DISTINCT technician_name) as active_technicians,
-                    COUNT(DISTINCT bfm_equipment_no) as unique_equipment
-                FROM pm_completions
-                WHERE completion_date::date >= CURRENT_DATE - INTERVAL '24 months'
-                GROUP BY TO_CHAR(completion_date::date, 'YYYY-MM')
-                ORDER BY month ASC
-            ''')
-
-            monthly_data = cursor.fetchall()
-
             # Create text display for trends
             trends_text = tk.Text(scrollable_frame, wrap='word', font=('Courier', 10), height=40)
             text_scrollbar = ttk.Scrollbar(scrollable_frame, orient='vertical', command=trends_text.yview)
             trends_text.configure(yscrollcommand=text_scrollbar.set)
 
-            # Generate trends report
-            report = "PM COMPLETION TRENDS ANALYSIS\n"
-            report += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-            report += "=" * 80 + "\n\n"
-
-            if monthly_data:
-                report += "MONTHLY COMPLETION TRENDS (Last 24 months):\n"
-                report += "-" * 80 + "\n"
-                report += f"{'Month':<10} {'Total':<8} {'Monthly':<8} {'Annual':<8} {'6-Month':<8} {'Avg Hrs':<8} {'Techs':<6} {'Equipment':<10}\n"
-                report += "-" * 80 + "\n"
-
-                total_completions = 0
-                total_hours = 0
-                peak_month = None
-                peak_completions = 0
-                lowest_month = None
-                lowest_completions = float('inf')
-
-                for month_data in monthly_data:
-                    month, total, monthly_pms, annual_pms, six_month_pms, avg_hours, techs, equipment = month_data
-                    total_completions += total
-                    total_hours += avg_hours if avg_hours else 0
-
-                    # Track peak and low months
-                    if total > peak_completions:
-                        peak_completions = total
-                        peak_month = month
-                    if total < lowest_completions:
-                        lowest_completions = total
-                        lowest_month = month
-
-                    avg_hours_str = f"{avg_hours:.1f}" if avg_hours else "0.0"
-                    report += f"{month:<10} {total:<8} {monthly_pms:<8} {annual_pms:<8} {six_month_pms:<8} {avg_hours_str:<8} {techs:<6} {equipment:<10}\n"
-
-                # Calculate trends
-                avg_monthly_completions = total_completions / len(monthly_data) if monthly_data else 0
-                avg_hours_overall = total_hours / len(monthly_data) if monthly_data else 0
-
-                # Recent trend analysis (last 6 months vs previous 6 months)
-                recent_6_months = monthly_data[-6:] if len(monthly_data) >= 6 else monthly_data
-                previous_6_months = monthly_data[-12:-6] if len(monthly_data) >= 12 else []
-
-                recent_avg = sum(row[1] for row in recent_6_months) / len(recent_6_months) if recent_6_months else 0
-                previous_avg = sum(row[1] for row in previous_6_months) / len(previous_6_months) if previous_6_months else 0
-
-                trend_direction = "UP" if recent_avg > previous_avg else "DOWN" if recent_avg < previous_avg else "STABLE"
-                trend_percentage = ((recent_avg - previous_avg) / previous_avg * 100) if previous_avg > 0 else 0
-
-                report += "\n" + "=" * 80 + "\n"
-                report += "TREND ANALYSIS SUMMARY:\n"
-                report += "=" * 80 + "\n"
-                report += f"Total Months Analyzed: {len(monthly_data)}\n"
-                report += f"Total Completions: {total_completions}\n"
-                report += f"Average Completions per Month: {avg_monthly_completions:.1f}\n"
-                report += f"Average Hours per PM: {avg_hours_overall:.1f}h\n\n"
-
-                report += f"Peak Performance Month: {peak_month} ({peak_completions} completions)\n"
-                report += f"Lowest Performance Month: {lowest_month} ({lowest_completions} completions)\n\n"
-
-                report += f"6-Month Trend Analysis:\n"
-                report += f"Recent 6 months average: {recent_avg:.1f} completions/month\n"
-                report += f"Previous 6 months average: {previous_avg:.1f} completions/month\n"
-                report += f"Trend Direction: {trend_direction} ({trend_percentage:+.1f}%)\n\n"
-
-                # Seasonal analysis
-                report += "SEASONAL PATTERNS:\n"
-                report += "-" * 40 + "\n"
-                seasonal_data = {}
-                for month_data in monthly_data:
-                    month_str, total = month_data[0], month_data[1]
-                    month_num = int(month_str.split('-')[1])
-                    season = self.get_season_from_month(month_num)
-                    if season not in seasonal_data:
-                        seasonal_data[season] = []
-                    seasonal_data[season].append(total)
-    
-                for season, completions in seasonal_data.items():
-                    avg_seasonal = sum(completions) / len(completions)
-                    report += f"{season:<10}: {avg_seasonal:.1f} avg completions/month\n"
-
-                # Workload distribution analysis
-                report += "\nWORKLOAD DISTRIBUTION INSIGHTS:\n"
-                report += "-" * 40 + "\n"
-            
-                # Calculate coefficient of variation for consistency
-                if len(monthly_data) > 1:
-                    completions_list = [row[1] for row in monthly_data]
-                    import statistics
-                    std_dev = statistics.stdev(completions_list)
-                    cv = (std_dev / avg_monthly_completions) * 100 if avg_monthly_completions > 0 else 0
-                
-                    consistency_rating = "Very Consistent" if cv < 15 else "Consistent" if cv < 25 else "Variable" if cv < 35 else "Highly Variable"
-                    report += f"Workload Consistency: {consistency_rating} (CV: {cv:.1f}%)\n"
-                    report += f"Standard Deviation: {std_dev:.1f} completions\n\n"
-
-                # Recommendations
-                report += "RECOMMENDATIONS:\n"
-                report += "-" * 40 + "\n"
-                if trend_direction == "DOWN":
-                    report += "- Investigate causes of declining PM completion rates\n"
-                    report += "- Consider additional technician training or resources\n"
-                    report += "- Review equipment scheduling and assignment processes\n"
-                elif trend_direction == "UP":
-                    report += "- Excellent performance trend - maintain current practices\n"
-                    report += "- Consider documenting successful strategies for replication\n"
-            
-                if cv > 30:
-                    report += "- High variability detected - investigate scheduling consistency\n"
-                    report += "- Consider implementing better workload balancing\n"
-            
-                if avg_hours_overall > 2.0:
-                    report += "- Average PM time is high - review procedures for efficiency\n"
-                elif avg_hours_overall < 0.5:
-                    report += "- Very low average PM time - verify completeness of work\n"
-
-            else:
-                report += "No PM completion data found for trend analysis.\n"
-
-            # Display the report
-            trends_text.insert('end', report)
-            trends_text.config(state='disabled')
-
             # Pack widgets
             trends_text.pack(side='left', fill='both', expand=True)
             text_scrollbar.pack(side='right', fill='y')
@@ -13681,515 +14641,658 @@ class AITCMMSSystem:
             canvas.pack(side="left", fill="both", expand=True)
             scrollbar.pack(side="right", fill="y")
 
+            self._fill_analytics_text(trends_text, 'trends_monthly', self._build_monthly_trends, 'monthly trends')
+
         except Exception as e:
-            error_label = ttk.Label(parent_frame, text=f"Error generating monthly trends: {str(e)}")
-            error_label.pack(pady=20)
+            print(f"Error generating monthly trends: {e}")
+
+    def _build_monthly_trends(self, cursor):
+        """Monthly PM completion trends text (runs on a background worker - no Tk calls)"""
+        # Monthly completion data (last 24 months)
+        cursor.execute('''
+            SELECT
+                TO_CHAR(completion_date::date, 'YYYY-MM') as month,
+                COUNT(*) as total_completions,
+                COUNT(CASE WHEN pm_type = 'Monthly' THEN 1 END) as monthly_pms,
+                COUNT(CASE WHEN pm_type = 'Annual' THEN 1 END) as annual_pms,
+                COUNT(CASE WHEN pm_type = 'Six Month' THEN 1 END) as six_month_pms,
+                AVG(total_hours) as avg_hours,
+                COUNT(DISTINCT technician_name) as active_technicians,
+                COUNT(DISTINCT bfm_equipment_no) as unique_equipment
+            FROM pm_completions
+            WHERE completion_date::date >= CURRENT_DATE - INTERVAL '24 months'
+            GROUP BY TO_CHAR(completion_date::date, 'YYYY-MM')
+            ORDER BY month ASC
+        ''')
+
+        monthly_data = cursor.fetchall()
+
+        parts = ["PM COMPLETION TRENDS ANALYSIS\n"]
+        parts.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        parts.append("=" * 80 + "\n\n")
+
+        if monthly_data:
+            parts.append("MONTHLY COMPLETION TRENDS (Last 24 months):\n")
+            parts.append("-" * 80 + "\n")
+            parts.append(f"{'Month':<10} {'Total':<8} {'Monthly':<8} {'Annual':<8} {'6-Month':<8} {'Avg Hrs':<8} {'Techs':<6} {'Equipment':<10}\n")
+            parts.append("-" * 80 + "\n")
+
+            total_completions = 0
+            total_hours = 0
+            peak_month = None
+            peak_completions = 0
+            lowest_month = None
+            lowest_completions = float('inf')
+
+            for month_data in monthly_data:
+                month, total, monthly_pms, annual_pms, six_month_pms, avg_hours, techs, equipment = month_data
+                total_completions += total
+                total_hours += avg_hours if avg_hours else 0
+
+                # Track peak and low months
+                if total > peak_completions:
+                    peak_completions = total
+                    peak_month = month
+                if total < lowest_completions:
+                    lowest_completions = total
+                    lowest_month = month
+
+                avg_hours_str = f"{avg_hours or 0:.1f}"
+                parts.append(f"{month:<10} {total:<8} {monthly_pms:<8} {annual_pms:<8} {six_month_pms:<8} {avg_hours_str:<8} {techs:<6} {equipment:<10}\n")
+
+            # Calculate trends
+            avg_monthly_completions = total_completions / len(monthly_data) if monthly_data else 0
+            avg_hours_overall = total_hours / len(monthly_data) if monthly_data else 0
+
+            # Recent trend analysis (last 6 months vs previous 6 months)
+            recent_6_months = monthly_data[-6:] if len(monthly_data) >= 6 else monthly_data
+            previous_6_months = monthly_data[-12:-6] if len(monthly_data) >= 12 else []
+
+            recent_avg = sum(row[1] for row in recent_6_months) / len(recent_6_months) if recent_6_months else 0
+            previous_avg = sum(row[1] for row in previous_6_months) / len(previous_6_months) if previous_6_months else 0
+
+            trend_direction = "UP" if recent_avg > previous_avg else "DOWN" if recent_avg < previous_avg else "STABLE"
+            trend_percentage = ((recent_avg - previous_avg) / previous_avg * 100) if previous_avg > 0 else 0
+
+            parts.append("\n" + "=" * 80 + "\n")
+            parts.append("TREND ANALYSIS SUMMARY:\n")
+            parts.append("=" * 80 + "\n")
+            parts.append(f"Total Months Analyzed: {len(monthly_data)}\n")
+            parts.append(f"Total Completions: {total_completions}\n")
+            parts.append(f"Average Completions per Month: {avg_monthly_completions:.1f}\n")
+            parts.append(f"Average Hours per PM: {avg_hours_overall:.1f}h\n\n")
+
+            parts.append(f"Peak Performance Month: {peak_month} ({peak_completions} completions)\n")
+            parts.append(f"Lowest Performance Month: {lowest_month} ({lowest_completions} completions)\n\n")
+
+            parts.append(f"6-Month Trend Analysis:\n")
+            parts.append(f"Recent 6 months average: {recent_avg:.1f} completions/month\n")
+            parts.append(f"Previous 6 months average: {previous_avg:.1f} completions/month\n")
+            parts.append(f"Trend Direction: {trend_direction} ({trend_percentage:+.1f}%)\n\n")
+
+            # Seasonal analysis
+            parts.append("SEASONAL PATTERNS:\n")
+            parts.append("-" * 40 + "\n")
+            seasonal_data = {}
+            for month_data in monthly_data:
+                month_str, total = month_data[0], month_data[1]
+                month_num = int(month_str.split('-')[1])
+                season = self.get_season_from_month(month_num)
+                if season not in seasonal_data:
+                    seasonal_data[season] = []
+                seasonal_data[season].append(total)
+
+            for season, completions in seasonal_data.items():
+                avg_seasonal = sum(completions) / len(completions)
+                parts.append(f"{season:<10}: {avg_seasonal:.1f} avg completions/month\n")
+
+            # Workload distribution analysis
+            parts.append("\nWORKLOAD DISTRIBUTION INSIGHTS:\n")
+            parts.append("-" * 40 + "\n")
+        
+            # Calculate coefficient of variation for consistency
+            if len(monthly_data) > 1:
+                completions_list = [row[1] for row in monthly_data]
+                import statistics
+                std_dev = statistics.stdev(completions_list)
+                cv = (std_dev / avg_monthly_completions) * 100 if avg_monthly_completions > 0 else 0
+            
+                consistency_rating = "Very Consistent" if cv < 15 else "Consistent" if cv < 25 else "Variable" if cv < 35 else "Highly Variable"
+                parts.append(f"Workload Consistency: {consistency_rating} (CV: {cv:.1f}%)\n")
+                parts.append(f"Standard Deviation: {std_dev:.1f} completions\n\n")
+
+            # Recommendations
+            parts.append("RECOMMENDATIONS:\n")
+            parts.append("-" * 40 + "\n")
+            if trend_direction == "DOWN":
+                parts.append("- Investigate causes of declining PM completion rates\n")
+                parts.append("- Consider additional technician training or resources\n")
+                parts.append("- Review equipment scheduling and assignment processes\n")
+            elif trend_direction == "UP":
+                parts.append("- Excellent performance trend - maintain current practices\n")
+                parts.append("- Consider documenting successful strategies for replication\n")
+        
+            if cv > 30:
+                parts.append("- High variability detected - investigate scheduling consistency\n")
+                parts.append("- Consider implementing better workload balancing\n")
+        
+            if avg_hours_overall > 2.0:
+                parts.append("- Average PM time is high - review procedures for efficiency\n")
+            elif avg_hours_overall < 0.5:
+                parts.append("- Very low average PM time - verify completeness of work\n")
+
+        else:
+            parts.append("No PM completion data found for trend analysis.\n")
+
+        # Display the report
+
+        return ''.join(parts)
 
     def generate_equipment_trends_analysis(self, parent_frame):
         """Generate equipment-specific PM trends analysis"""
         try:
-            cursor = self.conn.cursor()
-
             # Create text widget for equipment trends
             equipment_text = tk.Text(parent_frame, wrap='word', font=('Courier', 10))
             scrollbar = ttk.Scrollbar(parent_frame, orient='vertical', command=equipment_text.yview)
             equipment_text.configure(yscrollcommand=scrollbar.set)
 
-            report = "EQUIPMENT PM TRENDS ANALYSIS\n"
-            report += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-            report += "=" * 80 + "\n\n"
+            equipment_text.pack(side='left', fill='both', expand=True)
+            scrollbar.pack(side='right', fill='y')
 
-            # Most frequently serviced equipment
-            cursor.execute('''
-                SELECT e.bfm_equipment_no, e.description, e.location,
-                       COUNT(pc.id) as total_pms,
-                       AVG(pc.labor_hours + pc.labor_minutes/60.0) as avg_hours,
-                       MIN(pc.completion_date) as first_pm,
-                       MAX(pc.completion_date) as last_pm,
-                       COUNT(CASE WHEN pc.completion_date >= CURRENT_DATE - INTERVAL '90 days' THEN 1 END) as recent_pms
-                FROM equipment e
-                LEFT JOIN pm_completions pc ON e.bfm_equipment_no = pc.bfm_equipment_no
-                WHERE e.status = 'Active'
-                GROUP BY e.bfm_equipment_no, e.description, e.location
-                HAVING total_pms > 0
-                ORDER BY total_pms DESC
-                LIMIT 20
-            ''')
+            self._fill_analytics_text(equipment_text, 'trends_equipment', self._build_equipment_trends, 'equipment trends')
 
-            high_maintenance_equipment = cursor.fetchall()
+        except Exception as e:
+            print(f"Error generating equipment trends: {e}")
 
-            if high_maintenance_equipment:
-                report += "TOP 20 MOST SERVICED EQUIPMENT:\n"
-                report += "-" * 80 + "\n"
-                report += f"{'Rank':<5} {'BFM No':<12} {'Description':<25} {'Total PMs':<10} {'Avg Hours':<10} {'Recent (90d)':<12}\n"
-                report += "-" * 80 + "\n"
+    def _build_equipment_trends(self, cursor):
+        """Equipment-specific PM trends text (runs on a background worker - no Tk calls)"""
+        parts = ["EQUIPMENT PM TRENDS ANALYSIS\n"]
+        parts.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        parts.append("=" * 80 + "\n\n")
 
-                for i, equipment in enumerate(high_maintenance_equipment, 1):
-                    bfm_no, description, location, total_pms, avg_hours, first_pm, last_pm, recent_pms = equipment
-                    desc_short = (description[:22] + '...') if description and len(description) > 22 else (description or 'N/A')
-                    avg_hours_str = f"{avg_hours:.1f}h" if avg_hours else "0.0h"
-                    
-                    report += f"{i:<5} {bfm_no:<12} {desc_short:<25} {total_pms:<10} {avg_hours_str:<10} {recent_pms:<12}\n"
+        # Most frequently serviced equipment
+        cursor.execute('''
+            SELECT e.bfm_equipment_no, e.description, e.location,
+                   COUNT(pc.id) as total_pms,
+                   AVG(pc.total_hours) as avg_hours,
+                   MIN(pc.completion_date) as first_pm,
+                   MAX(pc.completion_date) as last_pm,
+                   COUNT(CASE WHEN pc.completion_date >= CURRENT_DATE - INTERVAL '90 days' THEN 1 END) as recent_pms
+            FROM equipment e
+            LEFT JOIN pm_completions pc ON e.bfm_equipment_no = pc.bfm_equipment_no
+            WHERE e.status = 'Active'
+            GROUP BY e.bfm_equipment_no, e.description, e.location
+            HAVING total_pms > 0
+            ORDER BY total_pms DESC
+            LIMIT 20
+        ''')
 
-            # Equipment with increasing maintenance needs
-            cursor.execute('''
-                SELECT bfm_equipment_no,
-                       COUNT(CASE WHEN completion_date >= CURRENT_DATE - INTERVAL '90 days' THEN 1 END) as last_90_days,
-                       COUNT(CASE WHEN completion_date >= CURRENT_DATE - INTERVAL '180 days' AND completion_date < CURRENT_DATE - INTERVAL '90 days' THEN 1 END) as prev_90_days,
-                       COUNT(*) as total_pms
-                FROM pm_completions
-                WHERE completion_date >= CURRENT_DATE - INTERVAL '180 days'
-                GROUP BY bfm_equipment_no
-                HAVING last_90_days > prev_90_days AND prev_90_days > 0
-                ORDER BY (last_90_days - prev_90_days) DESC
-                LIMIT 10
-            ''')
+        high_maintenance_equipment = cursor.fetchall()
 
-            increasing_maintenance = cursor.fetchall()
+        if high_maintenance_equipment:
+            parts.append("TOP 20 MOST SERVICED EQUIPMENT:\n")
+            parts.append("-" * 80 + "\n")
+            parts.append(f"{'Rank':<5} {'BFM No':<12} {'Description':<25} {'Total PMs':<10} {'Avg Hours':<10} {'Recent (90d)':<12}\n")
+            parts.append("-" * 80 + "\n")
 
-            if increasing_maintenance:
-                report += "\n\nEQUIPMENT WITH INCREASING MAINTENANCE NEEDS:\n"
-                report += "-" * 60 + "\n"
-                report += f"{'BFM No':<15} {'Recent 90d':<12} {'Previous 90d':<12} {'Increase':<10}\n"
-                report += "-" * 60 + "\n"
+            for i, equipment in enumerate(high_maintenance_equipment, 1):
+                bfm_no, description, location, total_pms, avg_hours, first_pm, last_pm, recent_pms = equipment
+                desc_short = truncate_text(description, 22) or 'N/A'
+                avg_hours_str = f"{avg_hours or 0:.1f}h"
+                
+                parts.append(f"{i:<5} {bfm_no:<12} {desc_short:<25} {total_pms:<10} {avg_hours_str:<10} {recent_pms:<12}\n")
 
-                for equipment in increasing_maintenance:
-                    bfm_no, last_90, prev_90, total = equipment
-                    increase = last_90 - prev_90
-                    report += f"{bfm_no:<15} {last_90:<12} {prev_90:<12} +{increase:<9}\n"
+        # Equipment with increasing maintenance needs
+        cursor.execute('''
+            SELECT bfm_equipment_no,
+                   COUNT(CASE WHEN completion_date >= CURRENT_DATE - INTERVAL '90 days' THEN 1 END) as last_90_days,
+                   COUNT(CASE WHEN completion_date >= CURRENT_DATE - INTERVAL '180 days' AND completion_date < CURRENT_DATE - INTERVAL '90 days' THEN 1 END) as prev_90_days,
+                   COUNT(*) as total_pms
+            FROM pm_completions
+            WHERE completion_date >= CURRENT_DATE - INTERVAL '180 days'
+            GROUP BY bfm_equipment_no
+            HAVING last_90_days > prev_90_days AND prev_90_days > 0
+            ORDER BY (last_90_days - prev_90_days) DESC
+            LIMIT 10
+        ''')
 
-            # Equipment that hasn't been serviced recently
-            cursor.execute('''
-                SELECT e.bfm_equipment_no, e.description, e.location,
-                       MAX(pc.completion_date) as last_pm_date,
-                       JULIANDAY('now') - JULIANDAY(MAX(pc.completion_date)) as days_since_last_pm
-                FROM equipment e
-                LEFT JOIN pm_completions pc ON e.bfm_equipment_no = pc.bfm_equipment_no
-                WHERE e.status = 'Active' AND e.monthly_pm = 1
-                GROUP BY e.bfm_equipment_no, e.description, e.location
-                HAVING days_since_last_pm > 60 OR last_pm_date IS NULL
-                ORDER BY days_since_last_pm DESC NULLS LAST
-                LIMIT 15
-            ''')
+        increasing_maintenance = cursor.fetchall()
 
-            neglected_equipment = cursor.fetchall()
+        if increasing_maintenance:
+            parts.append("\n\nEQUIPMENT WITH INCREASING MAINTENANCE NEEDS:\n")
+            parts.append("-" * 60 + "\n")
+            parts.append(f"{'BFM No':<15} {'Recent 90d':<12} {'Previous 90d':<12} {'Increase':<10}\n")
+            parts.append("-" * 60 + "\n")
 
-            if neglected_equipment:
-                report += "\n\nEQUIPMENT REQUIRING ATTENTION (>60 days since last PM):\n"
-                report += "-" * 70 + "\n"
-                report += f"{'BFM No':<15} {'Description':<25} {'Last PM':<12} {'Days Since':<12}\n"
-                report += "-" * 70 + "\n"
+            for equipment in increasing_maintenance:
+                bfm_no, last_90, prev_90, total = equipment
+                increase = last_90 - prev_90
+                parts.append(f"{bfm_no:<15} {last_90:<12} {prev_90:<12} +{increase:<9}\n")
 
-                for equipment in neglected_equipment:
-                    bfm_no, description, location, last_pm, days_since = equipment
-                    desc_short = (description[:22] + '...') if description and len(description) > 22 else (description or 'N/A')
-                    last_pm_str = last_pm if last_pm else 'Never'
-                    days_str = f"{int(days_since)}" if days_since else 'N/A'
-                    
-                    report += f"{bfm_no:<15} {desc_short:<25} {last_pm_str:<12} {days_str:<12}\n"
+        # Equipment that hasn't been serviced recently
+        cursor.execute('''
+            SELECT e.bfm_equipment_no, e.description, e.location,
+                   MAX(pc.completion_date) as last_pm_date,
+                   JULIANDAY('now') - JULIANDAY(MAX(pc.completion_date)) as days_since_last_pm
+            FROM equipment e
+            LEFT JOIN pm_completions pc ON e.bfm_equipment_no = pc.bfm_equipment_no
+            WHERE e.status = 'Active' AND e.monthly_pm = 1
+            GROUP BY e.bfm_equipment_no, e.description, e.location
+            HAVING days_since_last_pm > 60 OR last_pm_date IS NULL
+            ORDER BY days_since_last_pm DESC NULLS LAST
+            LIMIT 15
+        ''')
 
-            # Equipment performance by location
-            cursor.execute('''
-                SELECT COALESCE(e.location, 'Unknown') as location,
-                       COUNT(pc.id) as total_pms,
-                       COUNT(DISTINCT e.bfm_equipment_no) as equipment_count,
-                       AVG(pc.labor_hours + pc.labor_minutes/60.0) as avg_hours,
-                       ROUND(CAST(COUNT(pc.id) AS FLOAT) / COUNT(DISTINCT e.bfm_equipment_no), 2) as pms_per_equipment
-                FROM equipment e
-                LEFT JOIN pm_completions pc ON e.bfm_equipment_no = pc.bfm_equipment_no
-                    AND pc.completion_date >= CURRENT_DATE - INTERVAL '365 days'
-                WHERE e.status = 'Active'
-                GROUP BY COALESCE(e.location, 'Unknown')
-                HAVING equipment_count >= 3
-                ORDER BY pms_per_equipment DESC
-            ''')
+        neglected_equipment = cursor.fetchall()
 
-            location_performance = cursor.fetchall()
+        if neglected_equipment:
+            parts.append("\n\nEQUIPMENT REQUIRING ATTENTION (>60 days since last PM):\n")
+            parts.append("-" * 70 + "\n")
+            parts.append(f"{'BFM No':<15} {'Description':<25} {'Last PM':<12} {'Days Since':<12}\n")
+            parts.append("-" * 70 + "\n")
 
-            if location_performance:
-                report += "\n\nPM PERFORMANCE BY LOCATION (Last 12 months):\n"
-                report += "-" * 70 + "\n"
-                report += f"{'Location':<20} {'Equipment':<10} {'Total PMs':<10} {'PMs/Equipment':<15} {'Avg Hours':<10}\n"
-                report += "-" * 70 + "\n"
+            for equipment in neglected_equipment:
+                bfm_no, description, location, last_pm, days_since = equipment
+                desc_short = truncate_text(description, 22) or 'N/A'
+                last_pm_str = last_pm if last_pm else 'Never'
+                days_str = f"{int(days_since)}" if days_since else 'N/A'
+                
+                parts.append(f"{bfm_no:<15} {desc_short:<25} {last_pm_str:<12} {days_str:<12}\n")
 
-                for location_data in location_performance:
-                    location, total_pms, equipment_count, avg_hours, pms_per_equipment = location_data
-                    loc_short = (location[:17] + '...') if len(location) > 17 else location
-                    avg_hours_str = f"{avg_hours:.1f}h" if avg_hours else "0.0h"
-                    
-                    report += f"{loc_short:<20} {equipment_count:<10} {total_pms:<10} {pms_per_equipment:<15} {avg_hours_str:<10}\n"
+        # Equipment performance by location
+        cursor.execute('''
+            SELECT COALESCE(e.location, 'Unknown') as location,
+                   COUNT(pc.id) as total_pms,
+                   COUNT(DISTINCT e.bfm_equipment_no) as equipment_count,
+                   AVG(pc.total_hours) as avg_hours,
+                   ROUND(CAST(COUNT(pc.id) AS FLOAT) / COUNT(DISTINCT e.bfm_equipment_no), 2) as pms_per_equipment
+            FROM equipment e
+            LEFT JOIN pm_completions pc ON e.bfm_equipment_no = pc.bfm_equipment_no
+                AND pc.completion_date >= CURRENT_DATE - INTERVAL '365 days'
+            WHERE e.status = 'Active'
+            GROUP BY COALESCE(e.location, 'Unknown')
+            HAVING equipment_count >= 3
+            ORDER BY pms_per_equipment DESC
+        ''')
 
-            equipment_text.insert('end', report)
-            equipment_text.config(state='disabled')
+        location_performance = cursor.fetchall()
 
-            equipment_text.pack(side='left', fill='both', expand=True)
-            scrollbar.pack(side='right', fill='y')
+        if location_performance:
+            parts.append("\n\nPM PERFORMANCE BY LOCATION (Last 12 months):\n")
+            parts.append("-" * 70 + "\n")
+            parts.append(f"{'Location':<20} {'Equipment':<10} {'Total PMs':<10} {'PMs/Equipment':<15} {'Avg Hours':<10}\n")
+            parts.append("-" * 70 + "\n")
 
-        except Exception as e:
-            error_label = ttk.Label(parent_frame, text=f"Error generating equipment trends: {str(e)}")
-            error_label.pack(pady=20)
+            for location_data in location_performance:
+                location, total_pms, equipment_count, avg_hours, pms_per_equipment = location_data
+                loc_short = truncate_text(location, 17)
+                avg_hours_str = f"{avg_hours or 0:.1f}h"
+                
+                parts.append(f"{loc_short:<20} {equipment_count:<10} {total_pms:<10} {pms_per_equipment:<15} {avg_hours_str:<10}\n")
+
+        return ''.join(parts)
 
     def generate_technician_trends_analysis(self, parent_frame):
         """Generate technician performance trends analysis"""
         try:
-            cursor = self.conn.cursor()
-
             # Create text widget for technician trends
             tech_text = tk.Text(parent_frame, wrap='word', font=('Courier', 10))
             scrollbar = ttk.Scrollbar(parent_frame, orient='vertical', command=tech_text.yview)
             tech_text.configure(yscrollcommand=scrollbar.set)
 
-            report = "TECHNICIAN PERFORMANCE TRENDS\n"
-            report += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-            report += "=" * 80 + "\n\n"
-
-            # Monthly performance trends for each technician
-            cursor.execute('''
-                SELECT technician_name,
-                       TO_CHAR(completion_date::date, 'YYYY-MM') as month,
-                       COUNT(*) as completions,
-                       AVG(labor_hours + labor_minutes/60.0) as avg_hours
-                FROM pm_completions
-                WHERE completion_date::date >= CURRENT_DATE - INTERVAL '12 months'
-                GROUP BY technician_name, TO_CHAR(completion_date::date, 'YYYY-MM')
-                ORDER BY technician_name, month
-            ''')
-
-            monthly_tech_data = cursor.fetchall()
+            tech_text.pack(side='left', fill='both', expand=True)
+            scrollbar.pack(side='right', fill='y')
 
-            # Organize data by technician
-            tech_monthly = {}
-            for row in monthly_tech_data:
-                tech, month, completions, avg_hours = row
-                if tech not in tech_monthly:
-                    tech_monthly[tech] = []
-                tech_monthly[tech].append((month, completions, avg_hours))
-
-            if tech_monthly:
-                report += "MONTHLY PERFORMANCE TRENDS BY TECHNICIAN:\n"
-                report += "=" * 80 + "\n"
-
-                for technician, monthly_data in tech_monthly.items():
-                    report += f"\n{technician}:\n"
-                    report += "-" * 50 + "\n"
-                    report += f"{'Month':<10} {'Completions':<12} {'Avg Hours':<10} {'Trend':<10}\n"
-                    report += "-" * 50 + "\n"
-
-                    # Calculate trend
-                    completions_list = [data[1] for data in monthly_data]
-                    if len(completions_list) >= 3:
-                        recent_avg = sum(completions_list[-3:]) / 3
-                        earlier_avg = sum(completions_list[:-3]) / len(completions_list[:-3]) if len(completions_list) > 3 else sum(completions_list[:3]) / len(completions_list[:3])
-                        trend = "CHECK:" if recent_avg > earlier_avg else "CHECK:" if recent_avg < earlier_avg else "CHECK:"
-                    else:
-                        trend = "CHECK:"
+            self._fill_analytics_text(tech_text, 'trends_technician', self._build_technician_trends, 'technician trends')
 
-                    for month, completions, avg_hours in monthly_data[-6:]:  # Show last 6 months
-                        avg_hours_str = f"{avg_hours:.1f}h" if avg_hours else "0.0h"
-                        report += f"{month:<10} {completions:<12} {avg_hours_str:<10} {trend if month == monthly_data[-1][0] else '':<10}\n"
+        except Exception as e:
+            print(f"Error generating technician trends: {e}")
 
-            # Overall technician comparison
-            cursor.execute('''
-                SELECT technician_name,
-                       COUNT(*) as total_completions,
-                       AVG(labor_hours + labor_minutes/60.0) as avg_hours_per_pm,
-                       COUNT(DISTINCT bfm_equipment_no) as unique_equipment,
-                       COUNT(CASE WHEN completion_date >= CURRENT_DATE - INTERVAL '30 days' THEN 1 END) as recent_completions,
-                       MIN(completion_date) as first_completion,
-                       MAX(completion_date) as last_completion
-                FROM pm_completions
-                WHERE completion_date >= CURRENT_DATE - INTERVAL '12 months'
-                GROUP BY technician_name
-                ORDER BY total_completions DESC
-            ''')
+    def _build_technician_trends(self, cursor):
+        """Technician performance trends text (runs on a background worker - no Tk calls)"""
+        parts = ["TECHNICIAN PERFORMANCE TRENDS\n"]
+        parts.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        parts.append("=" * 80 + "\n\n")
 
-            tech_comparison = cursor.fetchall()
+        # Monthly performance trends for each technician
+        cursor.execute('''
+            SELECT NULLIF(technician_name, '') as technician_name,
+                   month,
+                   SUM(completions) as completions,
+                   SUM(labor_hours_sum) / NULLIF(SUM(labor_hours_count), 0) as avg_hours
+            FROM pm_completions_monthly
+            WHERE month >= TO_CHAR(CURRENT_DATE - INTERVAL '12 months', 'YYYY-MM')
+            GROUP BY technician_name, month
+            ORDER BY technician_name, month
+        ''')
 
-            if tech_comparison:
-                report += "\n\nTECHNICIAN PERFORMANCE COMPARISON (Last 12 months):\n"
-                report += "=" * 90 + "\n"
-                report += f"{'Technician':<20} {'Total PMs':<10} {'Avg Hrs':<10} {'Equipment':<10} {'Recent 30d':<12} {'Active Period':<15}\n"
-                report += "=" * 90 + "\n"
+        monthly_tech_data = cursor.fetchall()
+
+        # Organize data by technician
+        tech_monthly = {}
+        for row in monthly_tech_data:
+            tech, month, completions, avg_hours = row
+            if tech not in tech_monthly:
+                tech_monthly[tech] = []
+            tech_monthly[tech].append((month, completions, avg_hours))
+
+        if tech_monthly:
+            parts.append("MONTHLY PERFORMANCE TRENDS BY TECHNICIAN:\n")
+            parts.append("=" * 80 + "\n")
+
+            for technician, monthly_data in tech_monthly.items():
+                parts.append(f"\n{technician}:\n")
+                parts.append("-" * 50 + "\n")
+                parts.append(f"{'Month':<10} {'Completions':<12} {'Avg Hours':<10} {'Trend':<10}\n")
+                parts.append("-" * 50 + "\n")
+
+                # Calculate trend
+                completions_list = [data[1] for data in monthly_data]
+                if len(completions_list) >= 3:
+                    recent_avg = sum(completions_list[-3:]) / 3
+                    earlier_avg = sum(completions_list[:-3]) / len(completions_list[:-3]) if len(completions_list) > 3 else sum(completions_list[:3]) / len(completions_list[:3])
+                    trend = "CHECK:" if recent_avg > earlier_avg else "CHECK:" if recent_avg < earlier_avg else "CHECK:"
+                else:
+                    trend = "CHECK:"
 
-                for tech_data in tech_comparison:
-                    tech, total, avg_hours, equipment, recent, first, last = tech_data
-                    avg_hours_str = f"{avg_hours:.1f}h" if avg_hours else "0.0h"
-                    
-                    # Calculate active period
-                    if first and last:
-                        first_date = datetime.strptime(first, '%Y-%m-%d')
-                        last_date = datetime.strptime(last, '%Y-%m-%d')
-                        active_days = (last_date - first_date).days
-                        active_period = f"{active_days}d"
-                    else:
-                        active_period = "N/A"
+                for month, completions, avg_hours in monthly_data[-6:]:  # Show last 6 months
+                    avg_hours_str = f"{avg_hours or 0:.1f}h"
+                    parts.append(f"{month:<10} {completions:<12} {avg_hours_str:<10} {trend if month == monthly_data[-1][0] else '':<10}\n")
 
-                    tech_short = tech[:17] + '...' if len(tech) > 17 else tech
-                    report += f"{tech_short:<20} {total:<10} {avg_hours_str:<10} {equipment:<10} {recent:<12} {active_period:<15}\n"
+        # Overall technician comparison
+        cursor.execute('''
+            SELECT technician_name,
+                   COUNT(*) as total_completions,
+                   AVG(total_hours) as avg_hours_per_pm,
+                   COUNT(DISTINCT bfm_equipment_no) as unique_equipment,
+                   COUNT(CASE WHEN completion_date >= CURRENT_DATE - INTERVAL '30 days' THEN 1 END) as recent_completions,
+                   MIN(completion_date) as first_completion,
+                   MAX(completion_date) as last_completion
+            FROM pm_completions
+            WHERE completion_date >= CURRENT_DATE - INTERVAL '12 months'
+            GROUP BY technician_name
+            ORDER BY total_completions DESC
+        ''')
 
-            # Efficiency metrics
-            if tech_comparison:
-                report += "\n\nEFFICIENCY METRICS:\n"
-                report += "-" * 60 + "\n"
-                report += f"{'Technician':<20} {'PMs/Day':<10} {'Productivity':<12} {'Specialization':<15}\n"
-                report += "-" * 60 + "\n"
+        tech_comparison = cursor.fetchall()
 
-                for tech_data in tech_comparison:
-                    tech, total, avg_hours, equipment, recent, first, last = tech_data
-                
-                    # Calculate PMs per day (approximate)
-                    if first and last:
-                        first_date = datetime.strptime(first, '%Y-%m-%d')
-                        last_date = datetime.strptime(last, '%Y-%m-%d')
-                        active_days = max(1, (last_date - first_date).days)
-                        pms_per_day = total / active_days
-                    else:
-                        pms_per_day = 0
+        if tech_comparison:
+            parts.append("\n\nTECHNICIAN PERFORMANCE COMPARISON (Last 12 months):\n")
+            parts.append("=" * 90 + "\n")
+            parts.append(f"{'Technician':<20} {'Total PMs':<10} {'Avg Hrs':<10} {'Equipment':<10} {'Recent 30d':<12} {'Active Period':<15}\n")
+            parts.append("=" * 90 + "\n")
 
-                    # Productivity score (PMs per hour)
-                    productivity = total / (total * (avg_hours if avg_hours else 1)) if avg_hours else total
+            for tech_data in tech_comparison:
+                tech, total, avg_hours, equipment, recent, first, last = tech_data
+                avg_hours_str = f"{avg_hours or 0:.1f}h"
                 
-                    # Specialization (unique equipment ratio)
-                    specialization = equipment / total if total > 0 else 0
-                    spec_rating = "High" if specialization > 0.8 else "Medium" if specialization > 0.5 else "Low"
-
-                    tech_short = tech[:17] + '...' if len(tech) > 17 else tech
-                    report += f"{tech_short:<20} {pms_per_day:<9.2f} {productivity:<11.2f} {spec_rating:<15}\n"
+                # Calculate active period
+                if first and last:
+                    first_date = datetime.strptime(first, '%Y-%m-%d')
+                    last_date = datetime.strptime(last, '%Y-%m-%d')
+                    active_days = (last_date - first_date).days
+                    active_period = f"{active_days}d"
+                else:
+                    active_period = "N/A"
+
+                tech_short = truncate_text(tech, 17)
+                parts.append(f"{tech_short:<20} {total:<10} {avg_hours_str:<10} {equipment:<10} {recent:<12} {active_period:<15}\n")
+
+        # Efficiency metrics
+        if tech_comparison:
+            parts.append("\n\nEFFICIENCY METRICS:\n")
+            parts.append("-" * 60 + "\n")
+            parts.append(f"{'Technician':<20} {'PMs/Day':<10} {'Productivity':<12} {'Specialization':<15}\n")
+            parts.append("-" * 60 + "\n")
+
+            for tech_data in tech_comparison:
+                tech, total, avg_hours, equipment, recent, first, last = tech_data
+            
+                # Calculate PMs per day (approximate)
+                if first and last:
+                    first_date = datetime.strptime(first, '%Y-%m-%d')
+                    last_date = datetime.strptime(last, '%Y-%m-%d')
+                    active_days = max(1, (last_date - first_date).days)
+                    pms_per_day = total / active_days
+                else:
+                    pms_per_day = 0
 
-            tech_text.insert('end', report)
-            tech_text.config(state='disabled')
+                # Productivity score (PMs per hour)
+                productivity = total / (total * (avg_hours if avg_hours else 1)) if avg_hours else total
+            
+                # Specialization (unique equipment ratio)
+                specialization = equipment / total if total > 0 else 0
+                spec_rating = "High" if specialization > 0.8 else "Medium" if specialization > 0.5 else "Low"
 
-            tech_text.pack(side='left', fill='both', expand=True)
-            scrollbar.pack(side='right', fill='y')
+                tech_short = truncate_text(tech, 17)
+                parts.append(f"{tech_short:<20} {pms_per_day:<9.2f} {productivity:<11.2f} {spec_rating:<15}\n")
 
-        except Exception as e:
-            error_label = ttk.Label(parent_frame, text=f"Error generating technician trends: {str(e)}")
-            error_label.pack(pady=20)
+        return ''.join(parts)
 
     def generate_pm_type_trends_analysis(self, parent_frame):
         """Generate PM type distribution and trends analysis"""
         try:
-            cursor = self.conn.cursor()
-
             # Create text widget for PM type trends
             pm_type_text = tk.Text(parent_frame, wrap='word', font=('Courier', 10))
             scrollbar = ttk.Scrollbar(parent_frame, orient='vertical', command=pm_type_text.yview)
             pm_type_text.configure(yscrollcommand=scrollbar.set)
 
-            report = "PM TYPE TRENDS ANALYSIS\n"
-            report += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-            report += "=" * 80 + "\n\n"
+            pm_type_text.pack(side='left', fill='both', expand=True)
+            scrollbar.pack(side='right', fill='y')
 
-            # Monthly PM type distribution
-            cursor.execute('''
-                SELECT TO_CHAR(completion_date::date, 'YYYY-MM') as month,
-                       pm_type,
-                       COUNT(*) as completions,
-                       AVG(labor_hours + labor_minutes/60.0) as avg_hours
-                FROM pm_completions
-                WHERE completion_date::date >= CURRENT_DATE - INTERVAL '12 months'
-                GROUP BY TO_CHAR(completion_date::date, 'YYYY-MM'), pm_type
-                ORDER BY month, pm_type
-            ''')
+            self._fill_analytics_text(pm_type_text, 'trends_pm_type', self._build_pm_type_trends, 'PM type trends')
 
-            monthly_pm_type_data = cursor.fetchall()
-
-            # Organize by month
-            monthly_pm_types = {}
-            for row in monthly_pm_type_data:
-                month, pm_type, completions, avg_hours = row
-                if month not in monthly_pm_types:
-                    monthly_pm_types[month] = {}
-                monthly_pm_types[month][pm_type] = (completions, avg_hours)
-
-            if monthly_pm_types:
-                report += "MONTHLY PM TYPE DISTRIBUTION:\n"
-                report += "=" * 80 + "\n"
-                report += f"{'Month':<10} {'Monthly':<10} {'Annual':<10} {'Six Month':<12} {'Other':<8} {'Total':<8}\n"
-                report += "=" * 80 + "\n"
-
-                pm_type_totals = {}
-                for month, pm_types in monthly_pm_types.items():
-                    monthly_count = pm_types.get('Monthly', (0, 0))[0]
-                    annual_count = pm_types.get('Annual', (0, 0))[0]
-                    six_month_count = pm_types.get('Six Month', (0, 0))[0]
-                    other_count = sum(data[0] for pm_type, data in pm_types.items() 
-                                    if pm_type not in ['Monthly', 'Annual', 'Six Month'])
-                    total_count = monthly_count + annual_count + six_month_count + other_count
-
-                    # Track totals
-                    for pm_type, (count, _) in pm_types.items():
-                        pm_type_totals[pm_type] = pm_type_totals.get(pm_type, 0) + count
-
-                    report += f"{month:<10} {monthly_count:<10} {annual_count:<10} {six_month_count:<12} {other_count:<8} {total_count:<8}\n"
-
-            # Overall PM type statistics
-            cursor.execute('''
-                SELECT pm_type,
-                    COUNT(*) as total_completions,
-                    AVG(labor_hours + labor_minutes/60.0) as avg_hours,
-                       MIN(completion_date) as first_completion,
-                       MAX(completion_date) as last_completion,
-                       COUNT(DISTINCT technician_name) as technicians_involved,
-                       COUNT(DISTINCT bfm_equipment_no) as equipment_serviced
-                FROM pm_completions
-                WHERE completion_date >= CURRENT_DATE - INTERVAL '12 months'
-                GROUP BY pm_type
-                ORDER BY total_completions DESC
-            ''')
+        except Exception as e:
+            print(f"Error generating PM type trends: {e}")
 
-            pm_type_stats = cursor.fetchall()
+    def _build_pm_type_trends(self, cursor):
+        """PM type distribution and trends text (runs on a background worker - no Tk calls)"""
+        parts = ["PM TYPE TRENDS ANALYSIS\n"]
+        parts.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        parts.append("=" * 80 + "\n\n")
 
-            if pm_type_stats:
-                report += "\n\nPM TYPE PERFORMANCE SUMMARY (Last 12 months):\n"
-                report += "=" * 90 + "\n"
-                report += f"{'PM Type':<15} {'Total':<8} {'Avg Hours':<10} {'Technicians':<12} {'Equipment':<10} {'Period':<15}\n"
-                report += "=" * 90 + "\n"
+        # Monthly PM type distribution
+        cursor.execute('''
+            SELECT month,
+                   NULLIF(pm_type, '') as pm_type,
+                   SUM(completions) as completions,
+                   SUM(labor_hours_sum) / NULLIF(SUM(labor_hours_count), 0) as avg_hours
+            FROM pm_completions_monthly
+            WHERE month >= TO_CHAR(CURRENT_DATE - INTERVAL '12 months', 'YYYY-MM')
+            GROUP BY month, pm_type
+            ORDER BY month, pm_type
+        ''')
 
-                total_all_pms = sum(row[1] for row in pm_type_stats)
-            
-                for pm_data in pm_type_stats:
-                    pm_type, total, avg_hours, first, last, techs, equipment = pm_data
-                    percentage = (total / total_all_pms * 100) if total_all_pms > 0 else 0
-                    avg_hours_str = f"{avg_hours:.1f}h" if avg_hours else "0.0h"
-                
-                    # Calculate period
-                    if first and last:
-                        first_date = datetime.strptime(first, '%Y-%m-%d')
-                        last_date = datetime.strptime(last, '%Y-%m-%d')
-                        period_days = (last_date - first_date).days
-                        period_str = f"{period_days}d"
-                    else:
-                        period_str = "N/A"
+        monthly_pm_type_data = cursor.fetchall()
+
+        # Organize by month
+        monthly_pm_types = {}
+        for row in monthly_pm_type_data:
+            month, pm_type, completions, avg_hours = row
+            if month not in monthly_pm_types:
+                monthly_pm_types[month] = {}
+            monthly_pm_types[month][pm_type] = (completions, avg_hours)
+
+        if monthly_pm_types:
+            parts.append("MONTHLY PM TYPE DISTRIBUTION:\n")
+            parts.append("=" * 80 + "\n")
+            parts.append(f"{'Month':<10} {'Monthly':<10} {'Annual':<10} {'Six Month':<12} {'Other':<8} {'Total':<8}\n")
+            parts.append("=" * 80 + "\n")
+
+            pm_type_totals = {}
+            for month, pm_types in monthly_pm_types.items():
+                monthly_count = pm_types.get('Monthly', (0, 0))[0]
+                annual_count = pm_types.get('Annual', (0, 0))[0]
+                six_month_count = pm_types.get('Six Month', (0, 0))[0]
+                other_count = sum(data[0] for pm_type, data in pm_types.items() 
+                                if pm_type not in ['Monthly', 'Annual', 'Six Month'])
+                total_count = monthly_count + annual_count + six_month_count + other_count
+
+                # Track totals
+                for pm_type, (count, _) in pm_types.items():
+                    pm_type_totals[pm_type] = pm_type_totals.get(pm_type, 0) + count
+
+                parts.append(f"{month:<10} {monthly_count:<10} {annual_count:<10} {six_month_count:<12} {other_count:<8} {total_count:<8}\n")
+
+        # Overall PM type statistics
+        cursor.execute('''
+            SELECT pm_type,
+                COUNT(*) as total_completions,
+                AVG(total_hours) as avg_hours,
+                   MIN(completion_date) as first_completion,
+                   MAX(completion_date) as last_completion,
+                   COUNT(DISTINCT technician_name) as technicians_involved,
+                   COUNT(DISTINCT bfm_equipment_no) as equipment_serviced
+            FROM pm_completions
+            WHERE completion_date >= CURRENT_DATE - INTERVAL '12 months'
+            GROUP BY pm_type
+            ORDER BY total_completions DESC
+        ''')
+
+        pm_type_stats = cursor.fetchall()
 
-                    report += f"{pm_type:<15} {total:<8} {avg_hours_str:<10} {techs:<12} {equipment:<10} {period_str:<15}\n"
-                    report += f"{'':>15} ({percentage:.1f}%)\n"
+        if pm_type_stats:
+            parts.append("\n\nPM TYPE PERFORMANCE SUMMARY (Last 12 months):\n")
+            parts.append("=" * 90 + "\n")
+            parts.append(f"{'PM Type':<15} {'Total':<8} {'Avg Hours':<10} {'Technicians':<12} {'Equipment':<10} {'Period':<15}\n")
+            parts.append("=" * 90 + "\n")
 
-            # PM type efficiency analysis
-            if pm_type_stats:
-                report += "\n\nPM TYPE EFFICIENCY ANALYSIS:\n"
-                report += "-" * 60 + "\n"
+            total_all_pms = sum(row[1] for row in pm_type_stats)
+        
+            for pm_data in pm_type_stats:
+                pm_type, total, avg_hours, first, last, techs, equipment = pm_data
+                percentage = (total / total_all_pms * 100) if total_all_pms > 0 else 0
+                avg_hours_str = f"{avg_hours or 0:.1f}h"
             
-                # Calculate efficiency metrics
-                for pm_data in pm_type_stats:
-                    pm_type, total, avg_hours, first, last, techs, equipment = pm_data
-                
-                    # Equipment coverage (how many unique equipment per PM)
-                    coverage = equipment / total if total > 0 else 0
-                
-                    # Time efficiency rating
-                    if avg_hours:
-                        if avg_hours <= 1.0:
-                            efficiency = "Excellent"
-                        elif avg_hours <= 1.5:
-                            efficiency = "Good"
-                        elif avg_hours <= 2.5:
-                            efficiency = "Average"
-                        else:
-                            efficiency = "Needs Review"
+                # Calculate period
+                if first and last:
+                    first_date = datetime.strptime(first, '%Y-%m-%d')
+                    last_date = datetime.strptime(last, '%Y-%m-%d')
+                    period_days = (last_date - first_date).days
+                    period_str = f"{period_days}d"
+                else:
+                    period_str = "N/A"
+
+                parts.append(f"{pm_type:<15} {total:<8} {avg_hours_str:<10} {techs:<12} {equipment:<10} {period_str:<15}\n")
+                parts.append(f"{'':>15} ({percentage:.1f}%)\n")
+
+        # PM type efficiency analysis
+        if pm_type_stats:
+            parts.append("\n\nPM TYPE EFFICIENCY ANALYSIS:\n")
+            parts.append("-" * 60 + "\n")
+        
+            # Calculate efficiency metrics
+            for pm_data in pm_type_stats:
+                pm_type, total, avg_hours, first, last, techs, equipment = pm_data
+            
+                # Equipment coverage (how many unique equipment per PM)
+                coverage = equipment / total if total > 0 else 0
+            
+                # Time efficiency rating
+                if avg_hours:
+                    if avg_hours <= 1.0:
+                        efficiency = "Excellent"
+                    elif avg_hours <= 1.5:
+                        efficiency = "Good"
+                    elif avg_hours <= 2.5:
+                        efficiency = "Average"
                     else:
-                        efficiency = "Unknown"
-                
-                    report += f"{pm_type} PM Analysis:\n"
-                    report += f"  - Average completion time: {avg_hours:.1f}h ({efficiency})\n" if avg_hours else f"  - Average completion time: Unknown\n"
-                    report += f"  - Equipment coverage ratio: {coverage:.2f}\n"
-                    report += f"  - Technician utilization: {techs} different technicians\n"
-                
-                    # Frequency analysis
-                    if first and last and total > 1:
-                        first_date = datetime.strptime(first, '%Y-%m-%d')
-                        last_date = datetime.strptime(last, '%Y-%m-%d')
-                        total_days = (last_date - first_date).days
-                        avg_days_between = total_days / (total - 1) if total > 1 else 0
-                        report += f"  - Average interval: {avg_days_between:.1f} days between completions\n"
-                
-                    report += "\n"
-
-            # Seasonal PM type patterns
-            cursor.execute('''
-                SELECT
-                    CASE
-                        WHEN EXTRACT(MONTH FROM completion_date::date) IN (12, 1, 2) THEN 'Winter'
-                        WHEN EXTRACT(MONTH FROM completion_date::date) IN (3, 4, 5) THEN 'Spring'
-                        WHEN EXTRACT(MONTH FROM completion_date::date) IN (6, 7, 8) THEN 'Summer'
-                        WHEN EXTRACT(MONTH FROM completion_date::date) IN (9, 10, 11) THEN 'Fall'
-                    END as season,
-                    pm_type,
-                    COUNT(*) as completions
-                FROM pm_completions
-                WHERE completion_date::date >= CURRENT_DATE - INTERVAL '12 months'
-                GROUP BY season, pm_type
-                ORDER BY season, pm_type
-            ''')
-
-            seasonal_data = cursor.fetchall()
-
-            if seasonal_data:
-                report += "SEASONAL PM TYPE PATTERNS:\n"
-                report += "-" * 50 + "\n"
-            
-                # Organize by season
-                seasons = {}
-                for row in seasonal_data:
-                    season, pm_type, completions = row
-                    if season not in seasons:
-                        seasons[season] = {}
-                    seasons[season][pm_type] = completions
-
-                for season in ['Winter', 'Spring', 'Summer', 'Fall']:
-                    if season in seasons:
-                        report += f"\n{season}:\n"
-                        season_total = sum(seasons[season].values())
-                        for pm_type, count in seasons[season].items():
-                            percentage = (count / season_total * 100) if season_total > 0 else 0
-                            report += f"  {pm_type}: {count} ({percentage:.1f}%)\n"
-
-            # Recommendations based on PM type analysis
-            report += "\n\nPM TYPE RECOMMENDATIONS:\n"
-            report += "=" * 50 + "\n"
-        
-            if pm_type_stats:
-                # Find the most and least efficient PM types
-                sorted_by_hours = sorted(pm_type_stats, key=lambda x: x[2] if x[2] else 0)
-                most_efficient = sorted_by_hours[0] if sorted_by_hours else None
-                least_efficient = sorted_by_hours[-1] if sorted_by_hours else None
-                
-                if most_efficient and least_efficient and most_efficient[2] and least_efficient[2]:
-                    if most_efficient[0] != least_efficient[0]:
-                        report += f"- Most efficient PM type: {most_efficient[0]} ({most_efficient[2]:.1f}h avg)\n"
-                        report += f"- Least efficient PM type: {least_efficient[0]} ({least_efficient[2]:.1f}h avg)\n"
-                        report += f"- Consider reviewing procedures for {least_efficient[0]} PMs\n\n"
-            
-                # Check for imbalanced distribution
-                monthly_pms = next((row[1] for row in pm_type_stats if row[0] == 'Monthly'), 0)
-                annual_pms = next((row[1] for row in pm_type_stats if row[0] == 'Annual'), 0)
-            
-                if monthly_pms > 0 and annual_pms > 0:
-                    ratio = monthly_pms / annual_pms
-                    if ratio > 15:
-                        report += "- High Monthly-to-Annual PM ratio detected\n"
-                        report += "- Consider whether some Monthly PMs could be converted to Annual\n\n"
-                    elif ratio < 3:
-                        report += "- Low Monthly-to-Annual PM ratio detected\n"
-                        report += "- Verify Monthly PM scheduling is adequate\n\n"
-            
-                # Check for types with long completion times
-                long_pm_types = [row for row in pm_type_stats if row[2] and row[2] > 3.0]
-                if long_pm_types:
-                    report += "- PM types with long completion times (>3h):\n"
-                    for pm_type, total, avg_hours, _, _, _, _ in long_pm_types:
-                        report += f"  - {pm_type}: {avg_hours:.1f}h average\n"
-                    report += "- Review these procedures for potential optimization\n\n"
-
-            pm_type_text.insert('end', report)
-            pm_type_text.config(state='disabled')
+                        efficiency = "Needs Review"
+                else:
+                    efficiency = "Unknown"
+            
+                parts.append(f"{pm_type} PM Analysis:\n")
+                parts.append(f"  - Average completion time: {avg_hours:.1f}h ({efficiency})\n" if avg_hours else f"  - Average completion time: Unknown\n")
+                parts.append(f"  - Equipment coverage ratio: {coverage:.2f}\n")
+                parts.append(f"  - Technician utilization: {techs} different technicians\n")
+            
+                # Frequency analysis
+                if first and last and total > 1:
+                    first_date = datetime.strptime(first, '%Y-%m-%d')
+                    last_date = datetime.strptime(last, '%Y-%m-%d')
+                    total_days = (last_date - first_date).days
+                    avg_days_between = total_days / (total - 1) if total > 1 else 0
+                    parts.append(f"  - Average interval: {avg_days_between:.1f} days between completions\n")
+            
+                parts.append("\n")
 
-            pm_type_text.pack(side='left', fill='both', expand=True)
-            scrollbar.pack(side='right', fill='y')
+        # Seasonal PM type patterns
+        cursor.execute('''
+            SELECT
+                CASE
+                    WHEN EXTRACT(MONTH FROM completion_date::date) IN (12, 1, 2) THEN 'Winter'
+                    WHEN EXTRACT(MONTH FROM completion_date::date) IN (3, 4, 5) THEN 'Spring'
+                    WHEN EXTRACT(MONTH FROM completion_date::date) IN (6, 7, 8) THEN 'Summer'
+                    WHEN EXTRACT(MONTH FROM completion_date::date) IN (9, 10, 11) THEN 'Fall'
+                END as season,
+                pm_type,
+                COUNT(*) as completions
+            FROM pm_completions
+            WHERE completion_date::date >= CURRENT_DATE - INTERVAL '12 months'
+            GROUP BY season, pm_type
+            ORDER BY season, pm_type
+        ''')
 
-        except Exception as e:
-            error_label = ttk.Label(parent_frame, text=f"Error generating PM type trends: {str(e)}")
-            error_label.pack(pady=20)
+        seasonal_data = cursor.fetchall()
+
+        if seasonal_data:
+            parts.append("SEASONAL PM TYPE PATTERNS:\n")
+            parts.append("-" * 50 + "\n")
+        
+            # Organize by season
+            seasons = {}
+            for row in seasonal_data:
+                season, pm_type, completions = row
+                if season not in seasons:
+                    seasons[season] = {}
+                seasons[season][pm_type] = completions
+
+            for season in ['Winter', 'Spring', 'Summer', 'Fall']:
+                if season in seasons:
+                    parts.append(f"\n{season}:\n")
+                    season_total = sum(seasons[season].values())
+                    for pm_type, count in seasons[season].items():
+                        percentage = (count / season_total * 100) if season_total > 0 else 0
+                        parts.append(f"  {pm_type}: {count} ({percentage:.1f}%)\n")
+
+        # Recommendations based on PM type analysis
+        parts.append("\n\nPM TYPE RECOMMENDATIONS:\n")
+        parts.append("=" * 50 + "\n")
+    
+        if pm_type_stats:
+            # Find the most and least efficient PM types
+            sorted_by_hours = sorted(pm_type_stats, key=lambda x: x[2] if x[2] else 0)
+            most_efficient = sorted_by_hours[0] if sorted_by_hours else None
+            least_efficient = sorted_by_hours[-1] if sorted_by_hours else None
+            
+            if most_efficient and least_efficient and most_efficient[2] and least_efficient[2]:
+                if most_efficient[0] != least_efficient[0]:
+                    parts.append(f"- Most efficient PM type: {most_efficient[0]} ({most_efficient[2]:.1f}h avg)\n")
+                    parts.append(f"- Least efficient PM type: {least_efficient[0]} ({least_efficient[2]:.1f}h avg)\n")
+                    parts.append(f"- Consider reviewing procedures for {least_efficient[0]} PMs\n\n")
+        
+            # Check for imbalanced distribution
+            monthly_pms = next((row[1] for row in pm_type_stats if row[0] == 'Monthly'), 0)
+            annual_pms = next((row[1] for row in pm_type_stats if row[0] == 'Annual'), 0)
+        
+            if monthly_pms > 0 and annual_pms > 0:
+                ratio = monthly_pms / annual_pms
+                if ratio > 15:
+                    parts.append("- High Monthly-to-Annual PM ratio detected\n")
+                    parts.append("- Consider whether some Monthly PMs could be converted to Annual\n\n")
+                elif ratio < 3:
+                    parts.append("- Low Monthly-to-Annual PM ratio detected\n")
+                    parts.append("- Verify Monthly PM scheduling is adequate\n\n")
+        
+            # Check for types with long completion times
+            long_pm_types = [row for row in pm_type_stats if row[2] and row[2] > 3.0]
+            if long_pm_types:
+                parts.append("- PM types with long completion times (>3h):\n")
+                for pm_type, total, avg_hours, _, _, _, _ in long_pm_types:
+                    parts.append(f"  - {pm_type}: {avg_hours:.1f}h average\n")
+                parts.append("- Review these procedures for potential optimization\n\n")
+
+        return ''.join(parts)
 
     def get_season_from_month(self, month_num):
         """Helper function to get season from month number"""
@@ -14237,7 +15340,7 @@ class AITCMMSSystem:
             cursor.execute("SELECT COUNT(*) FROM pm_completions WHERE completion_date >= CURRENT_DATE - INTERVAL '30 days'")
             total_pms_month = cursor.fetchone()[0]
         
-            cursor.execute("SELECT AVG(labor_hours + labor_minutes/60.0) FROM pm_completions WHERE completion_date >= CURRENT_DATE - INTERVAL '12 months'")
+            cursor.execute("SELECT AVG(total_hours) FROM pm_completions WHERE completion_date >= CURRENT_DATE - INTERVAL '12 months'")
             avg_hours = cursor.fetchone()[0] or 0
 
             story.append(Paragraph("EXECUTIVE SUMMARY", styles['Heading1']))
@@ -14271,11 +15374,17 @@ class AITCMMSSystem:
             """
             story.append(Paragraph(methodology_text, styles['Normal']))
 
-            # Build PDF
-            doc.build(story)
+            def done(result):
+                messagebox.showinfo("Success", f"PM trends analysis exported to: {filename}")
+                self.update_status(f"PM trends analysis exported to {filename}")
 
-            messagebox.showinfo("Success", f"PM trends analysis exported to: {filename}")
-            self.update_status(f"PM trends analysis exported to {filename}")
+            # Rendering runs on the background executor; dialogs come back on the Tk thread
+            self.update_status("Building PM trends PDF...")
+            self.run_in_background(
+                lambda: doc.build(story),
+                done,
+                lambda e: messagebox.showerror("Error", f"Failed to export trends analysis: {str(e)}")
+            )
 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to export trends analysis: {str(e)}")
@@ -14283,7 +15392,9 @@ class AITCMMSSystem:
     def refresh_trends_analysis(self, parent_dialog):
         """Refresh the trends analysis with current data"""
         try:
-            # Destroy and recreate the dialog
+            # Destroy and recreate the dialog with freshly built pages
+            for key in ('trends_monthly', 'trends_equipment', 'trends_technician', 'trends_pm_type'):
+                self._analytics_cache.pop(key, None)
             parent_dialog.destroy()
             self.show_pm_trends()
             
@@ -14297,7 +15408,6 @@ class AITCMMSSystem:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to launch enterprise dashboard: {str(e)}")
             print(f"Enterprise dashboard error: {e}")
-            import traceback
             traceback.print_exc()
 
     def generate_executive_report(self):
@@ -14326,7 +15436,6 @@ class AITCMMSSystem:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to generate executive report: {str(e)}")
             print(f"Executive report error: {e}")
-            import traceback
             traceback.print_exc()
             self.update_status("Failed to generate executive report")
 
@@ -15148,17 +16257,12 @@ class AITCMMSSystem:
             
                 # Apply changes
                 cursor = self.conn.cursor()
-                updated_count = 0
-                
-                for bfm in selected_bfms:
-                    cursor.execute('''
-                        UPDATE equipment 
-                        SET monthly_pm = %s, six_month_pm = %s, annual_pm = %s
-                        WHERE bfm_equipment_no = %s
-                    ''', (monthly_pm, six_month_pm, annual_pm, bfm))
-                
-                    if cursor.rowcount > 0:
-                        updated_count += 1
+                cursor.execute('''
+                    UPDATE equipment 
+                    SET monthly_pm = %s, six_month_pm = %s, annual_pm = %s
+                    WHERE bfm_equipment_no = ANY(%s)
+                ''', (monthly_pm, six_month_pm, annual_pm, list(selected_bfms)))
+                updated_count = cursor.rowcount
             
                 self.conn.commit()
             
@@ -15198,8 +16302,9 @@ class AITCMMSSystem:
             self.load_equipment_data()
         
             # Clear existing items
-            for item in self.equipment_tree.get_children():
-                self.equipment_tree.delete(item)
+            children = self.equipment_tree.get_children()
+            if children:
+                self.equipment_tree.delete(*children)
         
             # Add equipment to tree
             for equipment in self.equipment_data:
@@ -15232,11 +16337,13 @@ class AITCMMSSystem:
     def filter_equipment_list(self, *args):
         """Filter equipment list based on search term and location"""
         try:
-            print("DEBUG: filter_equipment_list called")
+            if DEBUG:
+                print("DEBUG: filter_equipment_list called")
 
             # Check if equipment tree exists yet (might be called during tab creation)
             if not hasattr(self, 'equipment_tree'):
-                print("DEBUG: equipment_tree not created yet, skipping filter")
+                if DEBUG:
+                    print("DEBUG: equipment_tree not created yet, skipping filter")
                 return
 
             # Update status bar to show function is being called
@@ -15245,21 +16352,25 @@ class AITCMMSSystem:
 
             # Ensure equipment data is loaded
             if not hasattr(self, 'equipment_data') or not self.equipment_data:
-                print("DEBUG: Loading equipment data...")
+                if DEBUG:
+                    print("DEBUG: Loading equipment data...")
                 self.load_equipment_data()
                 # Also populate the location filter if not done yet
                 if hasattr(self, 'equipment_location_combo'):
                     self.populate_location_filter()
-                print(f"DEBUG: Loaded {len(self.equipment_data)} equipment items")
+                if DEBUG:
+                    print(f"DEBUG: Loaded {len(self.equipment_data)} equipment items")
 
             # Read search term directly from Entry widget (more reliable than StringVar)
             search_term = self.equipment_search_entry.get().lower() if hasattr(self, 'equipment_search_entry') else ''
             selected_location = self.equipment_location_var.get()
-            print(f"DEBUG: Search term: '{search_term}', Location: '{selected_location}'")
+            if DEBUG:
+                print(f"DEBUG: Search term: '{search_term}', Location: '{selected_location}'")
 
             # Clear existing items
-            for item in self.equipment_tree.get_children():
-                self.equipment_tree.delete(item)
+            children = self.equipment_tree.get_children()
+            if children:
+                self.equipment_tree.delete(*children)
 
             # Add filtered equipment
             matches_found = 0
@@ -15297,7 +16408,8 @@ class AITCMMSSystem:
                         ))
                         matches_found += 1
 
-            print(f"DEBUG: Found {matches_found} matching equipment items")
+            if DEBUG:
+                print(f"DEBUG: Found {matches_found} matching equipment items")
 
             # Update status bar with results
             if hasattr(self, 'update_status'):
@@ -15308,7 +16420,6 @@ class AITCMMSSystem:
 
         except Exception as e:
             print(f"ERROR in filter_equipment_list: {e}")
-            import traceback
             traceback.print_exc()
             if hasattr(self, 'update_status'):
                 self.update_status(f"Error filtering equipment: {e}")
@@ -15386,6 +16497,8 @@ class AITCMMSSystem:
             cursor = self.conn.cursor()
             cursor.execute('SELECT * FROM equipment ORDER BY bfm_equipment_no')
             self.equipment_data = cursor.fetchall()
+            self._equipment_cache = None  # Equipment was added/edited/deleted - CM dialogs re-read it
+            self._analytics_cache.clear()
         except Exception as e:
             self.conn.rollback()
             print(f"Error loading equipment data: {e}")
@@ -15464,7 +16577,6 @@ class AITCMMSSystem:
 
         except Exception as e:
             messagebox.showerror("NEW SYSTEM Error", f"Failed to generate assignments: {str(e)}")
-            import traceback
             traceback.print_exc()
 
     def populate_technician_exclusion_list(self):
@@ -15497,8 +16609,9 @@ class AITCMMSSystem:
 
         for technician, tree in self.technician_trees.items():
             # Clear existing items
-            for item in tree.get_children():
-                tree.delete(item)
+            children = tree.get_children()
+            if children:
+                tree.delete(*children)
 
             # Load scheduled PMs for this technician
             cursor = self.conn.cursor()
@@ -15510,18 +16623,8 @@ class AITCMMSSystem:
                 ORDER BY ws.scheduled_date
             ''', (technician, week_start))
 
-            assignments = cursor.fetchall()
-
-            for idx, assignment in enumerate(assignments):
-                bfm_no, description, pm_type, scheduled_date, status = assignment
-                tree.insert('', 'end', values=(bfm_no, description, pm_type, scheduled_date, status))
-
-                # Yield to event loop every 20 items to keep UI responsive
-                if idx % 20 == 0:
-                    self.root.update_idletasks()
-
-            # Yield to event loop after each technician
-            self.root.update_idletasks()
+            # Rows are (bfm_no, description, pm_type, scheduled_date, status)
+            self.insert_rows_in_chunks(tree, cursor.fetchall())
     
     def print_weekly_pm_forms(self):
         """Generate and print PM forms for the week"""
@@ -15600,7 +16703,8 @@ class AITCMMSSystem:
             print(f"DEBUG: Total assignments: {len(assignments)}")
 
             for i, assignment in enumerate(assignments):
-                print(f"DEBUG: Processing assignment {i}: {assignment}")
+                if DEBUG:
+                    print(f"DEBUG: Processing assignment {i}: {assignment}")
         
             # Safety check for assignment data
                 if not assignment or len(assignment) < 8:
@@ -15621,7 +16725,8 @@ class AITCMMSSystem:
                 scheduled_date = scheduled_date or ''
                 assigned_tech = assigned_tech or technician
         
-                print(f"DEBUG: Processing {bfm_no} - {pm_type}")
+                if DEBUG:
+                    print(f"DEBUG: Processing {bfm_no} - {pm_type}")
 
             # =================== LOGO SECTION ===================
             # Dynamic logo path that works on any computer
@@ -15679,14 +16784,16 @@ class AITCMMSSystem:
                         estimated_hours = template_result[1] or 1.0
                         special_instructions = template_result[2]
                         safety_notes = template_result[3]
-                        print(f"DEBUG: Using custom template for {bfm_no} - {pm_type} with {len(checklist_items)} items, {estimated_hours}h estimated")
+                        if DEBUG:
+                            print(f"DEBUG: Using custom template for {bfm_no} - {pm_type} with {len(checklist_items)} items, {estimated_hours}h estimated")
                     except Exception as e:
                         print(f"DEBUG: Error loading custom template: {e}")
                         checklist_items = []
 
                 # Use default checklist if no custom template
                 if not checklist_items:
-                    print(f"DEBUG: No custom template found for {bfm_no} - {pm_type}, using default checklist")
+                    if DEBUG:
+                        print(f"DEBUG: No custom template found for {bfm_no} - {pm_type}, using default checklist")
                     checklist_items = [
                         "Special Equipment Used (List):",
                         "Validate your maintenance with Date / Stamp / Hours",
@@ -15909,7 +17016,6 @@ class AITCMMSSystem:
 
         except Exception as e:
             print(f"Error creating PM forms PDF: {e}")
-            import traceback
             traceback.print_exc()
             raise
     
@@ -16001,7 +17107,7 @@ class AITCMMSSystem:
                 cursor.execute('''
                     SELECT pc.bfm_equipment_no, e.sap_material_no, e.description, 
                         pc.pm_type, pc.technician_name, pc.completion_date,
-                        (pc.labor_hours + pc.labor_minutes/60.0) as total_hours
+                        pc.total_hours
                     FROM pm_completions pc
                     LEFT JOIN equipment e ON pc.bfm_equipment_no = e.bfm_equipment_no
                     WHERE LOWER(pc.bfm_equipment_no) LIKE %s
@@ -16013,7 +17119,7 @@ class AITCMMSSystem:
                 cursor.execute('''
                     SELECT pc.bfm_equipment_no, e.sap_material_no, e.description, 
                         pc.pm_type, pc.technician_name, pc.completion_date,
-                        (pc.labor_hours + pc.labor_minutes/60.0) as total_hours
+                        pc.total_hours
                     FROM pm_completions pc
                     LEFT JOIN equipment e ON pc.bfm_equipment_no = e.bfm_equipment_no
                     ORDER BY pc.completion_date DESC LIMIT 20
@@ -16022,8 +17128,9 @@ class AITCMMSSystem:
             results = cursor.fetchall()
         
             # Clear existing
-            for item in self.history_search_tree.get_children():
-                self.history_search_tree.delete(item)
+            children = self.history_search_tree.get_children()
+            if children:
+                self.history_search_tree.delete(*children)
         
             # Add results
             for result in results:
@@ -10,6 +10,12 @@ from datetime import datetime
 import threading
 import hashlib
 import time
+import re
+import weakref
+
+
+# Matches psycopg2 named placeholders, e.g. %(bfm_no)s
+_NAMED_PARAM_RE = re.compile(r'%\((\w+)\)s')
 
 
 class DatabaseConnectionPool:
@@ -34,6 +40,9 @@ class DatabaseConnectionPool:
             self.keepalive_thread = None
             self.keepalive_stop = threading.Event()
             self.keepalive_interval = 240  # 4 minutes (less than NEON's 5-minute timeout)
+            self.server_prepare = False
+            self._prepared = weakref.WeakKeyDictionary()  # connection -> names PREPAREd on it
+            self._prepared_lock = threading.Lock()
 
     def initialize(self, db_config, min_conn=2, max_conn=10):
         """
@@ -65,6 +74,10 @@ class DatabaseConnectionPool:
             )
             print(f"Connection pool initialized: {min_conn}-{max_conn} connections with keepalive enabled")
 
+            # SQL-level PREPARE is session state; NEON's -pooler endpoint (PgBouncer in
+            # transaction mode) can run each transaction on a different server session
+            self.server_prepare = db_config.get('server_prepare', '-pooler' not in db_config['host'])
+
             # Start keepalive thread to prevent NEON free tier from suspending
             self._start_keepalive_thread()
 
@@ -85,21 +98,22 @@ class DatabaseConnectionPool:
             # End the transaction created by SELECT query
             conn.commit()
         except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
-            # Connection is dead, close it and get a new one
+            # Connection is dead, close it (freeing its pool slot) and get a new one
             print(f"Connection validation failed: {e}. Getting new connection...")
-            try:
-                conn.close()
-            except:
-                pass
+            self.return_connection(conn, close=True)
             # Get a fresh connection
             conn = self.pool.getconn()
 
         return conn
 
-    def return_connection(self, conn):
-        """Return a connection to the pool"""
+    def return_connection(self, conn, close=False):
+        """Return a connection to the pool, closing it instead of reusing it if close is set
+
+        Closed connections must be returned too - the pool keeps counting them as
+        in use until they are, and eventually raises "connection pool exhausted".
+        """
         if self.pool:
-            self.pool.putconn(conn)
+            self.pool.putconn(conn, close=close)
 
     def _keepalive_worker(self):
         """Background thread that keeps connections alive for NEON free tier"""
@@ -148,6 +162,83 @@ class DatabaseConnectionPool:
             self.pool = None
             print("Connection pool closed")
 
+    def execute_prepared(self, cursor, name, query, params, param_types):
+        """
+        Execute a query as a server-side prepared statement
+
+        The statement is PREPAREd the first time it is used on a connection and
+        EXECUTEd afterwards, so the server skips parse/plan on repeat calls.
+        Falls back to a plain execute when server_prepare is off (pooled endpoint).
+
+        Args:
+            cursor: Database cursor
+            name: Prepared statement name (unique per query)
+            query: SQL using psycopg2 named placeholders, e.g. %(bfm_no)s; a literal
+                   percent sign is written %% as with cursor.execute()
+            params: Dictionary of parameter values
+            param_types: Dictionary of parameter name -> PostgreSQL type
+
+        Example:
+            pool.execute_prepared(cursor, 'equipment_status',
+                                  "SELECT status FROM equipment WHERE bfm_equipment_no = %(bfm_no)s",
+                                  {'bfm_no': bfm_no}, {'bfm_no': 'text'})
+        """
+        if not self.server_prepare:
+            cursor.execute(query, params)
+            return
+
+        # Placeholders are numbered in order of first appearance
+        names = []
+        for param in _NAMED_PARAM_RE.findall(query):
+            if param not in names:
+                names.append(param)
+
+        conn = cursor.connection
+        with self._prepared_lock:
+            prepared = self._prepared.setdefault(conn, set())
+
+        if name not in prepared:
+            body = _NAMED_PARAM_RE.sub(lambda m: f'${names.index(m.group(1)) + 1}', query)
+            # Sent without parameters, so psycopg2 leaves %% alone - unescape it
+            # here to match the plain execute() path
+            body = body.replace('%%', '%')
+            types = ', '.join(param_types[param] for param in names)
+            cursor.execute(f'PREPARE {name} ({types}) AS {body}' if names else f'PREPARE {name} AS {body}')
+            prepared.add(name)
+
+        if names:
+            placeholders = ', '.join(['%s'] * len(names))
+            cursor.execute(f'EXECUTE {name} ({placeholders})', [params[param] for param in names])
+        else:
+            cursor.execute(f'EXECUTE {name}')
+
+    @contextmanager
+    def connection(self):
+        """
+        Context manager that borrows a validated connection from the pool
+
+        The caller owns the transaction and must commit explicitly; anything
+        left uncommitted when the block exits is rolled back so the connection
+        always goes back to the pool clean.
+
+        Example:
+            with pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("UPDATE equipment SET ...")
+                conn.commit()
+        """
+        conn = self.get_connection()
+        try:
+            yield conn
+        finally:
+            if not conn.closed:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+            # A connection NEON dropped is discarded, but still frees its pool slot
+            self.return_connection(conn, close=bool(conn.closed))
+
     @contextmanager
     def get_cursor(self, commit=True):
         """
@@ -201,9 +292,9 @@ class DatabaseConnectionPool:
                     cursor.close()
                 except:
                     pass
-            # Only return connection if it wasn't closed due to error
-            if conn and not conn.closed:
-                self.return_connection(conn)
+            # A connection closed due to error is discarded, but still frees its pool slot
+            if conn:
+                self.return_connection(conn, close=bool(conn.closed))
 
 
 class OptimisticConcurrencyControl:
@@ -156,7 +156,7 @@ class EnterpriseAnalytics:
 
             # Avg Response Time (hours)
             cursor.execute('''
-                SELECT AVG(labor_hours + labor_minutes/60.0)
+                SELECT AVG(total_hours)
                 FROM pm_completions
                 WHERE completion_date >= CURRENT_DATE - INTERVAL '30 days'
             ''')
@@ -319,7 +319,7 @@ class EnterpriseAnalytics:
                 SELECT
                     technician_name,
                     COUNT(*) as total_pms,
-                    AVG(labor_hours + labor_minutes/60.0) as avg_hours
+                    AVG(total_hours) as avg_hours
                 FROM pm_completions
                 WHERE completion_date >= CURRENT_DATE - INTERVAL '30 days'
                 GROUP BY technician_name
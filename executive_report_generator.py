@@ -294,7 +294,7 @@ class ExecutiveReportGenerator:
 
             # Response Time
             cursor.execute('''
-                SELECT AVG(labor_hours + labor_minutes/60.0)
+                SELECT AVG(total_hours)
                 FROM pm_completions
                 WHERE completion_date >= CURRENT_DATE - INTERVAL '3 months'
             ''')
@@ -556,7 +556,7 @@ class ExecutiveReportGenerator:
             total = cursor.fetchone()[0]
 
             cursor.execute('''
-                SELECT AVG(labor_hours + labor_minutes/60.0)
+                SELECT AVG(total_hours)
                 FROM pm_completions
                 WHERE completion_date >= CURRENT_DATE - INTERVAL '%s months'
             ''', (months,))
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Test script for DatabaseConnectionPool.execute_prepared
+Runs against a fake cursor, so no database connection is needed
+"""
+
+import sys
+from database_utils import DatabaseConnectionPool
+
+
+class FakeConnection:
+    """Stands in for a psycopg2 connection (only its identity is used)"""
+
+
+class FakeCursor:
+    """Records every statement instead of sending it to a server"""
+    def __init__(self, connection=None):
+        self.connection = connection or FakeConnection()
+        self.executed = []
+
+    def execute(self, query, params=None):
+        self.executed.append((query, params))
+
+
+def make_pool(server_prepare):
+    """A fresh pool that is never initialized (bypasses the singleton)"""
+    pool = object.__new__(DatabaseConnectionPool)
+    pool.__init__()
+    pool.server_prepare = server_prepare
+    return pool
+
+
+def test_plain_execute_when_server_prepare_off():
+    """The pooled (-pooler) endpoint runs the query as-is"""
+    pool = make_pool(server_prepare=False)
+    cursor = FakeCursor()
+    query = "SELECT status FROM equipment WHERE bfm_equipment_no = %(bfm_no)s"
+    params = {'bfm_no': 'BFM-1'}
+
+    pool.execute_prepared(cursor, 'equipment_status', query, params, {'bfm_no': 'text'})
+
+    assert cursor.executed == [(query, params)], cursor.executed
+
+
+def test_placeholders_numbered_in_order_of_first_appearance():
+    """Placeholders become $1, $2... by first appearance, with types and values in the same order"""
+    pool = make_pool(server_prepare=True)
+    cursor = FakeCursor()
+
+    pool.execute_prepared(cursor, 'pm_due',
+                          "SELECT * FROM pm WHERE day >= %(start)s AND bfm = %(bfm_no)s AND day < %(end)s",
+                          {'end': '2025-02-01', 'bfm_no': 'BFM-1', 'start': '2025-01-01'},
+                          {'bfm_no': 'text', 'start': 'date', 'end': 'date'})
+
+    assert cursor.executed == [
+        ('PREPARE pm_due (date, text, date) AS '
+         'SELECT * FROM pm WHERE day >= $1 AND bfm = $2 AND day < $3', None),
+        ('EXECUTE pm_due (%s, %s, %s)', ['2025-01-01', 'BFM-1', '2025-02-01']),
+    ], cursor.executed
+
+
+def test_repeated_placeholder_uses_one_parameter():
+    """A placeholder used twice maps to the same $n and is passed once"""
+    pool = make_pool(server_prepare=True)
+    cursor = FakeCursor()
+
+    pool.execute_prepared(cursor, 'cm_search',
+                          "SELECT * FROM cm WHERE cm_number = %(term)s OR description LIKE %(term)s "
+                          "LIMIT %(limit)s",
+                          {'term': 'CM-1', 'limit': 50},
+                          {'term': 'text', 'limit': 'integer'})
+
+    assert cursor.executed == [
+        ('PREPARE cm_search (text, integer) AS '
+         'SELECT * FROM cm WHERE cm_number = $1 OR description LIKE $1 LIMIT $2', None),
+        ('EXECUTE cm_search (%s, %s)', ['CM-1', 50]),
+    ], cursor.executed
+
+
+def test_prepare_once_per_connection():
+    """PREPARE is sent on the first use per connection; later calls only EXECUTE"""
+    pool = make_pool(server_prepare=True)
+    query = "SELECT status FROM equipment WHERE bfm_equipment_no = %(bfm_no)s"
+    types = {'bfm_no': 'text'}
+
+    first = FakeCursor()
+    pool.execute_prepared(first, 'equipment_status', query, {'bfm_no': 'BFM-1'}, types)
+    # A new cursor on the same connection shares its session
+    again = FakeCursor(first.connection)
+    pool.execute_prepared(again, 'equipment_status', query, {'bfm_no': 'BFM-2'}, types)
+    other = FakeCursor()
+    pool.execute_prepared(other, 'equipment_status', query, {'bfm_no': 'BFM-3'}, types)
+
+    assert [q for q, _ in first.executed] == [
+        'PREPARE equipment_status (text) AS '
+        'SELECT status FROM equipment WHERE bfm_equipment_no = $1',
+        'EXECUTE equipment_status (%s)',
+    ], first.executed
+    assert again.executed == [('EXECUTE equipment_status (%s)', ['BFM-2'])], again.executed
+    assert other.executed[0][0].startswith('PREPARE equipment_status'), other.executed
+
+
+def test_missing_param_type():
+    """A placeholder without a type raises KeyError before anything is sent or recorded"""
+    pool = make_pool(server_prepare=True)
+    cursor = FakeCursor()
+    query = "SELECT * FROM pm WHERE bfm = %(bfm_no)s AND day >= %(start)s"
+    params = {'bfm_no': 'BFM-1', 'start': '2025-01-01'}
+
+    try:
+        pool.execute_prepared(cursor, 'pm_since', query, params, {'bfm_no': 'text'})
+    except KeyError as e:
+        assert e.args == ('start',), e.args
+    else:
+        raise AssertionError("expected KeyError for the untyped 'start' placeholder")
+    assert cursor.executed == [], cursor.executed
+
+    # The failed call did not mark the statement as prepared
+    pool.execute_prepared(cursor, 'pm_since', query, params, {'bfm_no': 'text', 'start': 'date'})
+    assert cursor.executed[0][0].startswith('PREPARE pm_since (text, date)'), cursor.executed
+
+
+def test_escaped_percent_matches_plain_execute():
+    """%% in the query reaches the server as % on both paths"""
+    query = "SELECT * FROM cm WHERE cm_number LIKE 'CM-%%' AND bfm = %(bfm_no)s"
+
+    plain = FakeCursor()
+    make_pool(server_prepare=False).execute_prepared(plain, 'cm_like', query, {'bfm_no': 'BFM-1'},
+                                                     {'bfm_no': 'text'})
+    # psycopg2 unescapes %% itself when params are passed
+    assert plain.executed == [(query, {'bfm_no': 'BFM-1'})], plain.executed
+
+    prepared = FakeCursor()
+    make_pool(server_prepare=True).execute_prepared(prepared, 'cm_like', query, {'bfm_no': 'BFM-1'},
+                                                    {'bfm_no': 'text'})
+    assert prepared.executed[0] == (
+        "PREPARE cm_like (text) AS SELECT * FROM cm WHERE cm_number LIKE 'CM-%' AND bfm = $1", None
+    ), prepared.executed
+
+
+def test_query_without_placeholders():
+    """A query with no parameters is prepared and executed without an empty ()"""
+    pool = make_pool(server_prepare=True)
+    cursor = FakeCursor()
+
+    pool.execute_prepared(cursor, 'cm_count', "SELECT COUNT(*) FROM cm", {}, {})
+
+    assert cursor.executed == [
+        ('PREPARE cm_count AS SELECT COUNT(*) FROM cm', None),
+        ('EXECUTE cm_count', None),
+    ], cursor.executed
+
+
+def run_all_tests():
+    """Run all execute_prepared tests"""
+    print("=" * 60)
+    print("EXECUTE_PREPARED TEST")
+    print("=" * 60)
+
+    tests = [
+        test_plain_execute_when_server_prepare_off,
+        test_placeholders_numbered_in_order_of_first_appearance,
+        test_repeated_placeholder_uses_one_parameter,
+        test_prepare_once_per_connection,
+        test_missing_param_type,
+        test_escaped_percent_matches_plain_execute,
+        test_query_without_placeholders,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__doc__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__doc__}\n   {e}")
+
+    print()
+    print(f"Passed: {len(tests) - failed}/{len(tests)}")
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())